@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0004_appointment_cancelled_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(fields=['provider', 'patient', 'created_at'], name='note_provider_patient_idx'),
+        ),
+    ]
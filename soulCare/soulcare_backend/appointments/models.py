@@ -49,6 +49,10 @@ class ProgressNote(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Provider's notes, optionally narrowed to one patient
+            models.Index(fields=['provider', 'patient', 'created_at'], name='note_provider_patient_idx'),
+        ]
 
     def __str__(self):
         return f"Note for {self.patient.username} by {self.provider.username}"
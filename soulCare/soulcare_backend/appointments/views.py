@@ -165,21 +165,20 @@ class AppointmentViewSet(viewsets.ModelViewSet):
     
     def perform_update(self, serializer):
         """
-        Handle appointment updates (like Status changes) and send emails
-        ONLY if the user has enabled notifications.
+        Handle appointment updates (like Status changes) and send emails.
+        The notification engine skips recipients who disabled
+        email_appointment_updates in their settings.
         """
         instance = serializer.save()
         
         # Send Approved Email?
         if instance.status == 'scheduled':
-            # Check if patient has settings and if email_appointment_updates is True
-            if hasattr(instance.patient, 'settings') and instance.patient.settings.email_appointment_updates:
-                send_appointment_approved_email(instance)
+            send_appointment_approved_email(instance)
         
         # Send Cancelled Email?
         elif instance.status == 'cancelled':
-            if hasattr(instance.patient, 'settings') and instance.patient.settings.email_appointment_updates:
-                send_appointment_cancelled_email(instance)
+            cancelled_by = 'patient' if self.request.user == instance.patient else 'provider'
+            send_appointment_cancelled_email(instance, cancelled_by_role=cancelled_by)
     
 class ProgressNoteViewSet(viewsets.ModelViewSet):
     serializer_class = ProgressNoteSerializer
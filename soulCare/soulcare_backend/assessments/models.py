@@ -66,3 +66,6 @@ class AssessmentResult(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['patient', 'submitted_at'], name='assessment_patient_time_idx'),
+        ]
@@ -1,6 +1,8 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, DoctorProfile, CounselorProfile, PatientProfile
+from .identity import is_nic_taken
+from .models import User, DoctorProfile, CounselorProfile, PatientProfile, IdentityIndex, OutboundEmail
 
 
 class UserAdmin(BaseUserAdmin):
@@ -36,6 +38,30 @@ except admin.sites.NotRegistered:
     pass
 
 admin.site.register(User, UserAdmin)
-admin.site.register(DoctorProfile)
-admin.site.register(CounselorProfile)
-admin.site.register(PatientProfile)
\ No newline at end of file
+
+
+class ProfileAdminForm(forms.ModelForm):
+    def clean(self):
+        cleaned_data = super().clean()
+        user = cleaned_data.get('user') or getattr(self.instance, 'user', None)
+        # The per-table unique check misses "123v" vs "123V" and other tables
+        if is_nic_taken(cleaned_data.get('nic'), exclude_user_id=user.pk if user else None):
+            self.add_error('nic', "An account with this NIC card number already exists.")
+        return cleaned_data
+
+
+class ProfileAdmin(admin.ModelAdmin):
+    form = ProfileAdminForm
+
+
+admin.site.register(DoctorProfile, ProfileAdmin)
+admin.site.register(CounselorProfile, ProfileAdmin)
+admin.site.register(PatientProfile, ProfileAdmin)
+admin.site.register(IdentityIndex)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'digest')
+    search_fields = ('recipient', 'subject', 'idempotency_key')
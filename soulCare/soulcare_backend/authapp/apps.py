@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authapp'
+
+    def ready(self):
+        # Keeps IdentityIndex in sync with User/profile saves
+        from . import signals  # noqa: F401
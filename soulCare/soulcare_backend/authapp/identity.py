@@ -0,0 +1,89 @@
+# soulcare_backend/authapp/identity.py
+
+from .models import IdentityIndex
+
+# Keeps each IN (...) probe well below the database parameter limits.
+NIC_LOOKUP_CHUNK_SIZE = 1000
+
+
+def normalize_nic(nic):
+    """
+    NICs are compared without surrounding whitespace and case-insensitively
+    (old-format numbers end in 'V'/'X', which users type either way).
+    """
+    if nic is None:
+        return None
+    return str(nic).strip().upper() or None
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def is_nic_taken(nic, exclude_user_id=None):
+    """
+    Returns True if the NIC already belongs to ANY patient, doctor or counselor
+    (other than `exclude_user_id`, the profile being edited).
+    """
+    nic = normalize_nic(nic)
+    if nic is None:
+        return False
+    return IdentityIndex.objects.filter(nic=nic).exclude(user_id=exclude_user_id).exists()
+
+
+def find_taken_nics(nics):
+    """
+    Bulk variant of is_nic_taken for importers: returns the set of normalized
+    NICs (from the given iterable) that are already registered, using one
+    set-based query per chunk instead of one probe per NIC.
+    """
+    wanted = sorted({n for n in (normalize_nic(nic) for nic in nics) if n})
+    taken = set()
+    for start in range(0, len(wanted), NIC_LOOKUP_CHUNK_SIZE):
+        chunk = wanted[start:start + NIC_LOOKUP_CHUNK_SIZE]
+        taken.update(
+            IdentityIndex.objects.filter(nic__in=chunk).values_list('nic', flat=True)
+        )
+    return taken
+
+
+def find_user_by_email(email):
+    """
+    Returns the User registered with this email (case-insensitive), or None.
+    """
+    entry = (
+        IdentityIndex.objects.select_related('user')
+        .filter(email=normalize_email(email))
+        .order_by('user_id')
+        .first()
+    )
+    return entry.user if entry else None
+
+
+def sync_user_identity(user):
+    """
+    Creates or refreshes the identity row for a user's email.
+    """
+    IdentityIndex.objects.update_or_create(
+        user=user,
+        defaults={'email': normalize_email(user.email)},
+    )
+
+
+def sync_profile_identity(profile):
+    """
+    Stores the profile's NIC on the owner's identity row. Writers validate
+    with is_nic_taken first; a NIC that collides only after normalization
+    raises IntegrityError here.
+    """
+    nic = normalize_nic(profile.nic)
+    IdentityIndex.objects.update_or_create(
+        user_id=profile.user_id,
+        defaults={'nic': nic},
+        # Only needed if the user row predates the index (the user signal normally creates it)
+        create_defaults={'nic': nic, 'email': normalize_email(profile.user.email)},
+    )
+
+
+def clear_profile_identity(profile):
+    IdentityIndex.objects.filter(user_id=profile.user_id, nic=normalize_nic(profile.nic)).update(nic=None)
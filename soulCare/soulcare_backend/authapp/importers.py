@@ -0,0 +1,286 @@
+# soulcare_backend/authapp/importers.py
+
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction, IntegrityError
+from rest_framework import serializers
+
+from .identity import find_taken_nics, normalize_nic, normalize_email
+from .models import (
+    User, PatientProfile, DoctorProfile, CounselorProfile, IdentityIndex,
+    GENDER_CHOICES, MARITAL_CHOICES, EMPLOYMENT_CHOICES,
+)
+from .notifications import notify_many
+from .utils import patient_welcome_email, account_pending_email
+
+
+# --- ROW SERIALIZERS (field validation only, no DB access) ---
+
+class BaseImportRowSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    full_name = serializers.CharField(max_length=100)
+    nic = serializers.CharField(max_length=20)
+    contact_number = serializers.CharField(max_length=15)
+
+
+class PatientImportRowSerializer(BaseImportRowSerializer):
+    address = serializers.CharField()
+    dob = serializers.DateField(required=False, allow_null=True)
+    health_issues = serializers.CharField(required=False, allow_blank=True)
+    gender = serializers.ChoiceField(choices=GENDER_CHOICES, required=False)
+    marital_status = serializers.ChoiceField(choices=MARITAL_CHOICES, required=False)
+    employment_status = serializers.ChoiceField(choices=EMPLOYMENT_CHOICES, required=False)
+    financial_stress_level = serializers.IntegerField(min_value=1, max_value=5, required=False)
+    chronic_illness = serializers.BooleanField(required=False)
+    substance_use = serializers.BooleanField(required=False)
+    mh_diagnosis_history = serializers.BooleanField(required=False)
+
+
+class DoctorImportRowSerializer(BaseImportRowSerializer):
+    specialization = serializers.CharField(max_length=255)
+    availability = serializers.CharField(max_length=255)
+    license_number = serializers.CharField(max_length=100)
+
+
+class CounselorImportRowSerializer(BaseImportRowSerializer):
+    expertise = serializers.CharField(max_length=255)
+    license_number = serializers.CharField(max_length=100)
+
+
+# role name -> (User.role, is_verified, row serializer, profile model, notification builder)
+IMPORT_ROLES = {
+    'patient': ('user', True, PatientImportRowSerializer, PatientProfile, patient_welcome_email),
+    'doctor': ('doctor', False, DoctorImportRowSerializer, DoctorProfile, account_pending_email),
+    'counselor': ('counselor', False, CounselorImportRowSerializer, CounselorProfile, account_pending_email),
+}
+
+USER_FIELDS = ('username', 'email', 'password')
+
+
+# --- READERS ---
+
+def read_rows(path, fmt=None):
+    """
+    Lazily yields (line_number, row_dict) from a CSV or JSONL file.
+    Empty CSV cells are dropped so optional fields fall back to their defaults.
+    """
+    fmt = fmt or ('jsonl' if str(path).endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8') as fh:
+        if fmt == 'jsonl':
+            for line_number, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    yield line_number, {'__error__': f"Invalid JSON: {exc}"}
+                    continue
+                yield line_number, row if isinstance(row, dict) else {'__error__': "Expected a JSON object."}
+        else:
+            reader = csv.DictReader(fh)
+            # Line 1 is the header
+            for line_number, row in enumerate(reader, start=2):
+                yield line_number, {k.strip(): v.strip() for k, v in row.items() if k and v not in (None, '')}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _hash_password(raw):
+    # Blank passwords produce an unusable password (user must reset it)
+    return make_password(raw or None)
+
+
+def _init_hash_worker():
+    # Needed when the pool uses 'spawn' (settings are inherited with 'fork')
+    import django
+    django.setup()
+
+
+# --- IMPORTER ---
+
+class UserImporter:
+    """
+    Streams rows from a CSV/JSONL file and bulk-creates User + profile +
+    IdentityIndex rows, one transaction per chunk.
+
+    Rows are validated in chunks: field validation per row, then one set-based
+    query per chunk for taken usernames, emails and NICs. Passwords are hashed
+    in a process pool. Welcome/pending emails are queued in the outbox with one
+    insert per chunk after the chunk commits.
+    """
+
+    def __init__(self, role, chunk_size=1000, workers=None, send_emails=True, dry_run=False):
+        if role not in IMPORT_ROLES:
+            raise ValueError(f"Unknown role '{role}'. Expected one of: {', '.join(IMPORT_ROLES)}")
+        self.role = role
+        self.user_role, self.is_verified, self.row_serializer, self.profile_model, self.email_builder = IMPORT_ROLES[role]
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.send_emails = send_emails
+        self.dry_run = dry_run
+
+        # Keys already used earlier in the same file
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        self.seen_nics = set()
+
+        self.errors = []  # (line_number, username, message)
+        self.created = 0
+        self.processed = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def run(self, rows, progress=None):
+        """
+        Imports an iterable of (line_number, row_dict). `progress` is called
+        after each chunk with the importer itself.
+        """
+        started = time.perf_counter()
+        executor = None
+        if self.workers != 0:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hash_worker)
+        try:
+            for chunk in _chunks(rows, self.chunk_size):
+                valid = self._validate_chunk(chunk)
+                if valid:
+                    self._create_chunk(valid, executor)
+                self.processed += len(chunk)
+                self.elapsed = time.perf_counter() - started
+                if progress:
+                    progress(self)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    # --- validation ---
+
+    def _validate_chunk(self, chunk):
+        candidates = []
+        for line_number, row in chunk:
+            if '__error__' in row:
+                self.errors.append((line_number, '', row['__error__']))
+                continue
+            serializer = self.row_serializer(data=row)
+            if not serializer.is_valid():
+                self.errors.append((line_number, row.get('username', ''), self._format_errors(serializer.errors)))
+                continue
+            candidates.append((line_number, serializer.validated_data))
+
+        if not candidates:
+            return []
+
+        # One query per key type for the whole chunk
+        usernames = [data['username'] for _, data in candidates]
+        emails = [normalize_email(data['email']) for _, data in candidates]
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set(IdentityIndex.objects.filter(email__in=emails).values_list('email', flat=True))
+        taken_nics = find_taken_nics(data['nic'] for _, data in candidates)
+
+        valid = []
+        for line_number, data in candidates:
+            username = data['username']
+            email = normalize_email(data['email'])
+            nic = normalize_nic(data['nic'])
+            problems = []
+            if username in taken_usernames or username in self.seen_usernames:
+                problems.append("A user with that username already exists.")
+            if email in taken_emails or email in self.seen_emails:
+                problems.append("A user with this email already exists.")
+            if nic in taken_nics or nic in self.seen_nics:
+                problems.append("An account with this NIC card number already exists.")
+            if problems:
+                self.errors.append((line_number, username, ' '.join(problems)))
+                continue
+
+            self.seen_usernames.add(username)
+            self.seen_emails.add(email)
+            self.seen_nics.add(nic)
+            valid.append((line_number, data))
+        return valid
+
+    @staticmethod
+    def _format_errors(errors):
+        return '; '.join(f"{field}: {' '.join(str(m) for m in messages)}" for field, messages in errors.items())
+
+    # --- creation ---
+
+    def _create_chunk(self, valid, executor):
+        if self.dry_run:
+            self.created += len(valid)
+            return
+
+        raw_passwords = [data.get('password') for _, data in valid]
+        if executor is not None:
+            hashed = list(executor.map(_hash_password, raw_passwords, chunksize=max(1, len(raw_passwords) // 32)))
+        else:
+            hashed = [_hash_password(raw) for raw in raw_passwords]
+
+        users = [
+            User(
+                username=data['username'],
+                email=data['email'],
+                password=password,
+                role=self.user_role,
+                is_verified=self.is_verified,
+            )
+            for (_, data), password in zip(valid, hashed)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # MySQL does not return primary keys from bulk_create, so re-read them
+                ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+                for user in users:
+                    user.pk = ids[user.username]
+
+                profiles = []
+                identities = []
+                for (_, data), user in zip(valid, users):
+                    profile_data = {k: v for k, v in data.items() if k not in USER_FIELDS}
+                    profiles.append(self.profile_model(user_id=user.pk, **profile_data))
+                    identities.append(IdentityIndex(
+                        user_id=user.pk,
+                        nic=normalize_nic(data['nic']),
+                        email=normalize_email(data['email']),
+                    ))
+                self.profile_model.objects.bulk_create(profiles)
+                IdentityIndex.objects.bulk_create(identities)
+        except IntegrityError as exc:
+            # A concurrent registration took one of the keys: report the whole chunk
+            for line_number, data in valid:
+                self.errors.append((line_number, data['username'], f"Chunk rolled back: {exc}"))
+            return
+
+        self.created += len(users)
+
+        if self.send_emails:
+            notifications = [self.email_builder(user) for user in users]
+            kind = notifications[0][0]
+            notify_many(kind, [(user, context, key) for _, user, context, key in notifications])
+
+    def write_error_report(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(['line', 'username', 'error'])
+            writer.writerows(sorted(self.errors))
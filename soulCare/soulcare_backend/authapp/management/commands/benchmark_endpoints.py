@@ -0,0 +1,66 @@
+# soulcare_backend/authapp/management/commands/benchmark_endpoints.py
+
+import json
+import os
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+from soulcare_backend.benchmarks import ENDPOINTS, run_benchmarks
+from soulcare_backend.synthetic import TIERS
+
+
+class Command(BaseCommand):
+    help = 'Measures latency and query counts of the main endpoints against the synthetic population.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tier', choices=list(TIERS), required=True, help='Scale tier the results are recorded under.')
+        parser.add_argument('--generate', action='store_true', help='Purge and regenerate the synthetic population for this tier first.')
+        parser.add_argument('--repeat', type=int, default=5, help='Measured requests per endpoint.')
+        parser.add_argument('--endpoint', action='append', help='Only run endpoints whose name starts with this (repeatable).')
+        parser.add_argument('--output', help='JSON file the results are merged into, keyed by tier.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] <= 0:
+            raise CommandError("--repeat must be positive.")
+        endpoints = ENDPOINTS
+        if options['endpoint']:
+            endpoints = [e for e in ENDPOINTS if any(e.name.startswith(prefix) for prefix in options['endpoint'])]
+            if not endpoints:
+                raise CommandError("No endpoint matches.")
+
+        if options['generate']:
+            call_command('generate_synthetic_data', tier=options['tier'], purge=True, seed=0, stdout=self.stdout)
+
+        # Allows the 'testserver' host and keeps emails in memory
+        try:
+            setup_test_environment()
+            owns_environment = True
+        except RuntimeError:
+            # Already inside a test run
+            owns_environment = False
+        try:
+            results = run_benchmarks(endpoints, repeat=options['repeat'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if owns_environment:
+                teardown_test_environment()
+
+        self.stdout.write(f"{'endpoint':<26} {'status':>6} {'queries':>7} {'median':>9} {'p95':>9} {'max':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:<26} {row['status']:>6} {row['queries']:>7} "
+                f"{row['median_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms"
+            )
+
+        if options['output']:
+            stored = {}
+            if os.path.exists(options['output']):
+                with open(options['output']) as handle:
+                    stored = json.load(handle)
+            stored[options['tier']] = results
+            with open(options['output'], 'w') as handle:
+                json.dump(stored, handle, indent=2)
+                handle.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Results for tier {options['tier']} written to {options['output']}."))
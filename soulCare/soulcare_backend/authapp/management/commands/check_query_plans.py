@@ -0,0 +1,54 @@
+# soulcare_backend/authapp/management/commands/check_query_plans.py
+
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from soulcare_backend.query_plans import HOT_QUERIES, check_plans
+
+
+class Command(BaseCommand):
+    help = 'EXPLAINs the registered hot queries; exits non-zero on full table scans or plan regressions (for CI).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=None, help='JSON file of the expected index per pattern, keyed by database vendor.')
+        parser.add_argument('--write-baseline', action='store_true', help='Record the current plans into --baseline instead of checking.')
+        parser.add_argument('--pattern', action='append', help='Only check patterns whose name starts with this (repeatable).')
+
+    def handle(self, *args, **options):
+        patterns = HOT_QUERIES
+        if options['pattern']:
+            patterns = [p for p in HOT_QUERIES if any(p.name.startswith(prefix) for prefix in options['pattern'])]
+            if not patterns:
+                raise CommandError("No registered query pattern matches.")
+
+        stored = {}
+        if options['baseline'] and os.path.exists(options['baseline']):
+            with open(options['baseline']) as handle:
+                stored = json.load(handle)
+        vendor = connection.vendor
+
+        if options['write_baseline']:
+            if not options['baseline']:
+                raise CommandError("--write-baseline needs --baseline <file>.")
+            reports, problems = check_plans(patterns)
+            stored[vendor] = dict(stored.get(vendor, {}), **{report.name: report.indexes for report in reports})
+            with open(options['baseline'], 'w') as handle:
+                json.dump(stored, handle, indent=2, sort_keys=True)
+                handle.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Recorded {len(reports)} {vendor} query plans in {options['baseline']}."))
+            for problem in problems:
+                self.stdout.write(self.style.WARNING(problem))
+            return
+
+        reports, problems = check_plans(patterns, stored.get(vendor))
+        for report in reports:
+            status = self.style.ERROR('SCAN') if report.full_scans else self.style.SUCCESS('OK  ')
+            self.stdout.write(f"{status} {report.name}: {', '.join(report.indexes) or 'no index'}")
+            if options['verbosity'] > 1:
+                self.stdout.write(f"     {report.plan}")
+
+        if problems:
+            raise CommandError("Query plan check failed:\n  " + "\n  ".join(problems))
+        self.stdout.write(self.style.SUCCESS(f"All {len(reports)} query plans use an index."))
@@ -0,0 +1,60 @@
+# soulcare_backend/authapp/management/commands/generate_synthetic_data.py
+
+from django.core.management.base import BaseCommand, CommandError
+from soulcare_backend.synthetic import SYNTHETIC_PASSWORD, TIERS, PopulationConfig, PopulationGenerator, purge_population
+
+
+class Command(BaseCommand):
+    help = 'Generates a synthetic population (users, appointments, messages, habits, game results, mood entries, blog) for load testing.'
+
+    def add_arguments(self, parser):
+        size = parser.add_mutually_exclusive_group()
+        size.add_argument('--tier', choices=list(TIERS), help='Size the population to roughly this many rows.')
+        size.add_argument('--patients', type=int, help='Exact number of patients.')
+        parser.add_argument('--providers', type=int, default=None, help='Doctors + counselors (default: patients / 50).')
+        parser.add_argument('--appointments', type=int, default=4, help='Appointments per patient.')
+        parser.add_argument('--messages', type=int, default=20, help='Chat messages per patient.')
+        parser.add_argument('--habits', type=int, default=3, help='Habits per patient.')
+        parser.add_argument('--tasks', type=int, default=2, help='Tasks per habit.')
+        parser.add_argument('--completions', type=int, default=10, help='Completions per habit task.')
+        parser.add_argument('--game-results', type=int, default=24, help='Game results per patient (spread over the six games).')
+        parser.add_argument('--mood-entries', type=int, default=60, help='Mood entries per patient, on distinct days of the last year.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data.')
+        parser.add_argument('--purge', action='store_true', help='Delete the existing synthetic population first.')
+        parser.add_argument('--purge-only', action='store_true', help='Delete the synthetic population and exit.')
+
+    def handle(self, *args, **options):
+        if options['purge'] or options['purge_only']:
+            deleted = purge_population()
+            self.stdout.write(f"Purged {deleted} synthetic users.")
+            if options['purge_only']:
+                return
+
+        volumes = {
+            'providers': options['providers'],
+            'appointments': options['appointments'],
+            'messages': options['messages'],
+            'habits': options['habits'],
+            'tasks': options['tasks'],
+            'completions': options['completions'],
+            'game_results': options['game_results'],
+            'mood_entries': options['mood_entries'],
+        }
+        if options['tier']:
+            config = PopulationConfig.for_rows(TIERS[options['tier']], **volumes)
+        elif options['patients']:
+            config = PopulationConfig(patients=options['patients'], **volumes)
+        else:
+            raise CommandError("Pass --tier or --patients.")
+
+        def progress(counts):
+            self.stdout.write(f"  {counts.get('users', 0)} users, {sum(counts.values())} rows so far")
+
+        generator = PopulationGenerator(config, seed=options['seed'])
+        counts = generator.generate(progress=progress if options['verbosity'] > 1 else None)
+        for table, created in counts.items():
+            self.stdout.write(f"  {table}: {created}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {config.patients} patients and {config.providers} providers "
+            f"({sum(counts.values())} rows). Every account's password is '{SYNTHETIC_PASSWORD}'."
+        ))
@@ -0,0 +1,54 @@
+# soulcare_backend/authapp/management/commands/import_users.py
+
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from authapp.importers import UserImporter, IMPORT_ROLES, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-imports patients, doctors or counselors from a CSV or JSONL file (e.g. a partner clinic onboarding).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or JSONL file, one user per row.')
+        parser.add_argument('--role', required=True, choices=sorted(IMPORT_ROLES), help='Role of every user in the file.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted per transaction.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password hashing processes (default: CPU count, 0 hashes in-process).')
+        parser.add_argument('--report', help='Where to write the per-row error report (default: <path>.errors.csv).')
+        parser.add_argument('--no-email', action='store_true', help='Do not queue welcome / pending-verification emails.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not write anything.')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        if options['chunk_size'] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        importer = UserImporter(
+            role=options['role'],
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            send_emails=not options['no_email'],
+            dry_run=options['dry_run'],
+        )
+
+        def progress(imp):
+            self.stdout.write(
+                f"  {imp.processed} rows processed, {imp.created} created, "
+                f"{len(imp.errors)} errors ({imp.rows_per_second:.0f} rows/sec)"
+            )
+
+        importer.run(read_rows(path, options['format']), progress=progress if options['verbosity'] > 1 else None)
+
+        verb = "validated" if options['dry_run'] else "created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{importer.created} {options['role']} account(s) {verb} from {importer.processed} rows "
+            f"in {importer.elapsed:.2f}s ({importer.rows_per_second:.0f} rows/sec)."
+        ))
+
+        if importer.errors:
+            report = Path(options['report'] or f"{path}.errors.csv")
+            importer.write_error_report(report)
+            self.stdout.write(self.style.WARNING(f"{len(importer.errors)} row(s) rejected. Error report: {report}"))
@@ -0,0 +1,43 @@
+# soulcare_backend/authapp/management/commands/process_outbox.py
+
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from authapp.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued notification emails from the outbox (run continuously with --loop).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of draining once and exiting.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty (with --loop).')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows claimed per cycle.')
+        parser.add_argument('--workers', type=int, default=None, help='Sending threads, each reusing one SMTP connection.')
+
+    def handle(self, *args, **options):
+        totals = {'claimed': 0, 'sent': 0, 'retrying': 0, 'failed': 0}
+        try:
+            while True:
+                close_old_connections()
+                counts = process_outbox(batch_size=options['batch_size'], workers=options['workers'])
+                for key, value in counts.items():
+                    totals[key] += value
+
+                if counts['claimed']:
+                    self.stdout.write(
+                        f"Sent {counts['sent']}, retrying {counts['retrying']}, failed {counts['failed']} "
+                        f"(claimed {counts['claimed']})."
+                    )
+                    continue
+
+                # Outbox drained
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox processed: {totals['sent']} sent, {totals['retrying']} retrying, {totals['failed']} failed."
+        ))
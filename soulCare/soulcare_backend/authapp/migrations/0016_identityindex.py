@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_identity_index(apps, schema_editor):
+    User = apps.get_model('authapp', 'User')
+    IdentityIndex = apps.get_model('authapp', 'IdentityIndex')
+
+    nics = {}
+    for model_name in ('PatientProfile', 'DoctorProfile', 'CounselorProfile'):
+        model = apps.get_model('authapp', model_name)
+        for user_id, nic in model.objects.values_list('user_id', 'nic').iterator():
+            nic = (nic or '').strip().upper()
+            if nic:
+                nics.setdefault(user_id, nic)
+
+    seen = set()
+    rows = []
+    for user_id, email in User.objects.values_list('id', 'email').iterator():
+        nic = nics.get(user_id)
+        if nic in seen:
+            nic = None  # Legacy duplicate that only differs by case/whitespace
+        elif nic:
+            seen.add(nic)
+        rows.append(IdentityIndex(user_id=user_id, nic=nic, email=(email or '').strip().lower()))
+
+    IdentityIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0015_merge_20251125_2148'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentityIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nic', models.CharField(blank=True, max_length=20, null=True, unique=True)),
+                ('email', models.CharField(db_index=True, max_length=254)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='identity', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill_identity_index, migrations.RunPython.noop),
+    ]
@@ -148,3 +148,60 @@ class ProviderSchedule(models.Model):
 
     def __str__(self):
         return f"{self.provider.username}'s schedule for {self.get_day_of_week_display()}"
+
+
+class IdentityIndex(models.Model):
+    """
+    One row per user holding the normalized identity keys (NIC and email)
+    across all three profile tables, so uniqueness checks and lookups are a
+    single indexed probe. Kept in sync by the signals in authapp/signals.py.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='identity')
+    nic = models.CharField(max_length=20, unique=True, null=True, blank=True)
+    email = models.CharField(max_length=254, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} ({self.nic or 'no NIC'})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Durable outbox for notification emails (one row per recipient).
+    Rows are written by authapp.outbox.enqueue_emails (through the templates in
+    authapp/notifications.py) and delivered by the `process_outbox` management
+    command.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+
+    # Same key = same email; re-enqueueing it is a no-op
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    # Digest rows for the same recipient are merged into one email
+    digest = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
@@ -0,0 +1,229 @@
+# soulcare_backend/authapp/notifications.py
+
+from django.template import Context, Engine
+
+from user_settings.models import UserSettings
+from .outbox import enqueue_emails
+
+# Plain-text emails: no HTML autoescaping. Templates are compiled once per
+# process (on first use) and reused for every recipient.
+_engine = Engine(autoescape=False)
+
+# Keeps the preference IN (...) lookup below the database parameter limits.
+PREFERENCE_CHUNK_SIZE = 1000
+
+
+class Notification:
+    """
+    An email notification type: subject/body templates plus the UserSettings
+    flag (if any) that lets the recipient opt out of it.
+    """
+    def __init__(self, kind, subject, body, preference=None, digest=False):
+        self.kind = kind
+        self.subject_source = subject
+        self.body_source = body
+        self.preference = preference
+        self.digest = digest
+        self._templates = None
+
+    @property
+    def templates(self):
+        if self._templates is None:
+            self._templates = (
+                _engine.from_string(self.subject_source),
+                _engine.from_string(self.body_source),
+            )
+        return self._templates
+
+    def render(self, context):
+        subject_template, body_template = self.templates
+        ctx = Context(context, autoescape=False)
+        # Subjects must be a single line
+        subject = ' '.join(subject_template.render(ctx).split())
+        return subject, body_template.render(ctx)
+
+
+_SIGNATURE = """
+Best regards,
+The SoulCare Team
+"""
+
+NOTIFICATIONS = {n.kind: n for n in [
+    Notification(
+        'account_pending',
+        "SoulCare - Account Pending Verification",
+        """Hello {{ username }},
+
+Thank you for registering with SoulCare!
+
+Your account has been created successfully and is currently PENDING VERIFICATION.
+Our admin team will review your credentials. You will receive another email once your account is verified.
+""" + _SIGNATURE,
+    ),
+    Notification(
+        'account_verified',
+        "SoulCare - Account Verified!",
+        """Hello {{ username }},
+
+Great news! Your SoulCare account has been VERIFIED.
+
+You can now log in to your dashboard, set your schedule, and start accepting appointments.
+
+Login here: {{ login_url }}
+""" + _SIGNATURE,
+    ),
+    Notification(
+        'patient_welcome',
+        "Welcome to SoulCare! Your Journey Starts Here.",
+        """Hello {{ username }},
+
+Welcome to the SoulCare family! We are honored to be part of your mental wellness journey.
+
+Your account has been successfully created. You can now log in to:
+- Browse our verified doctors and counselors.
+- Book appointments.
+- Take a Questionnaire to assess your Stress level
+- Use our mood tracker and journaling tools.
+- Play Stress Reducing Games.
+- Massage With Professionals.
+- Chat with our AI Companion.
+- Access personalized resources.
+
+Login here: {{ login_url }}
+
+If you have any questions, our support team is here to help.
+
+Warm regards,
+The SoulCare Team
+""",
+    ),
+    Notification(
+        'appointment_approved',
+        "SoulCare - Appointment Confirmed",
+        """Hello {{ patient_name }},
+
+Your appointment request has been CONFIRMED.
+
+{{ provider_type }}: {{ provider_name }}
+Date: {{ date }}
+Time: {{ time }}
+
+Please be ready 5 minutes before your scheduled time.
+""" + _SIGNATURE,
+        preference='email_appointment_updates',
+    ),
+    Notification(
+        'appointment_cancelled_by_patient',
+        "SoulCare - Appointment Cancelled by Patient",
+        """Hello {{ provider_name }},
+
+The appointment with {{ patient_name }} on {{ date }} at {{ time }} has been CANCELLED.
+""" + _SIGNATURE,
+        preference='email_appointment_updates',
+    ),
+    Notification(
+        'appointment_cancelled_by_provider',
+        "SoulCare - IMPORTANT: Appointment Cancelled",
+        """Hello {{ patient_name }},
+
+Your appointment with {{ provider_name }} on {{ date }} at {{ time }} has been CANCELLED.
+""" + _SIGNATURE,
+        preference='email_appointment_updates',
+    ),
+    Notification(
+        'content_shared',
+        "SoulCare - New Resource Shared: {{ title }}",
+        """Hello {{ username }},
+
+{{ provider_type }}: {{ provider_name }} has shared a new resource with you: "{{ title }}".
+Log in to your dashboard to view it.
+""" + _SIGNATURE,
+        preference='email_new_messages',
+        digest=True,
+    ),
+    Notification(
+        'prescription_shared',
+        "SoulCare - New Prescription Received",
+        """Hello {{ patient_name }},
+
+Dr. {{ doctor_name }} has issued a new prescription for you.
+
+Date Issued: {{ date_issued }}
+Diagnosis: {{ diagnosis }}
+
+Please log in to your Account to view the full details and medication list.
+""" + _SIGNATURE,
+    ),
+    Notification(
+        'blog_published',
+        "SoulCare - Your Blog Post is Live!",
+        """Hello {{ username }},
+
+Congratulations! Your blog post "{{ title }}" has been APPROVED and is now live on the SoulCare platform.
+
+Thank you for your contribution.
+""" + _SIGNATURE,
+    ),
+    Notification(
+        'blog_rejected',
+        "SoulCare - Update on Your Blog Post",
+        """Hello {{ username }},
+
+We reviewed your blog post "{{ title }}". Unfortunately, it has been declined at this time.
+
+Please review our content guidelines and feel free to submit a new draft.
+""" + _SIGNATURE,
+    ),
+]}
+
+
+def resolve_email_preferences(user_ids, preference):
+    """
+    Returns the subset of user_ids that accept emails for `preference`
+    (a boolean UserSettings field). One query per chunk of users; users with no
+    settings row get the model default (opted in).
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    opted_out = set()
+    for start in range(0, len(user_ids), PREFERENCE_CHUNK_SIZE):
+        chunk = user_ids[start:start + PREFERENCE_CHUNK_SIZE]
+        opted_out.update(
+            UserSettings.objects.filter(user_id__in=chunk, **{preference: False}).values_list('user_id', flat=True)
+        )
+    return {user_id for user_id in user_ids if user_id not in opted_out}
+
+
+def render_notification(kind, context):
+    return NOTIFICATIONS[kind].render(context)
+
+
+def notify_many(kind, items):
+    """
+    Renders and queues one notification type for many recipients.
+
+    `items` is an iterable of (user, context, idempotency_key). Recipients who
+    opted out via UserSettings are dropped using a single preference query;
+    everything else is rendered in memory and queued with one outbox insert.
+    Returns the number of emails queued.
+    """
+    notification = NOTIFICATIONS[kind]
+    items = [item for item in items if item[0] is not None and item[0].email]
+    if notification.preference and items:
+        allowed = resolve_email_preferences([user.pk for user, _, _ in items], notification.preference)
+        items = [item for item in items if item[0].pk in allowed]
+
+    emails = []
+    for user, context, key in items:
+        subject, body = notification.render(context)
+        emails.append({
+            'subject': subject,
+            'body': body,
+            'recipient_list': [user.email],
+            'idempotency_key': key,
+            'digest': notification.digest,
+        })
+    return enqueue_emails(emails) if emails else 0
+
+
+def notify(kind, user, context, idempotency_key=None):
+    return notify_many(kind, [(user, context, idempotency_key)])
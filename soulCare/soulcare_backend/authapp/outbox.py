@@ -0,0 +1,227 @@
+# soulcare_backend/authapp/outbox.py
+
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DEFAULTS = {
+    'BATCH_SIZE': 200,            # rows claimed per worker cycle
+    'WORKERS': 4,                 # sending threads (each with one SMTP connection)
+    'MAX_ATTEMPTS': 5,            # after this the row is marked 'failed'
+    'RETRY_BASE_SECONDS': 60,     # backoff: base * 2 ** (attempts - 1)
+    'LOCK_SECONDS': 300,          # claimed rows are re-claimable after this (crashed worker)
+    'DIGEST_WINDOW_SECONDS': 900, # a recipient's first digest row waits this long; later ones join it
+}
+
+
+def outbox_setting(name):
+    return getattr(settings, 'EMAIL_OUTBOX', {}).get(name, OUTBOX_DEFAULTS[name])
+
+
+# --- ENQUEUE ---
+
+def enqueue_emails(emails):
+    """
+    Writes emails to the outbox in one bulk INSERT.
+
+    `emails` is an iterable of dicts with: subject, body, recipient_list and
+    optionally idempotency_key, digest, from_email. With an idempotency key,
+    enqueueing the same email twice is a no-op (the key is suffixed with the
+    recipient so multi-recipient emails stay unique per row).
+    """
+    now = timezone.now()
+    digest_due = now + timedelta(seconds=outbox_setting('DIGEST_WINDOW_SECONDS'))
+    rows = []
+    for email in emails:
+        key = email.get('idempotency_key')
+        digest = email.get('digest', False)
+        for recipient in email['recipient_list']:
+            if not recipient:
+                continue
+            rows.append(OutboundEmail(
+                recipient=recipient,
+                subject=email['subject'][:255],
+                body=email['body'],
+                from_email=email.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+                idempotency_key=f"{key}:{recipient}" if key else None,
+                digest=digest,
+                next_attempt_at=digest_due if digest else now,
+            ))
+    if rows:
+        OutboundEmail.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    return len(rows)
+
+
+def enqueue_email(subject, body, recipient_list, idempotency_key=None, digest=False, from_email=None):
+    return enqueue_emails([{
+        'subject': subject,
+        'body': body,
+        'recipient_list': recipient_list,
+        'idempotency_key': idempotency_key,
+        'digest': digest,
+        'from_email': from_email,
+    }])
+
+
+# --- DELIVERY ---
+
+def claim_batch(batch_size):
+    """
+    Marks up to `batch_size` due rows as 'sending' and returns them.
+    Rows locked by a crashed worker become claimable again after LOCK_SECONDS.
+
+    When a digest row comes due, every other pending digest row for that
+    recipient is claimed with it (even if not due yet), so everything queued
+    during the window goes out as one email. Rows waiting out a retry
+    backoff after a failed send are left until they are due themselves.
+    """
+    now = timezone.now()
+    due = OutboundEmail.objects.filter(
+        Q(status='pending', next_attempt_at__lte=now) | Q(status='sending', locked_until__lt=now)
+    ).order_by('next_attempt_at', 'id')
+    skip_locked = connection.features.has_select_for_update_skip_locked
+
+    with transaction.atomic():
+        if skip_locked:
+            # Lets several workers run side by side without claiming the same rows
+            due = due.select_for_update(skip_locked=True)
+        claimed = list(due.values_list('id', 'digest', 'recipient')[:batch_size])
+        ids = [row_id for row_id, _, _ in claimed]
+        digest_recipients = {recipient for _, digest, recipient in claimed if digest}
+        if digest_recipients:
+            siblings = OutboundEmail.objects.filter(
+                Q(attempts=0) | Q(next_attempt_at__lte=now),
+                status='pending', digest=True, recipient__in=digest_recipients,
+            ).exclude(id__in=ids)
+            if skip_locked:
+                siblings = siblings.select_for_update(skip_locked=True)
+            ids += list(siblings.values_list('id', flat=True))
+        if ids:
+            OutboundEmail.objects.filter(id__in=ids).update(
+                status='sending',
+                locked_until=now + timedelta(seconds=outbox_setting('LOCK_SECONDS')),
+            )
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def build_envelopes(rows):
+    """
+    Turns claimed rows into (row_ids, EmailMessage) pairs. Digest rows for the
+    same recipient collapse into a single email.
+    """
+    envelopes = []
+    digests = defaultdict(list)
+    for row in rows:
+        if row.digest:
+            digests[(row.recipient, row.from_email)].append(row)
+        else:
+            envelopes.append(([row.id], EmailMessage(row.subject, row.body, row.from_email, [row.recipient])))
+
+    for (recipient, from_email), items in digests.items():
+        if len(items) == 1:
+            subject, body = items[0].subject, items[0].body
+        else:
+            subject = f"SoulCare - You have {len(items)} new notifications"
+            body = "\n\n----------------------------------------\n\n".join(
+                f"{item.subject}\n{item.body}" for item in items
+            )
+        envelopes.append(([item.id for item in items], EmailMessage(subject, body, from_email, [recipient])))
+    return envelopes
+
+
+def _send_envelopes(envelopes):
+    """
+    Sends a slice of envelopes over ONE backend connection.
+    Returns [(row_ids, error_or_None)]. Runs in a pool thread, so no DB access here.
+    """
+    backend = get_connection(fail_silently=False)
+    try:
+        backend.open()
+    except Exception as exc:
+        return [(ids, exc) for ids, _ in envelopes]
+
+    results = []
+    try:
+        for ids, message in envelopes:
+            message.connection = backend
+            try:
+                backend.send_messages([message])
+                results.append((ids, None))
+            except Exception as exc:
+                results.append((ids, exc))
+    finally:
+        try:
+            backend.close()
+        except Exception:
+            logger.exception("Error closing email connection")
+    return results
+
+
+def _record_results(rows, results):
+    now = timezone.now()
+    by_id = {row.id: row for row in rows}
+    sent_ids = [row_id for ids, error in results if error is None for row_id in ids]
+    if sent_ids:
+        OutboundEmail.objects.filter(id__in=sent_ids).update(
+            status='sent', sent_at=now, locked_until=None, last_error='',
+        )
+
+    max_attempts = outbox_setting('MAX_ATTEMPTS')
+    base = outbox_setting('RETRY_BASE_SECONDS')
+    failed = 0
+    for ids, error in results:
+        if error is None:
+            continue
+        for row_id in ids:
+            row = by_id[row_id]
+            row.attempts += 1
+            row.last_error = str(error)[:2000]
+            row.locked_until = None
+            if row.attempts >= max_attempts:
+                row.status = 'failed'
+                failed += 1
+            else:
+                row.status = 'pending'
+                row.next_attempt_at = now + timedelta(seconds=base * 2 ** (row.attempts - 1))
+            row.save(update_fields=['attempts', 'last_error', 'locked_until', 'status', 'next_attempt_at'])
+    return len(sent_ids), failed
+
+
+def process_outbox(batch_size=None, workers=None):
+    """
+    Claims one batch of due emails and delivers it with a bounded thread pool.
+    Returns a dict of counts: claimed, sent, retrying, failed.
+    """
+    batch_size = batch_size or outbox_setting('BATCH_SIZE')
+    workers = max(1, workers or outbox_setting('WORKERS'))
+
+    rows = claim_batch(batch_size)
+    if not rows:
+        return {'claimed': 0, 'sent': 0, 'retrying': 0, 'failed': 0}
+
+    envelopes = build_envelopes(rows)
+    # One slice (and therefore one connection) per worker thread
+    slices = [envelopes[i::workers] for i in range(min(workers, len(envelopes)))]
+    results = []
+    with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+        for slice_results in pool.map(_send_envelopes, slices):
+            results.extend(slice_results)
+
+    sent, failed = _record_results(rows, results)
+    return {
+        'claimed': len(rows),
+        'sent': sent,
+        'retrying': len(rows) - sent - failed,
+        'failed': failed,
+    }
@@ -0,0 +1,130 @@
+# soulcare_backend/authapp/profiles.py
+
+from collections import defaultdict
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+from .models import PatientProfile, DoctorProfile, CounselorProfile
+
+# Maps a User.role to (reverse one-to-one accessor, profile model).
+ROLE_PROFILES = {
+    'user': ('patientprofile', PatientProfile),
+    'doctor': ('doctorprofile', DoctorProfile),
+    'counselor': ('counselorprofile', CounselorProfile),
+}
+
+# Attribute used to memoize the resolved profile on a User instance.
+_CACHE_ATTR = '_role_profile'
+_MISSING = object()
+
+
+def profile_accessor(role):
+    """
+    Returns the reverse accessor name (e.g. 'doctorprofile') for a role, or None.
+    """
+    entry = ROLE_PROFILES.get(role)
+    return entry[0] if entry else None
+
+
+def get_role_profile(user):
+    """
+    Returns the profile matching the user's role (or None), resolving it once.
+
+    Only the accessor for the user's own role is touched, so a doctor never pays
+    for a patientprofile/counselorprofile miss. The result is memoized on the
+    instance, so repeated calls from several serializer methods are free.
+    """
+    if user is None:
+        return None
+
+    cached = getattr(user, _CACHE_ATTR, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    accessor = profile_accessor(user.role)
+    profile = None
+    if accessor:
+        try:
+            profile = getattr(user, accessor)
+        except ObjectDoesNotExist:
+            profile = None
+
+    setattr(user, _CACHE_ATTR, profile)
+    return profile
+
+
+def with_role_profiles(queryset, role=None, prefix=''):
+    """
+    Adds select_related() for the role profile(s) of a User queryset.
+
+    - role: when the queryset is already restricted to one role, only that
+      profile is joined. Otherwise all three are LEFT JOINed in the same query.
+    - prefix: the relation path to the user when the queryset is not a User
+      queryset, e.g. with_role_profiles(Message.objects.all(), prefix='sender').
+    """
+    if role is not None:
+        accessors = [profile_accessor(role)] if profile_accessor(role) else []
+    else:
+        accessors = [accessor for accessor, _ in ROLE_PROFILES.values()]
+
+    if prefix:
+        related = [prefix] + [f"{prefix}__{accessor}" for accessor in accessors]
+    else:
+        related = accessors
+
+    return queryset.select_related(*related)
+
+
+def prefetch_role_profiles(users):
+    """
+    Batch-loads role profiles for a list of users: one query per role present.
+
+    Users whose profile is already known (memoized, or loaded through
+    with_role_profiles) are skipped. Missing profiles are cached as None.
+    """
+    pending = defaultdict(list)
+    for user in users:
+        if user is None or getattr(user, _CACHE_ATTR, _MISSING) is not _MISSING:
+            continue
+        entry = ROLE_PROFILES.get(user.role)
+        if entry is None:
+            setattr(user, _CACHE_ATTR, None)
+            continue
+
+        accessor, _ = entry
+        related = getattr(type(user), accessor).related
+        if related.is_cached(user):
+            try:
+                setattr(user, _CACHE_ATTR, getattr(user, accessor))
+            except ObjectDoesNotExist:
+                setattr(user, _CACHE_ATTR, None)
+            continue
+        pending[user.role].append(user)
+
+    for role, role_users in pending.items():
+        accessor, model = ROLE_PROFILES[role]
+        related = getattr(type(role_users[0]), accessor).related
+        profiles = {
+            profile.user_id: profile
+            for profile in model.objects.filter(user_id__in={u.pk for u in role_users})
+        }
+        for user in role_users:
+            profile = profiles.get(user.pk)
+            if profile is not None:
+                # Also prime Django's own relation cache, so user.<accessor> is free.
+                related.set_cached_value(user, profile)
+                profile.user = user
+            setattr(user, _CACHE_ATTR, profile)
+
+    return users
+
+
+class RoleProfileListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that batch-loads role profiles for the whole page of users
+    before the child serializer renders each one.
+    """
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        users = list(iterable)
+        prefetch_role_profiles(users)
+        return [self.child.to_representation(user) for user in users]
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User,PatientProfile,DoctorProfile,CounselorProfile,ProviderSchedule
+from .profiles import get_role_profile, RoleProfileListSerializer
+from .identity import is_nic_taken, find_user_by_email
 import pyotp
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_decode
@@ -31,17 +34,38 @@ class UserSerializer(serializers.ModelSerializer):
             return PatientProfileSerializer(obj.patientprofile).data
         return None
 
-def validate_nic_uniqueness(nic_value):
+NIC_TAKEN_MESSAGE = "An account with this NIC card number already exists."
+
+def validate_nic_uniqueness(nic_value, exclude_user_id=None):
+    """
+    Checks if an NIC already exists in ANY profile (one probe on IdentityIndex).
+    """
+    return not is_nic_taken(nic_value, exclude_user_id=exclude_user_id)
+
+
+class AtomicRegistrationMixin:
     """
-    Checks if an NIC already exists in ANY profile.
+    Creates the user and profile together. A concurrent registration with the
+    same normalized NIC passes validate_nic too; the loser's identity sync
+    then fails, which becomes a NIC error instead of a 500 or a profile-less user.
     """
-    if PatientProfile.objects.filter(nic=nic_value).exists():
-        return False
-    if DoctorProfile.objects.filter(nic=nic_value).exists():
-        return False
-    if CounselorProfile.objects.filter(nic=nic_value).exists():
-        return False
-    return True
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            if is_nic_taken(self.validated_data.get('nic')):
+                raise serializers.ValidationError({'nic': [NIC_TAKEN_MESSAGE]})
+            raise
+
+
+class ProfileNICValidationMixin:
+    """Rejects a NIC held by another user, compared after normalization."""
+    def validate_nic(self, value):
+        user_id = self.instance.user_id if self.instance is not None else None
+        if not validate_nic_uniqueness(value, exclude_user_id=user_id):
+            raise serializers.ValidationError(NIC_TAKEN_MESSAGE)
+        return value
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -69,7 +93,7 @@ class LoginSerializer(serializers.Serializer):
 
 
 
-class PatientRegistrationSerializer(serializers.ModelSerializer):
+class PatientRegistrationSerializer(AtomicRegistrationMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only = True)
     full_name = serializers.CharField()
     nic = serializers.CharField()
@@ -94,7 +118,7 @@ class PatientRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_nic(self, value):
         if not validate_nic_uniqueness(value):
-            raise serializers.ValidationError("An account with this NIC card number already exists.")
+            raise serializers.ValidationError(NIC_TAKEN_MESSAGE)
         return value
 
     def create(self, validated_data):
@@ -141,7 +165,7 @@ class PatientRegistrationSerializer(serializers.ModelSerializer):
 
         return user
 
-class DoctorRegistrationSerializer(serializers.ModelSerializer):
+class DoctorRegistrationSerializer(AtomicRegistrationMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     full_name = serializers.CharField()
     nic = serializers.CharField()
@@ -159,7 +183,7 @@ class DoctorRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_nic(self, value):
         if not validate_nic_uniqueness(value):
-            raise serializers.ValidationError("An account with this NIC card number already exists.")
+            raise serializers.ValidationError(NIC_TAKEN_MESSAGE)
         return value
 
     def create(self, validated_data):
@@ -193,7 +217,7 @@ class DoctorRegistrationSerializer(serializers.ModelSerializer):
 
         return user
 
-class CounselorRegistrationSerializer(serializers.ModelSerializer):
+class CounselorRegistrationSerializer(AtomicRegistrationMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     full_name = serializers.CharField()
     nic = serializers.CharField()
@@ -209,7 +233,7 @@ class CounselorRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_nic(self, value):
         if not validate_nic_uniqueness(value):
-            raise serializers.ValidationError("An account with this NIC card number already exists.")
+            raise serializers.ValidationError(NIC_TAKEN_MESSAGE)
         return value
 
     def create(self, validated_data):
@@ -242,20 +266,20 @@ class CounselorRegistrationSerializer(serializers.ModelSerializer):
 
         return user
 
-class DoctorProfileSerializer(serializers.ModelSerializer):
+class DoctorProfileSerializer(ProfileNICValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = DoctorProfile
         fields = ['full_name', 'nic', 'contact_number', 'specialization', 'availability', 'license_number','rating','profile_picture', 'bio']
 
 
-class CounselorProfileSerializer(serializers.ModelSerializer):
+class CounselorProfileSerializer(ProfileNICValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = CounselorProfile
         fields = ['full_name', 'nic', 'contact_number', 'expertise', 'license_number','rating','profile_picture', 'bio']
 
 
 
-class PatientProfileSerializer(serializers.ModelSerializer):
+class PatientProfileSerializer(ProfileNICValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = PatientProfile
         fields = ['full_name', 'nic', 'contact_number', 'address', 'dob', 'health_issues','profile_picture','risk_level','gender', 'marital_status', 'employment_status','financial_stress_level', 'chronic_illness','substance_use', 'mh_diagnosis_history',]
@@ -517,43 +541,27 @@ class UserInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'full_name', 'nic', 'contact_number','role','is_active','risk_level'] # Updated fields
+        # Batch-loads profiles for a whole page (one query per role) when many=True
+        list_serializer_class = RoleProfileListSerializer
 
     def get_full_name(self, obj):
-        # Safely access profile attributes
-        profile = None
-        if obj.role == 'user' and hasattr(obj, 'patientprofile'):
-            profile = obj.patientprofile
-        elif obj.role == 'doctor' and hasattr(obj, 'doctorprofile'):
-            profile = obj.doctorprofile
-        elif obj.role == 'counselor' and hasattr(obj, 'counselorprofile'):
-            profile = obj.counselorprofile
+        # The role profile is resolved once per user and shared by all getters
+        profile = get_role_profile(obj)
 
         # Return full_name from profile if available, else User's name, else username
         return getattr(profile, 'full_name', None) or obj.get_full_name() or obj.username
 
     def get_nic(self, obj):
-        profile = None
-        if obj.role == 'user' and hasattr(obj, 'patientprofile'):
-            profile = obj.patientprofile
-        elif obj.role == 'doctor' and hasattr(obj, 'doctorprofile'):
-            profile = obj.doctorprofile
-        elif obj.role == 'counselor' and hasattr(obj, 'counselorprofile'):
-            profile = obj.counselorprofile
-        return getattr(profile, 'nic', None) # Return None if not found
+        return getattr(get_role_profile(obj), 'nic', None) # Return None if not found
 
     def get_contact_number(self, obj):
-        profile = None
-        if obj.role == 'user' and hasattr(obj, 'patientprofile'):
-            profile = obj.patientprofile
-        elif obj.role == 'doctor' and hasattr(obj, 'doctorprofile'):
-            profile = obj.doctorprofile
-        elif obj.role == 'counselor' and hasattr(obj, 'counselorprofile'):
-            profile = obj.counselorprofile
-        return getattr(profile, 'contact_number', None) # Return None if not found
+        return getattr(get_role_profile(obj), 'contact_number', None) # Return None if not found
 
     def get_risk_level(self, obj):
-        if obj.role == 'user' and hasattr(obj, 'patientprofile'):
-            return obj.patientprofile.risk_level
+        if obj.role == 'user':
+            profile = get_role_profile(obj)
+            if profile is not None:
+                return profile.risk_level
         return 'low' # Default for non-patients or missing profiles
 
 
@@ -603,8 +611,12 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     def validate_email(self, value):
         # Check if user exists (optional security choice: some prefer not to reveal existence)
         # But for UX, it's often better to validate.
-        if not User.objects.filter(email=value).exists():
+        user = find_user_by_email(value)
+        if user is None:
             raise serializers.ValidationError("No user found with this email address.")
+
+        # Pass the user object to the view so it doesn't look it up again
+        self.user = user
         return value
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
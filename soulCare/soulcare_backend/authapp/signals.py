@@ -0,0 +1,32 @@
+# soulcare_backend/authapp/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User, PatientProfile, DoctorProfile, CounselorProfile
+from .identity import sync_user_identity, sync_profile_identity, clear_profile_identity
+
+
+@receiver(post_save, sender=User)
+def update_user_identity(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # e.g. login only touches last_login; nothing to re-index
+    if not created and update_fields is not None and 'email' not in update_fields:
+        return
+    sync_user_identity(instance)
+
+
+@receiver(post_save, sender=PatientProfile)
+@receiver(post_save, sender=DoctorProfile)
+@receiver(post_save, sender=CounselorProfile)
+def update_profile_identity(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_profile_identity(instance)
+
+
+@receiver(post_delete, sender=PatientProfile)
+@receiver(post_delete, sender=DoctorProfile)
+@receiver(post_delete, sender=CounselorProfile)
+def remove_profile_identity(sender, instance, **kwargs):
+    clear_profile_identity(instance)
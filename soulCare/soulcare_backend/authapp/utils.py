@@ -1,173 +1,91 @@
 # soulcare_backend/authapp/utils.py
 
-from django.core.mail import send_mail
-from django.conf import settings
-import threading
+from .notifications import notify, notify_many
+from .profiles import get_role_profile
 
-# We use threading to send emails in the background so the user request isn't slowed down
-class EmailThread(threading.Thread):
-    def __init__(self, subject, message, recipient_list):
-        self.subject = subject
-        self.message = message
-        self.recipient_list = recipient_list
-        threading.Thread.__init__(self)
+# --- SPECIFIC EMAIL SCENARIOS ---
+# Subjects/bodies live in authapp/notifications.py as precompiled templates; these
+# helpers only build the template context. Recipients' UserSettings email
+# preferences are applied there.
 
-    def run(self):
-        send_mail(
-            self.subject,
-            self.message,
-            settings.DEFAULT_FROM_EMAIL,
-            self.recipient_list,
-            fail_silently=False,
-        )
+LOGIN_URL = "http://localhost:5173/auth/login"
 
-def send_notification_email(subject, message, recipient_list):
-    """
-    Helper function to trigger the email thread.
-    """
-    EmailThread(subject, message, recipient_list).start()
 
-# --- SPECIFIC EMAIL SCENARIOS ---
+def _display_name(user):
+    profile = get_role_profile(user)
+    return getattr(profile, 'full_name', None) or user.username
 
-def send_account_pending_email(user):
-    subject = "SoulCare - Account Pending Verification"
-    message = f"""
-    Hello {user.username},
 
-    Thank you for registering with SoulCare!
+def _provider_type(provider):
+    return {'doctor': 'Doctor', 'counselor': 'Counselor'}.get(provider.role, 'Provider')
 
-    Your account has been created successfully and is currently PENDING VERIFICATION.
-    Our admin team will review your credentials. You will receive another email once your account is verified.
 
-    Best regards,
-    The SoulCare Team
-    """
-    send_notification_email(subject, message, [user.email])
+def account_pending_email(user):
+    return ('account_pending', user, {'username': user.username}, f"account-pending:{user.pk}")
 
-def send_account_verified_email(user):
-    subject = "SoulCare - Account Verified!"
-    message = f"""
-    Hello {user.username},
 
-    Great news! Your SoulCare account has been VERIFIED.
-    
-    You can now log in to your dashboard, set your schedule, and start accepting appointments.
+def patient_welcome_email(user):
+    return ('patient_welcome', user, {'username': user.username, 'login_url': LOGIN_URL}, f"welcome:{user.pk}")
 
-    Login here: http://localhost:5173/auth/login
 
-    Best regards,
-    The SoulCare Team
-    """
-    send_notification_email(subject, message, [user.email])
+def send_account_pending_email(user):
+    kind, user, context, key = account_pending_email(user)
+    notify(kind, user, context, idempotency_key=key)
+
+def send_account_verified_email(user):
+    notify('account_verified', user, {'username': user.username, 'login_url': LOGIN_URL},
+           idempotency_key=f"account-verified:{user.pk}")
 
 
 
 def send_appointment_approved_email(appointment):
     patient = appointment.patient
     provider = appointment.provider
-    
-  
-    # The User model doesn't have a generic 'profile' attribute.
-    # We must check the role to find the correct profile.
-    provider_name = provider.username # Fallback
-    
-    provider_type = 'Provider'
-    
-    try:
-        if provider.role == 'doctor' and hasattr(provider, 'doctorprofile'):
-            provider_name = provider.doctorprofile.full_name
-            provider_type = 'Doctor'
-        elif provider.role == 'counselor' and hasattr(provider, 'counselorprofile'):
-            provider_name = provider.counselorprofile.full_name
-            provider_type = 'Counselor'
-    except Exception:
-        pass # Keep using username if profile access fails
-  
-
-    subject = "SoulCare - Appointment Confirmed"
-    message = f"""
-    Hello {patient.patientprofile.full_name},
-
-    Your appointment request has been CONFIRMED.
-
-    {provider_type}: {provider_name}
-    Date: {appointment.date}
-    Time: {appointment.time}
 
-    Please be ready 5 minutes before your scheduled time.
-
-    Best regards,
-    The SoulCare Team
-    """
-    send_notification_email(subject, message, [patient.email])
+    notify('appointment_approved', patient, {
+        'patient_name': _display_name(patient),
+        'provider_type': _provider_type(provider),
+        'provider_name': _display_name(provider),
+        'date': str(appointment.date),
+        'time': str(appointment.time),
+    })
     
 
 def send_appointment_cancelled_email(appointment, cancelled_by_role):
     patient = appointment.patient
     provider = appointment.provider
-    
-    provider_name = provider.username
-    try:
-        if provider.role == 'doctor' and hasattr(provider, 'doctorprofile'):
-            provider_name = provider.doctorprofile.full_name
-        elif provider.role == 'counselor' and hasattr(provider, 'counselorprofile'):
-            provider_name = provider.counselorprofile.full_name
-    except Exception:
-        pass
-
-    patient_name = patient.username
-    try:
-        if hasattr(patient, 'patientprofile'):
-             patient_name = patient.patientprofile.full_name
-    except Exception:
-        pass
 
+    context = {
+        'patient_name': _display_name(patient),
+        'provider_name': _display_name(provider),
+        'date': str(appointment.date),
+        'time': str(appointment.time),
+    }
     if cancelled_by_role == 'patient':
-        recipient = [provider.email]
-        subject = "SoulCare - Appointment Cancelled by Patient"
-        message = f"""
-        Hello {provider_name},
-        The appointment with {patient_name} on {appointment.date} at {appointment.time} has been CANCELLED.
-        """
+        notify('appointment_cancelled_by_patient', provider, context)
     else:
-        recipient = [patient.email]
-        subject = "SoulCare - IMPORTANT: Appointment Cancelled"
-        message = f"""
-        Hello {patient_name},
-        Your appointment with {provider_name} on {appointment.date} at {appointment.time} has been CANCELLED.
-        """
-
-    send_notification_email(subject, message, recipient)
+        notify('appointment_cancelled_by_provider', patient, context)
     
     
 def send_content_shared_email(content_item, patient):
-    provider = content_item.owner
-    provider_name = provider.username
-    provider_type = 'Provider'
-    
-    try:
-        if provider.role == 'doctor' and hasattr(provider, 'doctorprofile'):
-            provider_name = provider.doctorprofile.full_name
-            provider_type = 'Doctor'
-            
-        elif provider.role == 'counselor' and hasattr(provider, 'counselorprofile'):
-            provider_name = provider.counselorprofile.full_name
-            provider_type = 'Counselor'
-            
-    except Exception:
-        pass
-    
-    subject = f"SoulCare - New Resource Shared: {content_item.title}"
-    message = f"""
-    Hello {patient.username},
+    send_content_shared_emails(content_item, [patient])
 
-    {provider_type}: {provider_name} has shared a new resource with you: "{content_item.title}".
-    Log in to your dashboard to view it.
 
-    Best regards,
-    The SoulCare Team
+def send_content_shared_emails(content_item, patients):
+    """
+    Queues the "new resource shared" email for every patient in one insert.
+    Sent in digest mode, so a patient receiving several shares gets one email.
     """
-    send_notification_email(subject, message, [patient.email])
+    provider = content_item.owner
+    shared = {
+        'title': content_item.title,
+        'provider_type': _provider_type(provider),
+        'provider_name': _display_name(provider),
+    }
+    notify_many('content_shared', (
+        (patient, dict(shared, username=patient.username), f"content-shared:{content_item.pk}:{patient.pk}")
+        for patient in patients
+    ))
     
 
 def send_blog_status_email(blog_post, status):
@@ -175,71 +93,17 @@ def send_blog_status_email(blog_post, status):
     Sends an email to the blog author when their post is approved or rejected.
     """
     author = blog_post.author
-    subject = ""
-    message = ""
-
-    if status == 'published':
-        subject = "SoulCare - Your Blog Post is Live!"
-        message = f"""
-        Hello {author.username},
-
-        Congratulations! Your blog post "{blog_post.title}" has been APPROVED and is now live on the SoulCare platform.
-
-        Thank you for your contribution.
-
-        Best regards,
-        The SoulCare Team
-        """
-    elif status == 'rejected':
-        subject = "SoulCare - Update on Your Blog Post"
-        message = f"""
-        Hello {author.username},
-
-        We reviewed your blog post "{blog_post.title}". Unfortunately, it has been declined at this time.
-
-        Please review our content guidelines and feel free to submit a new draft.
-
-        Best regards,
-        The SoulCare Team
-        """
-    
-    if subject and message:
-        send_notification_email(subject, message, [author.email])    
+    kinds = {'published': 'blog_published', 'rejected': 'blog_rejected'}
+    if status in kinds:
+        notify(kinds[status], author, {'username': author.username, 'title': blog_post.title})
         
         
 def send_patient_welcome_email(user):
     """
     Sends a welcome email to a newly registered patient.
     """
-    subject = "Welcome to SoulCare! Your Journey Starts Here."
-    
-    # You can customize this message further with specific instructions
-    message = f"""
-    Hello {user.username},
-
-    Welcome to the SoulCare family! We are honored to be part of your mental wellness journey.
-
-    Your account has been successfully created. You can now log in to:
-    - Browse our verified doctors and counselors.
-    - Book appointments.
-    - Take a Questionnaire to assess your Stress level 
-    - Use our mood tracker and journaling tools.
-    - Play Stress Reducing Games. 
-    - Massage With Professionals.
-    - Chat with our AI Companion.
-    - Access personalized resources.
-    
-
-    Login here: http://localhost:5173/auth/login
-
-    If you have any questions, our support team is here to help.
-
-    Warm regards,
-    The SoulCare Team
-    """
-    
-    # Send to the user's email address
-    send_notification_email(subject, message, [user.email])
+    kind, user, context, key = patient_welcome_email(user)
+    notify(kind, user, context, idempotency_key=key)
     
     
 
@@ -247,38 +111,10 @@ def send_patient_welcome_email(user):
 def send_prescription_shared_email(prescription):
     patient = prescription.patient
     doctor = prescription.doctor
-    
-    # Safely get doctor name
-    doctor_name = doctor.username
-    try:
-        if hasattr(doctor, 'doctorprofile'):
-            doctor_name = doctor.doctorprofile.full_name
-    except Exception:
-        pass
-    
-    # Safely get patient name
-    patient_name = patient.username
-    try:
-        if hasattr(patient, 'patientprofile'):
-            patient_name = patient.patientprofile.full_name
-    except Exception:
-        pass
-
-    subject = "SoulCare - New Prescription Received"
-    message = f"""
-    Hello {patient_name},
 
-    Dr. {doctor_name} has issued a new prescription for you.
-
-    Date Issued: {prescription.date_issued}
-    Diagnosis: {prescription.diagnosis}
-
-    Please log in to your Account to view the full details and medication list.
-
-    Best regards,
-    The SoulCare Team
-    """
-    send_notification_email(subject, message, [patient.email])
-    
-    
-    
\ No newline at end of file
+    notify('prescription_shared', patient, {
+        'patient_name': _display_name(patient),
+        'doctor_name': _display_name(doctor),
+        'date_issued': str(prescription.date_issued),
+        'diagnosis': prescription.diagnosis,
+    }, idempotency_key=f"prescription:{prescription.pk}")
@@ -19,6 +19,7 @@ from moodtracker.models import MoodEntry # Import MoodEntry model
 # Appointment is already imported
 from appointments.models import Appointment
 from chat.models import Conversation, Message
+from .profiles import with_role_profiles
 from .utils import send_account_pending_email, send_account_verified_email,send_patient_welcome_email
 from content.models import ContentItem
 from prescriptions.models import Prescription
@@ -352,7 +353,7 @@ class DoctorPatientsView(APIView):
         ).values_list('patient', flat=True).distinct() # Get unique patient IDs
 
         # Fetch the User objects for these patients, ensuring they are patients ('user' role)
-        patients = User.objects.filter(id__in=patient_ids, role='user')
+        patients = with_role_profiles(User.objects.filter(id__in=patient_ids, role='user'), role='user')
 
         # Serialize the patient data
         serializer = UserInfoSerializer(patients, many=True)
@@ -628,8 +629,8 @@ class PasswordResetRequestView(APIView):
     def post(self, request):
         serializer = PasswordResetRequestSerializer(data=request.data)
         if serializer.is_valid():
-            email = serializer.validated_data['email']
-            user = User.objects.get(email=email)
+            user = serializer.user
+            email = user.email
 
             # Generate Token
             token = default_token_generator.make_token(user)
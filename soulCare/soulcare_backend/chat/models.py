@@ -50,6 +50,12 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['timestamp'] # Show oldest messages first
+        indexes = [
+            # Conversation history / latest message
+            models.Index(fields=['conversation', 'timestamp'], name='message_conversation_time_idx'),
+            # Unread counts
+            models.Index(fields=['conversation', 'is_read'], name='message_unread_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.username} at {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
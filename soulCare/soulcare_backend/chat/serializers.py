@@ -45,8 +45,11 @@ class ConversationListSerializer(serializers.ModelSerializer):
             return UserInfoSerializer(obj.patient, context=self.context).data
 
     def get_last_message(self, obj):
-        # Get the most recent message from the conversation
-        last_msg = obj.messages.order_by('-timestamp').first()
+        # ContactListView attaches the latest message up front; fall back to a query otherwise
+        if hasattr(obj, 'latest_message'):
+            last_msg = obj.latest_message
+        else:
+            last_msg = obj.messages.order_by('-timestamp').first()
         if last_msg:
             # We serialize the message using MessageSerializer
             return MessageSerializer(last_msg, context=self.context).data
@@ -54,6 +57,10 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
     def get_unread_count(self, obj):
         # Get the count of unread messages *for the current user*
+        if hasattr(obj, 'unread_messages'):
+            # Annotated by ContactListView for the requesting user
+            return obj.unread_messages
+
         user = self.context.get('user')
         if user:
             # Count messages where the user is NOT the sender and is_read is False
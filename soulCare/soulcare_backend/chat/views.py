@@ -5,8 +5,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import generics, status
-from django.db.models import Q
-from authapp.models import User
+from django.db.models import Q, Count, OuterRef, Subquery
+from authapp.profiles import with_role_profiles
 from appointments.models import Appointment
 from .models import Conversation, Message
 from .serializers import ConversationListSerializer, MessageSerializer
@@ -25,39 +25,56 @@ class ContactListView(APIView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        conversations = Conversation.objects.none()
 
         if user.role == 'user':
             # 1. Patient: Find all providers they have appointments with
-            provider_ids = Appointment.objects.filter(patient=user).values_list('provider_id', flat=True).distinct()
-            contacts = User.objects.filter(id__in=provider_ids)
-            
-            # 2. Find or create conversations for each provider
-            for provider in contacts:
-                Conversation.objects.get_or_create(patient=user, provider=provider)
-            
+            contact_ids = set(Appointment.objects.filter(patient=user).values_list('provider_id', flat=True))
+            existing_ids = set(Conversation.objects.filter(patient=user).values_list('provider_id', flat=True))
+
+            # 2. Create the missing conversations in one INSERT
+            Conversation.objects.bulk_create(
+                [Conversation(patient=user, provider_id=pid) for pid in contact_ids - existing_ids],
+                ignore_conflicts=True,
+            )
+
             # 3. Get all conversations for this patient
-            conversations = Conversation.objects.filter(patient=user)\
-                                                .select_related('provider', 'patient')\
-                                                .prefetch_related('messages')
+            conversations = Conversation.objects.filter(patient=user)
 
         elif user.role in ['doctor', 'counselor']:
             # 1. Provider: Find all patients they have appointments with
-            patient_ids = Appointment.objects.filter(provider=user).values_list('patient_id', flat=True).distinct()
-            contacts = User.objects.filter(id__in=patient_ids)
-            
-            # 2. Find or create conversations for each patient
-            for patient in contacts:
-                Conversation.objects.get_or_create(patient=patient, provider=user)
-                
+            contact_ids = set(Appointment.objects.filter(provider=user).values_list('patient_id', flat=True))
+            existing_ids = set(Conversation.objects.filter(provider=user).values_list('patient_id', flat=True))
+
+            # 2. Create the missing conversations in one INSERT
+            Conversation.objects.bulk_create(
+                [Conversation(patient_id=pid, provider=user) for pid in contact_ids - existing_ids],
+                ignore_conflicts=True,
+            )
+
             # 3. Get all conversations for this provider
-            conversations = Conversation.objects.filter(provider=user)\
-                                                .select_related('provider', 'patient')\
-                                                .prefetch_related('messages')
-            
+            conversations = Conversation.objects.filter(provider=user)
+
         else:
             return Response([], status=200) # Admins or other roles have no contacts
 
+        # Join both participants' profiles and compute the per-conversation
+        # unread count / latest message id in the same query.
+        latest_message = Message.objects.filter(conversation=OuterRef('pk')).order_by('-timestamp', '-id')
+        conversations = with_role_profiles(conversations, prefix='provider')
+        conversations = with_role_profiles(conversations, prefix='patient').annotate(
+            unread_messages=Count('messages', filter=Q(messages__is_read=False) & ~Q(messages__sender=user)),
+            latest_message_id=Subquery(latest_message.values('id')[:1]),
+        )
+        conversations = list(conversations)
+
+        # Load every latest message (with its sender profile) in one query
+        last_messages = with_role_profiles(
+            Message.objects.filter(id__in=[c.latest_message_id for c in conversations if c.latest_message_id]),
+            prefix='sender',
+        ).in_bulk()
+        for conversation in conversations:
+            conversation.latest_message = last_messages.get(conversation.latest_message_id)
+
         # Pass the requesting user to the serializer's context
         # This is CRITICAL for the serializer to calculate 'other_user' and 'unread_count'
         serializer_context = {'user': request.user}
@@ -86,7 +103,7 @@ class MessageListView(APIView):
             conversation.messages.filter(is_read=False).exclude(sender=request.user).update(is_read=True)
             
             # Get all messages for the conversation, ordered by time
-            messages = conversation.messages.order_by('timestamp').select_related('sender')
+            messages = with_role_profiles(conversation.messages.order_by('timestamp'), prefix='sender')
             serializer = MessageSerializer(messages, many=True)
             return Response(serializer.data)
             
@@ -100,7 +117,7 @@ class MessageDetailView(generics.RetrieveDestroyAPIView):
     API endpoint for retrieving or deleting a single message.
     DELETE /api/chat/messages/<id>/
     """
-    queryset = Message.objects.all()
+    queryset = with_role_profiles(Message.objects.all(), prefix='sender')
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated, IsSender] # Only the sender can delete
     lookup_field = 'pk' # Use the message ID from the URL
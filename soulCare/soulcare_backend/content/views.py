@@ -5,10 +5,22 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser,JSONParser
+from django.db.models import Prefetch
 from .models import ContentItem
 from .serializers import ContentItemSerializer
 from authapp.models import User
-from authapp.utils import send_content_shared_email
+from authapp.profiles import with_role_profiles
+from authapp.utils import send_content_shared_emails
+
+
+def with_shared_profiles(queryset):
+    """
+    Joins the owner's profile and prefetches shared_with patients with their
+    profiles, so ContentItemSerializer renders a page in a constant number of queries.
+    """
+    return with_role_profiles(queryset, prefix='owner').prefetch_related(
+        Prefetch('shared_with', queryset=with_role_profiles(User.objects.all(), role='user'))
+    )
 
 class ContentViewSet(viewsets.ModelViewSet):
     """
@@ -30,11 +42,11 @@ class ContentViewSet(viewsets.ModelViewSet):
         user = self.request.user
         
         if user.role == 'admin' or user.is_superuser:
-            return ContentItem.objects.all().order_by('-created_at')
+            return with_shared_profiles(ContentItem.objects.all()).order_by('-created_at')
         
         if user.role not in ['doctor', 'counselor']:
             return ContentItem.objects.none()
-        return ContentItem.objects.filter(owner=user)
+        return with_shared_profiles(ContentItem.objects.filter(owner=user))
 
     def perform_create(self, serializer):
         """
@@ -63,8 +75,8 @@ class ContentViewSet(viewsets.ModelViewSet):
             new_patient_ids = set(patient_ids) - current_shared_ids
             new_patients = patients.filter(id__in=new_patient_ids)
             
-            for patient in new_patients:
-                send_content_shared_email(content_item, patient)
+            # One outbox insert for all newly added patients
+            send_content_shared_emails(content_item, new_patients)
             
             # Return the updated object
             serializer = self.get_serializer(content_item)
@@ -89,6 +101,6 @@ class SharedWithMeView(generics.ListAPIView):
         user = self.request.user
         if user.role == 'user':
             # This uses the 'related_name' from the ContentItem model
-            return user.shared_content.all().order_by('-created_at')
+            return with_shared_profiles(user.shared_content.all()).order_by('-created_at')
         
         return ContentItem.objects.none()
\ No newline at end of file
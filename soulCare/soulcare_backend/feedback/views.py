@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from authapp.profiles import with_role_profiles
 from .models import Feedback
 from .serializers import FeedbackSerializer, FeedbackCreateSerializer
 
@@ -24,16 +25,18 @@ class FeedbackViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         
+        feedback = with_role_profiles(Feedback.objects.all(), prefix='user')
+
         if self.action in ['approve', 'reject']:
-          return Feedback.objects.all()
+          return feedback
       
         # Default: Show only approved feedback
-        queryset = Feedback.objects.filter(is_approved=True)
+        queryset = feedback.filter(is_approved=True)
 
         # Admin Override: If user is admin AND requests 'all' mode, show everything
         # The frontend Admin page should send ?mode=admin
         if self.request.user.is_staff and self.request.query_params.get('mode') == 'admin':
-            return Feedback.objects.all()
+            return feedback
             
         return queryset
 
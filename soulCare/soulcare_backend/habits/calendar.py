@@ -0,0 +1,209 @@
+# soulcare_backend/habits/calendar.py
+
+"""
+Daily completion rollups and the calendar (heatmap) built from them.
+
+HabitDailyRollup holds, per habit and day, the distinct tasks completed that
+day; days without completions have no row. A day's total is not stored: it
+is every task of the user's habits (or one habit) that existed by the end of
+that day, so it does not depend on which days saw a toggle. Weekly and
+monthly tasks count on every day of their period, and are done on every day
+of a period in which they were completed. The calendar returns per-day
+objects for short ranges, or a compact encoding for long ones: run-length
+heatmap levels or a base64 bitset of fully completed days.
+"""
+
+import base64
+from collections import defaultdict
+from datetime import timedelta
+from itertools import accumulate
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from soulcare_backend.db import upsert
+
+from .models import Habit, HabitDailyRollup, HabitTaskCompletion
+from .periods import PeriodContext, period_end_date, user_timezones
+
+# Ranges up to this many days default to per-day JSON objects
+CALENDAR_JSON_MAX_DAYS = 92
+CALENDAR_MAX_DAYS = 3 * 366
+CALENDAR_ENCODINGS = ('days', 'rle', 'bitset')
+
+# Heatmap intensity levels: 0 (nothing done) .. HEATMAP_LEVELS (all done)
+HEATMAP_LEVELS = 4
+
+ROLLUP_CHUNK_SIZE = 2000
+
+
+# --- MAINTENANCE ---
+
+def refresh_rollup(habit, day, periods):
+    """
+    Recounts one habit's rollup for `day` (after a toggle on that day), a
+    local day in the timezone of `periods`. A day left without completions
+    loses its row.
+    """
+    start, end = periods.midnight(day), periods.midnight(day + timedelta(days=1))
+    completed = (
+        HabitTaskCompletion.objects.filter(task__habit=habit, completed_at__gte=start, completed_at__lt=end)
+        .values('task_id').distinct().count()
+    )
+    if not completed:
+        HabitDailyRollup.objects.filter(habit=habit, day=day).delete()
+        return
+    upsert(
+        HabitDailyRollup,
+        [HabitDailyRollup(user_id=habit.user_id, habit=habit, day=day, completed=completed)],
+        unique_fields=['habit', 'day'],
+        update_fields=['completed'],
+    )
+
+
+def rebuild_rollups(habits=None, chunk_size=None):
+    """
+    Rebuilds the rollups of `habits` (default: all) from the completion log,
+    one grouped query per chunk of habits and owner timezone. Returns the
+    number of rollup rows written.
+    """
+    chunk_size = chunk_size or ROLLUP_CHUNK_SIZE
+    habits = (habits if habits is not None else Habit.objects.all()).order_by('pk')
+
+    written = 0
+    last_pk = 0
+    while True:
+        chunk = {habit.pk: habit for habit in habits.filter(pk__gt=last_pk).only('id', 'user_id')[:chunk_size]}
+        if not chunk:
+            return written
+        last_pk = max(chunk)
+        zones = user_timezones({habit.user_id for habit in chunk.values()})
+        habit_zones = {habit_id: zones.get(habit.user_id) for habit_id, habit in chunk.items()}
+
+        by_zone = defaultdict(list)
+        for habit_id, tz in habit_zones.items():
+            by_zone[tz].append(habit_id)
+
+        rollups = []
+        for tz, habit_ids in by_zone.items():
+            counts = (
+                HabitTaskCompletion.objects.filter(task__habit_id__in=habit_ids)
+                .annotate(day=TruncDate('completed_at', tzinfo=tz))
+                .values('task__habit_id', 'day')
+                .annotate(completed=Count('task_id', distinct=True))
+                .values_list('task__habit_id', 'day', 'completed')
+            )
+            rollups.extend(
+                HabitDailyRollup(user_id=chunk[habit_id].user_id, habit_id=habit_id, day=day, completed=completed)
+                for habit_id, day, completed in counts
+            )
+        with transaction.atomic():
+            HabitDailyRollup.objects.filter(habit_id__in=list(chunk)).delete()
+            HabitDailyRollup.objects.bulk_create(rollups, batch_size=5000)
+        written += len(rollups)
+
+
+# --- CALENDAR ---
+
+def _level(completed, total):
+    if not total or not completed:
+        return 0
+    return max(1, min(HEATMAP_LEVELS, round(HEATMAP_LEVELS * completed / total)))
+
+
+def encode_runs(values):
+    """[[value, run length], ...] for consecutive equal values."""
+    runs = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    return runs
+
+
+def encode_bitset(flags):
+    """Base64 of the flags packed eight per byte, first day in the high bit."""
+    packed = bytearray((len(flags) + 7) // 8)
+    for position, flag in enumerate(flags):
+        if flag:
+            packed[position // 8] |= 0x80 >> (position % 8)
+    return base64.b64encode(bytes(packed)).decode('ascii')
+
+
+def _spread(counts, start, end, first, last, amount=1):
+    """Adds `amount` to the days `first`..`last` of a difference array over `start`..`end`."""
+    first, last = max(first, start), min(last, end)
+    if first <= last:
+        counts[(first - start).days] += amount
+        counts[(last - start).days + 1] -= amount
+
+
+def habit_calendar(user, start, end, habit_id=None, encoding=None, periods=None):
+    """
+    Completion per day from `start` to `end` (inclusive) over the user's
+    habits, or one habit, in local days of `periods` (default: the user's).
+    `encoding` is 'days', 'rle' or 'bitset'; by default ranges longer than
+    CALENDAR_JSON_MAX_DAYS are run-length encoded. Three queries: the tasks,
+    the daily habits' rollups and the longer habits' completions.
+    """
+    periods = periods or PeriodContext.for_user(user)
+    length = (end - start).days + 1
+    encoding = encoding or ('days' if length <= CALENDAR_JSON_MAX_DAYS else 'rle')
+
+    habits = Habit.objects.filter(user=user)
+    if habit_id is not None:
+        habits = habits.filter(pk=habit_id)
+    # Difference arrays over the range: totals[i] and done[i] are prefix sums
+    totals, done = [0] * (length + 1), [0] * (length + 1)
+
+    frequencies, task_days = {}, {}
+    tasks = habits.values_list('id', 'frequency', 'target', 'created_at', 'tasks__id', 'tasks__created_at')
+    for pk, frequency, target, created_at, task_id, task_created_at in tasks:
+        frequencies[pk] = frequency
+        if task_id is None:
+            # A habit without tasks can't be completed, but still counts
+            _spread(totals, start, end, periods.local_date(created_at), end, target)
+        else:
+            task_days[task_id] = periods.local_date(task_created_at)
+            _spread(totals, start, end, task_days[task_id], end)
+
+    daily = [pk for pk, frequency in frequencies.items() if frequency == 'daily']
+    if daily:
+        rollups = (
+            HabitDailyRollup.objects.filter(user=user, habit_id__in=daily, day__range=[start, end])
+            .values('day').annotate(completed=Sum('completed')).values_list('day', 'completed')
+        )
+        for day, completed in rollups:
+            _spread(done, start, end, day, day, completed)
+
+    longer = [pk for pk, frequency in frequencies.items() if frequency != 'daily']
+    if longer:
+        # A month starts at most 30 days before `start` and still overlaps it
+        completions = HabitTaskCompletion.objects.filter(
+            task__habit_id__in=longer, period_start__range=[start - timedelta(days=30), end]
+        ).values_list('task_id', 'task__habit_id', 'period_start')
+        for task_id, pk, period_start in completions:
+            first = max(period_start, task_days[task_id])
+            _spread(done, start, end, first, period_end_date(frequencies[pk], period_start))
+
+    days = [start + timedelta(days=offset) for offset in range(length)]
+    cells = list(zip(accumulate(done[:length]), accumulate(totals[:length])))
+
+    data = {'start': start.isoformat(), 'end': end.isoformat(), 'encoding': encoding}
+    if encoding == 'days':
+        data['days'] = [
+            {
+                'date': day.isoformat(),
+                'completed': completed,
+                'total': total,
+                'ratio': round(completed / total, 3) if total else 0,
+            }
+            for day, (completed, total) in zip(days, cells)
+        ]
+    elif encoding == 'rle':
+        data['levels'] = HEATMAP_LEVELS
+        data['runs'] = encode_runs([_level(completed, total) for completed, total in cells])
+    else:
+        data['bits'] = encode_bitset([total > 0 and completed >= total for completed, total in cells])
+    return data
@@ -0,0 +1,22 @@
+# soulcare_backend/habits/management/commands/compute_missed_habits.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from habits.missed import DIGEST_USER_CHUNK_SIZE, build_digests
+
+
+class Command(BaseCommand):
+    help = "Builds every user's missed-habits digest for today. Run nightly, after midnight."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Report date (YYYY-MM-DD), defaults to today.')
+        parser.add_argument('--chunk-size', type=int, default=DIGEST_USER_CHUNK_SIZE, help='Users per query.')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            today = parse_date(options['date'])
+            if today is None:
+                raise CommandError(f"Invalid --date: {options['date']}")
+        written, missed = build_digests(today=today, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Missed-habit digests built for {written} users ({missed} missed tasks)."))
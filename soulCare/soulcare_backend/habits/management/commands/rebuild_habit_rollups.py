@@ -0,0 +1,20 @@
+# soulcare_backend/habits/management/commands/rebuild_habit_rollups.py
+
+from django.core.management.base import BaseCommand
+from habits.calendar import ROLLUP_CHUNK_SIZE, rebuild_rollups
+from habits.models import Habit
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily habit completion rollups behind the calendar from the completion log.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only rebuild this user id.')
+        parser.add_argument('--chunk-size', type=int, default=ROLLUP_CHUNK_SIZE, help='Habits per query.')
+
+    def handle(self, *args, **options):
+        habits = Habit.objects.all()
+        if options['user']:
+            habits = habits.filter(user_id=options['user'])
+        written = rebuild_rollups(habits, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Habit rollups rebuilt ({written} days)."))
@@ -0,0 +1,24 @@
+# soulcare_backend/habits/management/commands/recompute_habit_streaks.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from habits.models import Habit
+from habits.streaks import STREAK_CHUNK_SIZE, recompute_streaks
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds current and longest habit streaks from the completion log.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='Only recompute this user id.')
+        parser.add_argument('--chunk-size', type=int, default=STREAK_CHUNK_SIZE, help='Habits loaded per batch.')
+
+    def handle(self, *args, **options):
+        habits = Habit.objects.all()
+        if options['user']:
+            habits = habits.filter(user_id=options['user'])
+        started = time.perf_counter()
+        changed = recompute_streaks(habits, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Streaks recomputed in {elapsed:.1f}s ({changed} habits changed)."))
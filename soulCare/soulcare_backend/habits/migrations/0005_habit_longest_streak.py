@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0004_missedhabitdigest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='habit',
+            name='longest_streak',
+            field=models.IntegerField(default=0, help_text='Longest consecutive streak of full habit completion.'),
+        ),
+    ]
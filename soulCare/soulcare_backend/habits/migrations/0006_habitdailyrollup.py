@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:11
+
+from bisect import bisect_right
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Rollups from the completion log as of this migration, in server days: a
+    day's total counts the tasks created by its end.
+    """
+    Habit = apps.get_model('habits', 'Habit')
+    HabitTask = apps.get_model('habits', 'HabitTask')
+    HabitTaskCompletion = apps.get_model('habits', 'HabitTaskCompletion')
+    HabitDailyRollup = apps.get_model('habits', 'HabitDailyRollup')
+
+    habits = {pk: (user_id, target) for pk, user_id, target in Habit.objects.values_list('id', 'user_id', 'target')}
+    created = defaultdict(list)
+    for habit_id, created_at in HabitTask.objects.order_by('created_at').values_list('habit_id', 'created_at'):
+        created[habit_id].append(timezone.localtime(created_at).date())
+
+    counts = (
+        HabitTaskCompletion.objects.annotate(day=TruncDate('completed_at'))
+        .values('task__habit_id', 'day')
+        .annotate(completed=models.Count('task_id', distinct=True))
+        .values_list('task__habit_id', 'day', 'completed')
+    )
+    HabitDailyRollup.objects.bulk_create([
+        HabitDailyRollup(
+            user_id=habits[habit_id][0], habit_id=habit_id, day=day, completed=completed,
+            total=max(bisect_right(created[habit_id], day), completed) or habits[habit_id][1],
+        )
+        for habit_id, day, completed in counts.iterator(chunk_size=5000)
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0005_habit_longest_streak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completed', models.PositiveSmallIntegerField(default=0)),
+                ('total', models.PositiveSmallIntegerField(default=1)),
+                ('habit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='habits.habit')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habit_daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Habit Daily Rollup',
+                'verbose_name_plural': 'Habit Daily Rollups',
+                'indexes': [models.Index(fields=['user', 'day'], name='habit_rollup_user_day_idx')],
+                'unique_together': {('habit', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
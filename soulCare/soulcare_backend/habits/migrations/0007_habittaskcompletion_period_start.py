@@ -0,0 +1,106 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:24
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def period_start(frequency, day):
+    """First day of the Monday-based week or month containing `day`, as of this migration."""
+    if frequency == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if frequency == 'monthly':
+        return date(day.year, day.month, 1)
+    return day
+
+
+def rebuild_rollups(apps, habit_ids):
+    """The daily rollups of `habit_ids` recounted in server days, as in 0006."""
+    Habit = apps.get_model('habits', 'Habit')
+    HabitTask = apps.get_model('habits', 'HabitTask')
+    HabitTaskCompletion = apps.get_model('habits', 'HabitTaskCompletion')
+    HabitDailyRollup = apps.get_model('habits', 'HabitDailyRollup')
+
+    habits = {
+        pk: (user_id, target)
+        for pk, user_id, target in Habit.objects.filter(pk__in=habit_ids).values_list('id', 'user_id', 'target')
+    }
+    created = defaultdict(list)
+    tasks = HabitTask.objects.filter(habit_id__in=habit_ids).order_by('created_at').values_list('habit_id', 'created_at')
+    for habit_id, created_at in tasks:
+        created[habit_id].append(timezone.localtime(created_at).date())
+
+    counts = (
+        HabitTaskCompletion.objects.filter(task__habit_id__in=habit_ids)
+        .annotate(day=TruncDate('completed_at'))
+        .values('task__habit_id', 'day')
+        .annotate(completed=models.Count('task_id', distinct=True))
+        .values_list('task__habit_id', 'day', 'completed')
+    )
+    HabitDailyRollup.objects.filter(habit_id__in=habit_ids).delete()
+    HabitDailyRollup.objects.bulk_create([
+        HabitDailyRollup(
+            user_id=habits[habit_id][0], habit_id=habit_id, day=day, completed=completed,
+            total=max(bisect_right(created[habit_id], day), completed) or habits[habit_id][1],
+        )
+        for habit_id, day, completed in counts
+    ], batch_size=5000)
+
+
+def fill_period_start(apps, schema_editor):
+    """
+    Keys every completion by its habit's period and drops the duplicates
+    double-taps left behind, keeping the earliest completion of each period
+    (the affected habits' daily rollups are rebuilt without them).
+    """
+    HabitTaskCompletion = apps.get_model('habits', 'HabitTaskCompletion')
+    completions = (
+        HabitTaskCompletion.objects.order_by('task_id', 'completed_at', 'id')
+        .values_list('id', 'task_id', 'task__habit_id', 'task__habit__frequency', 'completed_at')
+    )
+    seen = set()
+    keyed, duplicates, affected = [], [], set()
+    for pk, task_id, habit_id, frequency, completed_at in completions.iterator(chunk_size=5000):
+        key = (task_id, period_start(frequency, timezone.localtime(completed_at).date()))
+        if key in seen:
+            duplicates.append(pk)
+            affected.add(habit_id)
+        else:
+            seen.add(key)
+            keyed.append(HabitTaskCompletion(pk=pk, period_start=key[1]))
+
+    for start in range(0, len(duplicates), 5000):
+        HabitTaskCompletion.objects.filter(pk__in=duplicates[start:start + 5000]).delete()
+    HabitTaskCompletion.objects.bulk_update(keyed, ['period_start'], batch_size=5000)
+    affected = sorted(affected)
+    for start in range(0, len(affected), 1000):
+        rebuild_rollups(apps, affected[start:start + 1000])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0006_habitdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='habittaskcompletion',
+            name='period_start',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(fill_period_start, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='habittaskcompletion',
+            name='period_start',
+            field=models.DateField(),
+        ),
+        migrations.AddConstraint(
+            model_name='habittaskcompletion',
+            constraint=models.UniqueConstraint(fields=('task', 'period_start'), name='unique_task_completion_period'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:02
+
+from django.db import migrations
+
+
+def drop_empty_rollups(apps, schema_editor):
+    """Un-toggled days used to keep a row with nothing completed."""
+    apps.get_model('habits', 'HabitDailyRollup').objects.filter(completed=0).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0007_habittaskcompletion_period_start'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_empty_rollups, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='habitdailyrollup',
+            name='total',
+        ),
+    ]
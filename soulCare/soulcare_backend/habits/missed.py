@@ -0,0 +1,125 @@
+# soulcare_backend/habits/missed.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Case, DateTimeField, Exists, OuterRef, Value, When
+from soulcare_backend.db import upsert
+
+from .models import FREQUENCY_CHOICES, Habit, HabitTask, HabitTaskCompletion, MissedHabitDigest
+from .periods import PeriodContext, user_timezones
+
+# Users whose digests are built per query in batch mode
+DIGEST_USER_CHUNK_SIZE = 1000
+DIGEST_RETENTION_DAYS = 30
+
+
+def previous_period_windows(periods):
+    """
+    {frequency: (start, end, last day)} of the previous period, as a
+    half-open [start, end) datetime range ending where the current period starts.
+    """
+    return {frequency: periods.previous(frequency) for frequency, _ in FREQUENCY_CHOICES}
+
+
+def _window_bound(windows, index):
+    return Case(
+        *[When(habit__frequency=frequency, then=Value(bounds[index])) for frequency, bounds in windows.items()],
+        output_field=DateTimeField(),
+    )
+
+
+def missed_tasks(tasks, periods):
+    """
+    Tasks of `tasks` (a HabitTask queryset) with no completion in their
+    habit's previous period (per `periods`, a PeriodContext), read with one
+    NOT EXISTS query. Yields (user_id, report item) ordered by user.
+    """
+    windows = previous_period_windows(periods)
+    completed_in_window = HabitTaskCompletion.objects.filter(
+        task=OuterRef('pk'),
+        completed_at__gte=OuterRef('window_start'),
+        completed_at__lt=OuterRef('window_end'),
+    )
+    rows = (
+        tasks.annotate(window_start=_window_bound(windows, 0), window_end=_window_bound(windows, 1))
+        .filter(~Exists(completed_in_window))
+        .order_by('habit__user_id', 'habit_id', 'id')
+        .values_list('habit__user_id', 'habit_id', 'habit__name', 'id', 'name', 'habit__frequency')
+    )
+    for user_id, habit_id, habit_name, task_id, task_name, frequency in rows:
+        yield user_id, {
+            'habit_id': habit_id,
+            'habit_name': habit_name,
+            'task_id': task_id,
+            'task_name': task_name,
+            'frequency': frequency,
+            'missed_period_end_date': windows[frequency][2].isoformat(),
+        }
+
+
+def missed_habits_report(user, periods=None):
+    """
+    The user's missed-habits report: today's precomputed digest when there
+    is one, otherwise computed live (and stored as today's digest). "Today"
+    is in the user's timezone.
+    """
+    periods = periods or PeriodContext.for_user(user)
+    today = periods.today
+    digest = MissedHabitDigest.objects.filter(user=user, report_date=today).only('missed').first()
+    if digest is not None:
+        return digest.missed
+    missed = [item for _, item in missed_tasks(HabitTask.objects.filter(habit__user=user), periods)]
+    _store_digests([user.pk], {user.pk: missed}, today)
+    return missed
+
+
+def _store_digests(user_ids, missed, today):
+    """Upserts the (possibly empty) digest of every user in `user_ids`."""
+    upsert(
+        MissedHabitDigest,
+        [
+            MissedHabitDigest(user_id=user_id, report_date=today, missed=missed.get(user_id, []),
+                              missed_count=len(missed.get(user_id, [])))
+            for user_id in user_ids
+        ],
+        unique_fields=['user', 'report_date'],
+        update_fields=['missed', 'missed_count', 'computed_at'],
+    )
+
+
+def invalidate_missed_habits(user):
+    """Drops the user's cached digests after habits or tasks change."""
+    MissedHabitDigest.objects.filter(user=user).delete()
+
+
+def build_digests(today=None, chunk_size=None):
+    """
+    Batch mode: builds the digest of every user who has habits for their own
+    "today" (or `today`), one NOT EXISTS query and one upsert per chunk of
+    users sharing a timezone, and prunes digests older than
+    DIGEST_RETENTION_DAYS. Returns (digests written, tasks missed).
+    """
+    chunk_size = chunk_size or DIGEST_USER_CHUNK_SIZE
+    user_ids = list(Habit.objects.order_by('user_id').values_list('user_id', flat=True).distinct())
+
+    written = missed_total = 0
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        zones = user_timezones(chunk)
+        by_zone = defaultdict(list)
+        for user_id in chunk:
+            by_zone[zones.get(user_id)].append(user_id)
+
+        for tz, zone_users in by_zone.items():
+            periods = PeriodContext(tz, today)
+            missed = defaultdict(list)
+            for user_id, item in missed_tasks(HabitTask.objects.filter(habit__user_id__in=zone_users), periods):
+                missed[user_id].append(item)
+            _store_digests(zone_users, missed, periods.today)
+            missed_total += sum(len(items) for items in missed.values())
+        written += len(chunk)
+
+    oldest = (today or PeriodContext().today) - timedelta(days=DIGEST_RETENTION_DAYS)
+    MissedHabitDigest.objects.filter(report_date__lt=oldest).delete()
+    return written, missed_total
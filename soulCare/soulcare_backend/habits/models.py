@@ -40,6 +40,7 @@ class Habit(models.Model):
 
     # Simple Streak management (still tracked at the Habit level)
     streak = models.IntegerField(default=0, help_text="Current consecutive streak of full habit completion.")
+    longest_streak = models.IntegerField(default=0, help_text="Longest consecutive streak of full habit completion.")
 
     # UI/Display fields
     color = models.CharField(max_length=50, default='hsl(210, 80%, 50%)', help_text="HSL color string for frontend display.")
@@ -91,6 +92,9 @@ class HabitTaskCompletion(models.Model):
         related_name='completions'
     )
     completed_at = models.DateTimeField(auto_now_add=True)
+    # First day of the habit's period this completion counts for, in the user's timezone
+    # (PeriodContext.start_date); required, a task is completed at most once per period
+    period_start = models.DateField()
 
     class Meta:
         verbose_name = "Habit Task Completion"
@@ -99,6 +103,66 @@ class HabitTaskCompletion(models.Model):
         indexes = [
             models.Index(fields=['task', 'completed_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'period_start'], name='unique_task_completion_period'),
+        ]
 
     def __str__(self):
         return f"Completed: {self.task.name} at {self.completed_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class MissedHabitDigest(models.Model):
+    """
+    Precomputed missed-habits report of one user for one day: the tasks not
+    completed in their habit's previous period. Built nightly for every user
+    by `manage.py compute_missed_habits` (see habits/missed.py).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='missed_habit_digests'
+    )
+    report_date = models.DateField()
+    missed = models.JSONField(default=list)
+    missed_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Missed Habit Digest"
+        verbose_name_plural = "Missed Habit Digests"
+        unique_together = ('user', 'report_date')
+
+    def __str__(self):
+        return f"{self.user.username}: {self.missed_count} missed on {self.report_date}"
+
+
+class HabitDailyRollup(models.Model):
+    """
+    Per-day completion of one habit: distinct tasks completed that day. Only
+    days with completions have a row; the calendar derives each day's total
+    from the habit's tasks. Maintained on toggle and rebuilt by
+    `manage.py rebuild_habit_rollups`; read by the calendar endpoint.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='habit_daily_rollups'
+    )
+    habit = models.ForeignKey(
+        Habit,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    day = models.DateField()
+    completed = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Habit Daily Rollup"
+        verbose_name_plural = "Habit Daily Rollups"
+        unique_together = ('habit', 'day')
+        indexes = [
+            models.Index(fields=['user', 'day'], name='habit_rollup_user_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.habit.name} on {self.day}: {self.completed} completed"
@@ -0,0 +1,115 @@
+# soulcare_backend/habits/periods.py
+
+"""
+Per-user period boundaries. Habit periods (days, Monday-based weeks and
+months) roll over at midnight in the user's own timezone, read from
+UserSettings.timezone; users who never set one use the server's. A
+PeriodContext is built once per request and shared by the view and its
+serializers through the serializer context.
+"""
+
+import re
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
+from user_settings.models import UserSettings
+
+from .models import FREQUENCY_CHOICES
+from .utils import get_period_start_date, get_previous_period_range
+
+# 'UTC', 'UTC-5', 'UTC+5:30'
+_UTC_OFFSET = re.compile(r'^UTC(?:([+-])(\d{1,2})(?::(\d{2}))?)?$')
+
+
+def parse_timezone(value):
+    """tzinfo for a UserSettings timezone (a UTC offset or an IANA name), None if unknown."""
+    if not value:
+        return None
+    match = _UTC_OFFSET.match(value.strip())
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours or 0), minutes=int(minutes or 0))
+        return dt_timezone(-offset if sign == '-' else offset)
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def user_timezones(user_ids):
+    """{user_id: tzinfo} in one query; users without a usable setting are left out."""
+    zones = {}
+    settings = UserSettings.objects.filter(user_id__in=list(user_ids)).values_list('user_id', 'timezone')
+    for user_id, value in settings:
+        tz = parse_timezone(value)
+        if tz is not None:
+            zones[user_id] = tz
+    return zones
+
+
+def period_end_date(frequency, start):
+    """Last day of the period starting on `start`."""
+    if frequency == 'weekly':
+        return start + timedelta(days=6)
+    if frequency == 'monthly':
+        return (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start
+
+
+class PeriodContext:
+    """
+    "Today" in one timezone and the current and previous period of every
+    frequency, computed once. Datetimes are aware; ranges are half-open.
+    """
+    def __init__(self, tz=None, today=None):
+        self.tz = tz or timezone.get_current_timezone()
+        self.today = today or timezone.localtime(timezone.now(), self.tz).date()
+        self._bounds = {}
+        for frequency, _ in FREQUENCY_CHOICES:
+            start = get_period_start_date(frequency, self.today)
+            previous_start, previous_end = get_previous_period_range(frequency, self.today)
+            self._bounds[frequency] = {
+                'start_date': start,
+                'start': self.midnight(start),
+                'end': self.midnight(period_end_date(frequency, start) + timedelta(days=1)),
+                'previous_start': self.midnight(previous_start),
+                'previous_end_date': previous_end,
+            }
+
+    @classmethod
+    def for_user(cls, user):
+        tz = user_timezones([user.pk]).get(user.pk) if user is not None and user.is_authenticated else None
+        return cls(tz)
+
+    def midnight(self, day):
+        return timezone.make_aware(datetime.combine(day, time.min), self.tz)
+
+    def local_date(self, value):
+        return timezone.localtime(value, self.tz).date()
+
+    def _get(self, frequency):
+        # Unknown frequencies behave like daily ones (see get_period_start_date)
+        return self._bounds.get(frequency) or self._bounds['daily']
+
+    def start_date(self, frequency):
+        return self._get(frequency)['start_date']
+
+    def start(self, frequency):
+        return self._get(frequency)['start']
+
+    def end(self, frequency):
+        return self._get(frequency)['end']
+
+    def previous(self, frequency):
+        """(start, end, last day) of the previous period; `end` is the current period's start."""
+        bounds = self._get(frequency)
+        return bounds['previous_start'], bounds['start'], bounds['previous_end_date']
+
+
+def period_context(context):
+    """The request's PeriodContext from a serializer context, built on first use."""
+    if 'periods' not in context:
+        request = context.get('request')
+        context['periods'] = PeriodContext.for_user(getattr(request, 'user', None))
+    return context['periods']
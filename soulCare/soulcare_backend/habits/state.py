@@ -0,0 +1,69 @@
+# soulcare_backend/habits/state.py
+
+from .models import HabitTaskCompletion
+from .periods import PeriodContext
+
+
+class HabitState:
+    """
+    Current-period completion of one habit: which tasks are done, how many,
+    and whether the whole habit is complete.
+    """
+    def __init__(self, habit, task_ids, completed_task_ids, period_start):
+        self.habit = habit
+        self.task_ids = task_ids
+        self.completed_task_ids = completed_task_ids
+        self.period_start = period_start
+
+    @property
+    def current(self):
+        return len(self.completed_task_ids)
+
+    @property
+    def total(self):
+        # Habits without tasks fall back to their target
+        return len(self.task_ids) or self.habit.target
+
+    @property
+    def completed(self):
+        return self.current >= self.total
+
+    def is_task_completed(self, task_id):
+        return task_id in self.completed_task_ids
+
+
+def compute_habit_states(habits, periods=None):
+    """
+    Current-period state of every habit in one query over the completions
+    keyed to any current period start. A task counts as done when it has a
+    completion keyed to its own habit's period (`period_start`, the same key
+    the toggle writes and deletes). Periods come from `periods` (a
+    PeriodContext, default: the server timezone). Uses prefetched `tasks`
+    when available. Returns {habit_id: HabitState}.
+    """
+    periods = periods or PeriodContext()
+    habits = list(habits)
+    if not habits:
+        return {}
+
+    starts = {habit.pk: periods.start(habit.frequency) for habit in habits}
+    start_dates = {habit.pk: periods.start_date(habit.frequency) for habit in habits}
+    task_ids = {habit.pk: [task.pk for task in habit.tasks.all()] for habit in habits}
+    habit_of_task = {task_id: habit_id for habit_id, ids in task_ids.items() for task_id in ids}
+
+    completed = {habit.pk: set() for habit in habits}
+    if habit_of_task:
+        keyed = (
+            HabitTaskCompletion.objects
+            .filter(task_id__in=list(habit_of_task), period_start__in=set(start_dates.values()))
+            .values_list('task_id', 'period_start')
+        )
+        for task_id, period_start in keyed:
+            habit_id = habit_of_task[task_id]
+            if period_start == start_dates[habit_id]:
+                completed[habit_id].add(task_id)
+
+    return {
+        habit.pk: HabitState(habit, task_ids[habit.pk], completed[habit.pk], starts[habit.pk])
+        for habit in habits
+    }
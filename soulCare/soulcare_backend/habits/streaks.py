@@ -0,0 +1,217 @@
+# soulcare_backend/habits/streaks.py
+
+"""
+Streaks derived from the HabitTaskCompletion log, for every frequency.
+
+A period (day, Monday-based week or month) is complete when every task that
+existed by its end has at least one completion in it. The current streak is
+the run of complete periods ending at the current period, or at the previous
+one while the current period is still open; the longest streak is the
+longest run ever. `recompute_streaks` rebuilds both from history in a numpy
+scan over period buckets; `apply_toggle` is the incremental path used when a
+task is toggled.
+"""
+
+from datetime import date
+
+import numpy as np
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .models import Habit, HabitTask, HabitTaskCompletion
+from .periods import PeriodContext, user_timezones
+
+# Habits whose completions are loaded and scanned together
+STREAK_CHUNK_SIZE = 2000
+
+STREAK_FIELDS = ['streak', 'longest_streak', 'last_completed_period_end']
+
+# 1970-01-01 is a Thursday: day + 3 counts days from Monday 1969-12-29
+_WEEK_OFFSET = 3
+
+
+# --- PERIOD BUCKETS ---
+
+def _days(dates):
+    return np.array(dates, dtype='datetime64[D]')
+
+
+def period_indexes(frequency, dates):
+    """Period number of each date: days, weeks or months since the epoch."""
+    days = _days(dates)
+    if frequency == 'weekly':
+        return (days.astype(np.int64) + _WEEK_OFFSET) // 7
+    if frequency == 'monthly':
+        return days.astype('datetime64[M]').astype(np.int64)
+    return days.astype(np.int64)
+
+
+def period_index(frequency, day):
+    return int(period_indexes(frequency, [day])[0])
+
+
+def period_end(frequency, index):
+    """Last day of period `index`."""
+    if frequency == 'weekly':
+        return (np.datetime64(index * 7 - _WEEK_OFFSET + 6, 'D')).astype(date)
+    if frequency == 'monthly':
+        return (np.datetime64(index + 1, 'M').astype('datetime64[D]') - 1).astype(date)
+    return np.datetime64(index, 'D').astype(date)
+
+
+def _local_dates(datetimes, tz):
+    return [timezone.localtime(value, tz).date() for value in datetimes]
+
+
+# --- FULL RECOMPUTE ---
+
+def complete_periods(frequency, task_ids, task_created, completions):
+    """
+    Sorted period numbers in which the habit was fully completed.
+    `task_created` are the tasks' creation dates; `completions` is a list of
+    (task_id, local date) pairs.
+    """
+    if not completions or not task_ids:
+        return np.array([], dtype=np.int64)
+
+    task_index = {task_id: position for position, task_id in enumerate(task_ids)}
+    tasks = np.array([task_index[task_id] for task_id, _ in completions], dtype=np.int64)
+    periods = period_indexes(frequency, [day for _, day in completions])
+
+    # One row per (period, task) done, then tasks done per period
+    done = np.unique(np.stack([periods, tasks], axis=1), axis=0)
+    buckets, done_counts = np.unique(done[:, 0], return_counts=True)
+
+    # Tasks that existed by each period's end
+    created = np.sort(period_indexes(frequency, task_created))
+    required = np.searchsorted(created, buckets, side='right')
+    return buckets[done_counts >= np.maximum(required, 1)]
+
+
+def streaks_from_periods(periods, current_period):
+    """(current streak, longest streak, last complete period or None)."""
+    if len(periods) == 0:
+        return 0, 0, None
+    breaks = np.flatnonzero(np.diff(periods) != 1) + 1
+    starts = np.concatenate([[0], breaks])
+    ends = np.concatenate([breaks, [len(periods)]])
+    longest = int((ends - starts).max())
+
+    last = int(periods[-1])
+    current = int(ends[-1] - starts[-1]) if last >= current_period - 1 else 0
+    return current, longest, last
+
+
+def recompute_habit(habit, periods=None):
+    """
+    Recomputes one habit's streak fields from its completions (not saved),
+    bucketing days in the timezone of `periods` (a PeriodContext).
+    """
+    periods = periods or PeriodContext.for_user(habit.user)
+    tasks = list(habit.tasks.all())
+    rows = HabitTaskCompletion.objects.filter(task__habit=habit).values_list('task_id', 'completed_at')
+    _apply(habit, tasks, [(task_id, completed_at) for task_id, completed_at in rows], periods.tz, periods.today)
+    return habit
+
+
+def _apply(habit, tasks, rows, tz, today):
+    completions = list(zip([task_id for task_id, _ in rows], _local_dates([at for _, at in rows], tz)))
+    complete = complete_periods(
+        habit.frequency,
+        [task.pk for task in tasks],
+        _local_dates([task.created_at for task in tasks], tz),
+        completions,
+    )
+    current, longest, last = streaks_from_periods(complete, period_index(habit.frequency, today))
+    habit.streak = current
+    habit.longest_streak = longest
+    habit.last_completed_period_end = period_end(habit.frequency, last) if last is not None else None
+
+
+def recompute_streaks(habits=None, today=None, chunk_size=None):
+    """
+    Rebuilds the streak fields of `habits` (default: all) from the
+    completion log, loading and updating them in chunks. Days are bucketed in
+    each owner's timezone; `today` overrides their local date. Returns the
+    number of habits whose streak fields changed.
+    """
+    chunk_size = chunk_size or STREAK_CHUNK_SIZE
+    habits = (habits if habits is not None else Habit.objects.all()).order_by('pk')
+
+    changed = 0
+    last_pk = 0
+    while True:
+        chunk = list(
+            habits.filter(pk__gt=last_pk)
+            .prefetch_related(Prefetch('tasks', queryset=HabitTask.objects.only('id', 'habit_id', 'created_at')))[:chunk_size]
+        )
+        if not chunk:
+            return changed
+        last_pk = chunk[-1].pk
+
+        rows = {habit.pk: [] for habit in chunk}
+        completions = (
+            HabitTaskCompletion.objects.filter(task__habit_id__in=list(rows))
+            .values_list('task__habit_id', 'task_id', 'completed_at')
+        )
+        for habit_id, task_id, completed_at in completions.iterator(chunk_size=10000):
+            rows[habit_id].append((task_id, completed_at))
+        zones = user_timezones({habit.user_id for habit in chunk})
+        contexts = {}
+
+        updated = []
+        for habit in chunk:
+            tz = zones.get(habit.user_id)
+            if tz not in contexts:
+                contexts[tz] = PeriodContext(tz, today)
+            before = [getattr(habit, field) for field in STREAK_FIELDS]
+            _apply(habit, list(habit.tasks.all()), rows[habit.pk], contexts[tz].tz, contexts[tz].today)
+            if [getattr(habit, field) for field in STREAK_FIELDS] != before:
+                updated.append(habit)
+        Habit.objects.bulk_update(updated, STREAK_FIELDS)
+        changed += len(updated)
+
+
+# --- INCREMENTAL PATH ---
+
+def apply_toggle(habit, was_complete, is_complete, periods):
+    """
+    Updates the habit's streak fields after a toggle changed whether the
+    current period (per `periods`, the request's PeriodContext) is complete,
+    and saves them. Completing extends the run ending at the previous period;
+    un-completing undoes that, falling back to a full recompute when the
+    longest streak may have shrunk.
+    """
+    if was_complete == is_complete:
+        return habit
+    current = period_index(habit.frequency, periods.today)
+    current_end = period_end(habit.frequency, current)
+    previous_end = period_end(habit.frequency, current - 1)
+
+    if is_complete:
+        if habit.last_completed_period_end == previous_end:
+            habit.streak += 1
+        elif habit.last_completed_period_end != current_end:
+            habit.streak = 1
+        habit.last_completed_period_end = current_end
+        habit.longest_streak = max(habit.longest_streak, habit.streak)
+    elif habit.last_completed_period_end == current_end:
+        if habit.streak >= habit.longest_streak:
+            recompute_habit(habit, periods)
+        else:
+            habit.streak = max(0, habit.streak - 1)
+            habit.last_completed_period_end = previous_end if habit.streak else None
+    habit.save(update_fields=STREAK_FIELDS)
+    return habit
+
+
+def effective_streak(habit, today=None):
+    """
+    The stored streak, or 0 once a whole period has passed since the last
+    complete one (stored streaks are only refreshed on toggle and nightly).
+    """
+    if not habit.streak or habit.last_completed_period_end is None:
+        return 0
+    today = today or date.today()
+    previous_end = period_end(habit.frequency, period_index(habit.frequency, today) - 1)
+    return habit.streak if habit.last_completed_period_end >= previous_end else 0
@@ -1,3 +1,216 @@
-from django.test import TestCase
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from rest_framework.test import APIClient
+
+from authapp.models import User
+from .calendar import habit_calendar, rebuild_rollups
+from .missed import missed_tasks
+from .models import Habit, HabitDailyRollup, HabitTask, HabitTaskCompletion
+from .periods import PeriodContext
+from .streaks import complete_periods, period_index, streaks_from_periods
+
+
+def complete(task, day, hour=12):
+    """A completion of `task` at `hour` UTC on `day`, keyed to its habit's period there."""
+    period_start = PeriodContext(dt_timezone.utc, day).start_date(task.habit.frequency)
+    completion = HabitTaskCompletion.objects.create(task=task, period_start=period_start)
+    at = datetime(day.year, day.month, day.day, hour, tzinfo=dt_timezone.utc)
+    HabitTaskCompletion.objects.filter(pk=completion.pk).update(completed_at=at)
+    return completion
+
+
+def backdate(*objects, day):
+    for obj in objects:
+        type(obj).objects.filter(pk=obj.pk).update(created_at=datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc))
+
+
+class ToggleTests(TestCase):
+    """Completing and un-completing a task; the state always keys on period_start."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='toggler', email='toggler@example.com', password='x', role='user')
+        self.habit = Habit.objects.create(user=self.user, name='Hydrate', frequency='daily')
+        self.tasks = [HabitTask.objects.create(habit=self.habit, name=name) for name in ('Drink water', 'Stretch')]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def toggle(self, task, completed):
+        return self.client.post(f'/api/habits/tasks/{task.pk}/toggle/', {'completed': completed}, format='json')
+
+    def test_complete_and_uncomplete(self):
+        response = self.toggle(self.tasks[0], True)
+        self.assertEqual((response.data['habit']['current'], response.data['habit']['completedToday']), (1, False))
+        self.assertEqual(self.toggle(self.tasks[0], True).data['detail'], 'Task already completed.')
+
+        response = self.toggle(self.tasks[1], True)
+        self.assertTrue(response.data['habit']['completedToday'])
+        self.assertEqual(response.data['habit']['streak'], 1)
+
+        response = self.toggle(self.tasks[1], False)
+        self.assertEqual((response.data['habit']['current'], response.data['habit']['streak']), (1, 0))
+        self.assertEqual(self.toggle(self.tasks[1], False).data['detail'], 'Task already uncompleted.')
+        self.assertEqual(HabitTaskCompletion.objects.filter(task__habit=self.habit).count(), 1)
+
+    def test_completion_keyed_to_this_period_but_logged_earlier(self):
+        # e.g. backfilled, or logged before a timezone change
+        today = PeriodContext.for_user(self.user).today
+        completion = complete(self.tasks[0], today - timedelta(days=1))
+        HabitTaskCompletion.objects.filter(pk=completion.pk).update(period_start=today)
+
+        tasks = {task['id']: task for task in self.client.get(f'/api/habits/{self.habit.pk}/').data['tasks']}
+        self.assertTrue(tasks[self.tasks[0].pk]['isCompleted'])
+        self.assertEqual(self.toggle(self.tasks[0], True).data['detail'], 'Task already completed.')
+        self.assertEqual(self.toggle(self.tasks[0], False).data['status'], 'Task marked as uncompleted')
+        self.assertFalse(HabitTaskCompletion.objects.exists())
+
+
+class StreakPeriodTests(SimpleTestCase):
+    def test_complete_periods_needs_every_task_existing_by_period_end(self):
+        monday = date(2026, 3, 2)
+        completions = [
+            (1, monday), (2, monday),
+            (1, monday + timedelta(days=1)),
+            (1, monday + timedelta(days=2)), (1, monday + timedelta(days=2)),
+            (1, monday + timedelta(days=3)), (2, monday + timedelta(days=3)),
+        ]
+        # Task 2 only exists from Wednesday
+        created = [monday, monday + timedelta(days=2)]
+        days = complete_periods('daily', [1, 2], created, completions)
+        expected = [period_index('daily', monday + timedelta(days=offset)) for offset in (0, 1, 3)]
+        self.assertEqual(days.tolist(), expected)
+
+        weeks = complete_periods('weekly', [1, 2], created, completions)
+        self.assertEqual(weeks.tolist(), [period_index('weekly', monday)])
+        self.assertEqual(complete_periods('monthly', [1, 2], created, []).tolist(), [])
+
+    def test_streaks_from_periods(self):
+        self.assertEqual(streaks_from_periods([], 10), (0, 0, None))
+        self.assertEqual(streaks_from_periods([1, 2, 3, 6, 7], 8), (2, 3, 7))
+        self.assertEqual(streaks_from_periods([1, 2, 3, 6, 7], 7), (2, 3, 7))
+        self.assertEqual(streaks_from_periods([1, 2, 3, 6, 7], 9), (0, 3, 7))
+
+
+class CalendarTests(TestCase):
+    """Each day's total counts every task that existed that day, however it was toggled."""
+    TODAY = date(2026, 3, 11)  # a Wednesday
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='calendar', email='calendar@example.com', password='x', role='user')
+        self.periods = PeriodContext(dt_timezone.utc, self.TODAY)
+        self.daily = Habit.objects.create(user=self.user, name='Daily', frequency='daily')
+        self.daily_tasks = [HabitTask.objects.create(habit=self.daily, name=name) for name in ('a', 'b')]
+        self.weekly = Habit.objects.create(user=self.user, name='Weekly', frequency='weekly')
+        self.weekly_task = HabitTask.objects.create(habit=self.weekly, name='w')
+        start = self.TODAY - timedelta(days=20)
+        backdate(self.daily, self.weekly, day=start)
+        backdate(*self.daily_tasks, self.weekly_task, day=start)
+
+    def cells(self, start, end, habit_id=None):
+        days = habit_calendar(self.user, start, end, habit_id, 'days', self.periods)['days']
+        return [(day['completed'], day['total']) for day in days]
+
+    def test_totals_count_untoggled_habits_and_days(self):
+        complete(self.daily_tasks[0], self.TODAY - timedelta(days=1))
+        rebuild_rollups()
+        self.assertEqual(self.cells(self.TODAY - timedelta(days=2), self.TODAY - timedelta(days=1)), [(0, 3), (1, 3)])
+
+    def test_weekly_task_counts_on_every_day_of_its_week(self):
+        # Monday of this week; last week stays undone
+        complete(self.weekly_task, self.TODAY - timedelta(days=2))
+        monday = self.TODAY - timedelta(days=2)
+        cells = self.cells(monday - timedelta(days=1), monday + timedelta(days=6), self.weekly.pk)
+        self.assertEqual(cells, [(0, 1)] + [(1, 1)] * 7)
+
+    def test_tasks_count_from_their_creation_day(self):
+        late = HabitTask.objects.create(habit=self.daily, name='c')
+        backdate(late, day=self.TODAY)
+        self.assertEqual(self.cells(self.TODAY - timedelta(days=1), self.TODAY, self.daily.pk), [(0, 2), (0, 3)])
+        self.assertEqual(self.cells(self.TODAY - timedelta(days=30), self.TODAY - timedelta(days=21)), [(0, 0)] * 10)
+
+    def test_toggle_history_leaves_no_trace(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        task = self.daily_tasks[0]
+        client.post(f'/api/habits/tasks/{task.pk}/toggle/', {'completed': True}, format='json')
+        client.post(f'/api/habits/tasks/{task.pk}/toggle/', {'completed': False}, format='json')
+        self.assertFalse(HabitDailyRollup.objects.exists())
+
+
+class MissedHabitsTests(TestCase):
+    """The NOT EXISTS anti-join behind the missed-habits report."""
+    TODAY = date(2026, 3, 11)  # a Wednesday
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='missed', email='missed@example.com', password='x', role='user')
+        self.periods = PeriodContext(dt_timezone.utc, self.TODAY)
+
+    def missed(self):
+        return [item['task_id'] for _, item in missed_tasks(HabitTask.objects.filter(habit__user=self.user), self.periods)]
+
+    def test_only_tasks_without_a_completion_in_the_previous_period(self):
+        daily = Habit.objects.create(user=self.user, name='Daily', frequency='daily')
+        done, skipped, done_today = [HabitTask.objects.create(habit=daily, name=name) for name in ('a', 'b', 'c')]
+        weekly = Habit.objects.create(user=self.user, name='Weekly', frequency='weekly')
+        weekly_done, weekly_skipped = [HabitTask.objects.create(habit=weekly, name=name) for name in ('w', 'x')]
+
+        complete(done, self.TODAY - timedelta(days=1))
+        complete(done_today, self.TODAY)
+        complete(weekly_done, self.TODAY - timedelta(days=8))  # Tuesday of last week
+        complete(weekly_skipped, self.TODAY - timedelta(days=1))  # this week
+
+        self.assertEqual(self.missed(), [skipped.pk, done_today.pk, weekly_skipped.pk])
+        items = {item['task_id']: item for _, item in missed_tasks(HabitTask.objects.filter(habit__user=self.user), self.periods)}
+        self.assertEqual(items[skipped.pk]['missed_period_end_date'], '2026-03-10')
+        self.assertEqual(items[weekly_skipped.pk]['missed_period_end_date'], '2026-03-08')
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ToggleConcurrencyTests(TransactionTestCase):
+    """Many clients toggling one task at once (double-taps, several devices)."""
+    THREADS = 16
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='toggler', email='toggler@example.com', password='x', role='user')
+        self.habit = Habit.objects.create(user=self.user, name='Hydrate', frequency='daily')
+        self.task = HabitTask.objects.create(habit=self.habit, name='Drink water')
+
+    def hammer(self, completed):
+        barrier = threading.Barrier(self.THREADS)
+        responses = []
+
+        def toggle():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                responses.append(client.post(f'/api/habits/tasks/{self.task.pk}/toggle/', {'completed': completed}, format='json'))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=toggle) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_concurrent_completes_record_one_completion(self):
+        responses = self.hammer(True)
+
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertEqual(sum('habit' in response.data for response in responses), 1)
+        self.assertEqual(HabitTaskCompletion.objects.filter(task=self.task).count(), 1)
+        self.habit.refresh_from_db()
+        self.assertEqual((self.habit.streak, self.habit.longest_streak), (1, 1))
+
+    def test_concurrent_uncompletes_remove_the_completion_once(self):
+        self.hammer(True)
+        responses = self.hammer(False)
+
+        self.assertEqual(sum('habit' in response.data for response in responses), 1)
+        self.assertFalse(HabitTaskCompletion.objects.filter(task=self.task).exists())
+        self.habit.refresh_from_db()
+        self.assertEqual(self.habit.streak, 0)
@@ -2,9 +2,10 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import date, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, prefetch_related_objects
+from django.utils.dateparse import parse_date
+from datetime import timedelta
 from .models import Habit, HabitTask, HabitTaskCompletion, FREQUENCY_CHOICES
 from .serializers import (
     HabitSerializer,
@@ -12,7 +13,11 @@ from .serializers import (
     HabitTaskCreationSerializer,
 )
 
-from .utils import get_period_start_date, get_previous_period_range
+from .calendar import CALENDAR_ENCODINGS, CALENDAR_MAX_DAYS, habit_calendar, refresh_rollup
+from .missed import invalidate_missed_habits, missed_habits_report
+from .state import compute_habit_states
+from .periods import PeriodContext
+from .streaks import apply_toggle
 
 # =================================================================
 # --- CORE HABIT VIEWSET ---
@@ -27,9 +32,27 @@ class HabitViewSet(viewsets.ModelViewSet):
         Ensures users can only see their own habits and filters for 'user' role.
         """
         if self.request.user.is_authenticated and self.request.user.role == 'user':
-            return Habit.objects.filter(user=self.request.user).prefetch_related('tasks__completions')
+            return Habit.objects.filter(user=self.request.user).prefetch_related('tasks')
         return Habit.objects.none()
 
+    def get_serializer_context(self):
+        """Adds the user's period boundaries, computed once per request."""
+        context = super().get_serializer_context()
+        if not hasattr(self, '_periods'):
+            self._periods = PeriodContext.for_user(self.request.user)
+        context['periods'] = self._periods
+        return context
+
+    def list(self, request, *args, **kwargs):
+        """
+        Every derived field (current, completedToday, isCompleted) comes from
+        one grouped completion query for all listed habits.
+        """
+        habits = list(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        context['habit_states'] = compute_habit_states(habits, context['periods'])
+        return Response(self.get_serializer(habits, many=True, context=context).data)
+
     def perform_create(self, serializer):
         """
         Sets the user (owner) of the habit to the logged-in user.
@@ -44,6 +67,15 @@ class HabitViewSet(viewsets.ModelViewSet):
             )
             habit.target = 1
             habit.save()
+        invalidate_missed_habits(self.request.user)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_missed_habits(self.request.user)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_missed_habits(self.request.user)
 
 
     # =================================================================
@@ -63,6 +95,7 @@ class HabitViewSet(viewsets.ModelViewSet):
 
         habit.target = habit.tasks.count()
         habit.save()
+        invalidate_missed_habits(request.user)
 
         return Response(HabitTaskSerializer(task, context={'request': request}).data, status=status.HTTP_201_CREATED)
 
@@ -72,63 +105,58 @@ class HabitViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'], url_path=r'tasks/(?P<task_id>\d+)/toggle') # FIX 4: Used raw string r''
     def toggle_task_completion(self, request, task_id=None):
-        try:
-            task = HabitTask.objects.get(id=task_id, habit__user=request.user)
-        except HabitTask.DoesNotExist:
-            return Response({'detail': 'Task not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        habit = task.habit
+        """
+        Completes or un-completes a task for the current period. Runs in one
+        transaction holding the task and habit rows, so concurrent toggles
+        (e.g. double-taps) serialize; the unique (task, period_start)
+        constraint rejects any duplicate that gets past that. Completing,
+        un-completing and the returned state all key on period_start.
+        """
         serializer_data = request.data.get('completed')
 
         if serializer_data is None:
              return Response({'detail': 'Field "completed" is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
         completed = bool(serializer_data)
-        today = date.today()
-
-        period_start_date = get_period_start_date(habit.frequency, today)
-        period_start_datetime = timezone.make_aware(timezone.datetime.combine(period_start_date, timezone.datetime.min.time()))
-
-        current_completion_qs = task.completions.filter(completed_at__gte=period_start_datetime)
-        is_completed_in_period = current_completion_qs.exists()
-
-        if completed and not is_completed_in_period:
-            HabitTaskCompletion.objects.create(task=task)
-            status_message = 'Task marked as completed'
-        elif not completed and is_completed_in_period:
-            most_recent_completion = current_completion_qs.order_by('-completed_at').first()
-            if most_recent_completion:
-                most_recent_completion.delete()
-                status_message = 'Task marked as uncompleted'
+        periods = PeriodContext.for_user(request.user)
+
+        with transaction.atomic():
+            try:
+                task = HabitTask.objects.select_for_update().select_related('habit').get(id=task_id, habit__user=request.user)
+            except HabitTask.DoesNotExist:
+                return Response({'detail': 'Task not found.'}, status=status.HTTP_404_NOT_FOUND)
+            habit = task.habit
+            prefetch_related_objects([habit], 'tasks')
+
+            if completed:
+                try:
+                    with transaction.atomic():
+                        completion = HabitTaskCompletion.objects.create(
+                            task=task, period_start=periods.start_date(habit.frequency)
+                        )
+                    changed_days = {periods.local_date(completion.completed_at)}
+                except IntegrityError:
+                    changed_days = set()
             else:
-                 return Response({'detail': 'Task already uncompleted.'}, status=status.HTTP_200_OK)
-        else:
-            return Response({'detail': f'Task already {"completed" if completed else "uncompleted"}.'}, status=status.HTTP_200_OK)
-
-        # Streak Logic (already good)
-        habit_serializer = HabitSerializer(habit, context={'request': request})
-        current_completions = habit_serializer.data['current']
-        total_tasks = habit.tasks.count() or habit.target
-
-        is_fully_completed_now = current_completions >= total_tasks
-
-        if is_fully_completed_now and completed:
-             if habit.frequency == 'daily':
-                 if habit.last_completed_period_end == today - timedelta(days=1):
-                     habit.streak += 1
-                 elif habit.last_completed_period_end is None or habit.last_completed_period_end < today - timedelta(days=1):
-                     habit.streak = 1
-                 habit.last_completed_period_end = today
-                 habit.save()
-
-        elif not is_fully_completed_now and not completed:
-             if habit.last_completed_period_end == today:
-                 habit.last_completed_period_end = None
-                 habit.streak = max(0, habit.streak - 1)
-                 habit.save()
+                in_period = task.completions.filter(period_start=periods.start_date(habit.frequency))
+                changed_days = {periods.local_date(at) for at in in_period.values_list('completed_at', flat=True)}
+                if changed_days:
+                    in_period.delete()
+
+            if not changed_days:
+                return Response({'detail': f'Task already {"completed" if completed else "uncompleted"}.'}, status=status.HTTP_200_OK)
+            status_message = 'Task marked as completed' if completed else 'Task marked as uncompleted'
+
+            # State after the write; the state before differs only by this task
+            states = compute_habit_states([habit], periods)
+            state = states[habit.pk]
+            was_completed = (state.current + (-1 if completed else 1)) >= state.total
+            apply_toggle(habit, was_completed, state.completed, periods)
+            for day in changed_days:
+                refresh_rollup(habit, day, periods)
 
         # Re-serialize the Habit to include the latest 'current', 'completedToday', and 'streak'
-        updated_habit_data = HabitSerializer(habit, context={'request': request}).data
+        updated_habit_data = HabitSerializer(habit, context={'request': request, 'periods': periods, 'habit_states': states}).data
 
         # Return the full updated habit data
         return Response({
@@ -142,31 +170,49 @@ class HabitViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='missed_habits')
     def missed_habits_report(self, request):
-        user_tasks = HabitTask.objects.filter(habit__user=request.user)
-        missed_tasks_data = []
-
-        for task in user_tasks:
-            habit = task.habit
-            frequency = habit.frequency
+        """
+        Tasks not completed in their habit's previous period. Served from the
+        nightly digest (see habits/missed.py), computed live when it is missing.
+        """
+        return Response(missed_habits_report(request.user, PeriodContext.for_user(request.user)), status=status.HTTP_200_OK)
 
-            prev_start_date, prev_end_date = get_previous_period_range(frequency)
+    # =================================================================
+    # --- CALENDAR / HEATMAP ACTION ---
+    # =================================================================
 
-            prev_start_datetime = timezone.make_aware(timezone.datetime.combine(prev_start_date, timezone.datetime.min.time()))
-            prev_end_datetime = timezone.make_aware(timezone.datetime.combine(prev_end_date, timezone.datetime.max.time()))
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def calendar(self, request):
+        """
+        Per-day completion over ?start=&end= (default: the last year), for all
+        habits or ?habit=<id>. ?encoding=days|rle|bitset; long ranges default
+        to run-length encoded heatmap levels.
+        """
+        periods = PeriodContext.for_user(request.user)
+        end = periods.today
+        start = end - timedelta(days=364)
+        try:
+            if request.query_params.get('end'):
+                end = parse_date(request.query_params['end'])
+            if request.query_params.get('start'):
+                start = parse_date(request.query_params['start'])
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return Response({'detail': 'Dates must be in YYYY-MM-DD format.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end or (end - start).days >= CALENDAR_MAX_DAYS:
+            return Response(
+                {'detail': f'start must not be after end, and the range must be under {CALENDAR_MAX_DAYS} days.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            was_completed_in_prev_period = task.completions.filter(
-                completed_at__gte=prev_start_datetime,
-                completed_at__lte=prev_end_datetime
-            ).exists()
+        encoding = request.query_params.get('encoding')
+        if encoding is not None and encoding not in CALENDAR_ENCODINGS:
+            return Response({'detail': f'encoding must be one of {", ".join(CALENDAR_ENCODINGS)}.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            if not was_completed_in_prev_period:
-                missed_tasks_data.append({
-                    'habit_id': habit.id,
-                    'habit_name': habit.name,
-                    'task_id': task.id,
-                    'task_name': task.name,
-                    'frequency': frequency,
-                    'missed_period_end_date': prev_end_date.isoformat(),
-                })
+        habit_id = request.query_params.get('habit')
+        if habit_id is not None:
+            if not habit_id.isdigit() or not self.get_queryset().filter(pk=habit_id).exists():
+                return Response({'detail': 'Habit not found.'}, status=status.HTTP_404_NOT_FOUND)
+            habit_id = int(habit_id)
 
-        return Response(missed_tasks_data, status=status.HTTP_200_OK)
+        return Response(habit_calendar(request.user, start, end, habit_id, encoding, periods), status=status.HTTP_200_OK)
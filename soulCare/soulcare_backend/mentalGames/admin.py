@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ReactionTimeResult, MemoryGameResult, StroopGameResult
+from .models import ReactionTimeResult, MemoryGameResult, StroopGameResult, GameSummary, GameBaseline, GameSession
 from django.http import HttpResponse
 import csv
 import datetime
@@ -57,7 +57,24 @@ class StroopGameResultAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'total_correct')
     actions = [export_as_csv] # <--- Add the export action
 
+class GameSummaryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game_type', 'plays', 'score_min', 'score_max', 'last_played_at')
+    list_filter = ('game_type',)
+    search_fields = ('user__username',)
+
+class GameSessionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game_type', 'score', 'metric', 'post_game_mood', 'created_at')
+    list_filter = ('game_type', 'created_at')
+    search_fields = ('user__username',)
+    list_select_related = ('user',)
+
+class GameBaselineAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'mean', 'std', 'p50', 'user_count', 'computed_at')
+
 # --- Register Models ---
 admin.site.register(ReactionTimeResult, ReactionTimeResultAdmin)
 admin.site.register(MemoryGameResult, MemoryGameResultAdmin)
 admin.site.register(StroopGameResult, StroopGameResultAdmin)
+admin.site.register(GameSummary, GameSummaryAdmin)
+admin.site.register(GameBaseline, GameBaselineAdmin)
+admin.site.register(GameSession, GameSessionAdmin)
@@ -0,0 +1,242 @@
+# soulcare_backend/mentalGames/analytics.py
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+from django.apps import apps
+from django.db.models import Avg, Count
+
+from .summaries import SPEC_BY_MODEL
+
+# Most recent results analysed per metric
+MAX_POINTS = 500
+ROLLING_WINDOW = 5
+# Fewer paired points than this gives no correlation
+MIN_CORRELATION_POINTS = 5
+# Users need this many plays to count towards a population baseline
+MIN_BASELINE_PLAYS = 3
+
+CORRELATION_FIELDS = ('post_game_mood', 'stress_reduction_rating')
+
+
+class AnalyticsMetric:
+    def __init__(self, key, label, model_name, field, lower_is_better):
+        self.key = key
+        self.label = label
+        self.model_name = model_name
+        self.field = field
+        self.lower_is_better = lower_is_better
+
+    @property
+    def model(self):
+        return apps.get_model('mentalGames', self.model_name)
+
+    @property
+    def game_type(self):
+        return SPEC_BY_MODEL[self.model_name].game_type
+
+    @property
+    def session_column(self):
+        """The GameSession column (score or metric) that carries this field."""
+        return 'score' if SPEC_BY_MODEL[self.model_name].score == self.field else 'metric'
+
+
+ANALYTICS_METRICS = {metric.key: metric for metric in [
+    AnalyticsMetric('reaction_time', 'Reaction time (ms)', 'ReactionTimeResult', 'reaction_time_ms', True),
+    AnalyticsMetric('stroop_interference', 'Stroop interference (ms)', 'StroopGameResult', 'interference_score_ms', True),
+    AnalyticsMetric('memory_span', 'Memory span', 'MemoryGameResult', 'max_sequence_length', False),
+    AnalyticsMetric('digit_span', 'Digit span', 'LongestNumberGameResult', 'max_number_length', False),
+    AnalyticsMetric('numpuz_time', 'Numpuz solve time (s)', 'NumpuzGameResult', 'time_taken_s', True),
+    AnalyticsMetric('additions_correct', 'Additions correct', 'AdditionsGameResult', 'total_correct', False),
+]}
+
+
+# --- LOADING ---
+
+def load_series(metric, user_id, max_points=MAX_POINTS):
+    """
+    The user's last `max_points` results as oldest-first NumPy arrays:
+    (timestamps in seconds, values, mood, stress_reduction). Missing ratings are NaN.
+    """
+    rows = list(
+        metric.model.objects.filter(user_id=user_id)
+        .order_by('-created_at', '-id')
+        .values_list('created_at', metric.field, *CORRELATION_FIELDS)[:max_points]
+    )
+    rows.reverse()
+    if not rows:
+        empty = np.empty(0)
+        return empty, empty, empty, empty
+
+    created, values, mood, stress = zip(*rows)
+    timestamps = np.fromiter((moment.timestamp() for moment in created), dtype=float, count=len(created))
+    as_float = lambda column: np.array([np.nan if v is None else v for v in column], dtype=float)
+    return timestamps, as_float(values), as_float(mood), as_float(stress)
+
+
+# --- STATISTICS ---
+
+def rolling_mean(values, window=ROLLING_WINDOW):
+    """Trailing mean over `window` points (shorter series use their full length)."""
+    if values.size == 0:
+        return values
+    window = max(1, min(window, values.size))
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def linear_trend(timestamps, values, lower_is_better):
+    """Least-squares slope (per week), r² and whether the trend is an improvement."""
+    if values.size < 2 or np.ptp(timestamps) == 0:
+        return None
+    days = (timestamps - timestamps[0]) / 86400.0
+    slope, intercept = np.polyfit(days, values, 1)
+    fitted = slope * days + intercept
+    total = np.sum((values - values.mean()) ** 2)
+    r_squared = 1.0 - np.sum((values - fitted) ** 2) / total if total else 0.0
+    return {
+        'slope_per_week': round(float(slope * 7), 4),
+        'r_squared': round(float(r_squared), 4),
+        'improving': bool(slope < 0 if lower_is_better else slope > 0),
+    }
+
+
+def correlation(values, other):
+    """Pearson r between values and a rating series, ignoring missing ratings."""
+    mask = ~np.isnan(other)
+    if mask.sum() < MIN_CORRELATION_POINTS:
+        return None
+    x, y = values[mask], other[mask]
+    if np.std(x) == 0 or np.std(y) == 0:
+        return None
+    return {'r': round(float(np.corrcoef(x, y)[0, 1]), 4), 'n': int(mask.sum())}
+
+
+def baseline_comparison(recent_mean, baseline, lower_is_better):
+    """
+    z-score of the user's recent average against the population of per-user
+    averages. `performance_z` is sign-adjusted so positive always means better.
+    """
+    if baseline is None or not baseline.std:
+        return None
+    z = (recent_mean - baseline.mean) / baseline.std
+    performance_z = -z if lower_is_better else z
+    return {
+        'population_mean': round(baseline.mean, 3),
+        'population_std': round(baseline.std, 3),
+        'z_score': round(float(z), 3),
+        'performance_z': round(float(performance_z), 3),
+        # Normal approximation of the share of users this average beats
+        'percentile': round(50 * (1 + math.erf(performance_z / math.sqrt(2))), 1),
+        'baseline_users': baseline.user_count,
+        'computed_at': baseline.computed_at.isoformat(),
+    }
+
+
+# --- REPORTS ---
+
+def analyse_metric(metric, user_id, baseline=None, window=ROLLING_WINDOW):
+    timestamps, values, mood, stress = load_series(metric, user_id)
+    report = {
+        'metric': metric.key,
+        'label': metric.label,
+        'lower_is_better': metric.lower_is_better,
+        'points': int(values.size),
+    }
+    if values.size == 0:
+        return report
+
+    rolling = rolling_mean(values, window)
+    recent_mean = float(rolling[-1])
+    offset = values.size - rolling.size
+    report.update({
+        'latest': float(values[-1]),
+        'mean': round(float(values.mean()), 3),
+        'recent_mean': round(recent_mean, 3),
+        'rolling_window': min(window, int(values.size)),
+        'rolling_mean': [
+            {
+                'created_at': _iso(timestamps[offset + i]),
+                'value': round(float(value), 3),
+            }
+            for i, value in enumerate(rolling)
+        ],
+        'trend': linear_trend(timestamps, values, metric.lower_is_better),
+        'baseline': baseline_comparison(recent_mean, baseline, metric.lower_is_better),
+        'correlations': {
+            'post_game_mood': correlation(values, mood),
+            'stress_reduction_rating': correlation(values, stress),
+        },
+    })
+    return report
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def cognitive_report(user_id, metrics=None, window=ROLLING_WINDOW):
+    """
+    Per-metric trend report for one user: one query per metric for the series
+    plus one for all precomputed baselines.
+    """
+    GameBaseline = apps.get_model('mentalGames', 'GameBaseline')
+    selected = [ANALYTICS_METRICS[key] for key in (metrics or ANALYTICS_METRICS)]
+    baselines = {
+        baseline.metric: baseline
+        for baseline in GameBaseline.objects.filter(metric__in=[metric.key for metric in selected])
+    }
+    return {
+        'user_id': user_id,
+        'metrics': [
+            analyse_metric(metric, user_id, baselines.get(metric.key), window)
+            for metric in selected
+        ],
+    }
+
+
+# --- BASELINES ---
+
+def compute_baselines(min_plays=MIN_BASELINE_PLAYS):
+    """
+    Recomputes every GameBaseline from per-user averages, read with a single
+    GROUP BY (game_type, user) over GameSession. Users with fewer than
+    `min_plays` results are left out so a single lucky/unlucky play does not
+    skew the population. Returns {metric: user_count}.
+    """
+    GameBaseline = apps.get_model('mentalGames', 'GameBaseline')
+    GameSession = apps.get_model('mentalGames', 'GameSession')
+    rows = (
+        GameSession.objects.order_by().values('game_type', 'user_id')
+        .annotate(score=Avg('score'), metric=Avg('metric'), plays=Count('id'))
+        .filter(plays__gte=min_plays)
+    )
+    by_game = defaultdict(list)
+    for row in rows:
+        by_game[row['game_type']].append(row)
+
+    counts = {}
+    for metric in ANALYTICS_METRICS.values():
+        users = [row for row in by_game[metric.game_type] if row[metric.session_column] is not None]
+        counts[metric.key] = len(users)
+        if not users:
+            GameBaseline.objects.filter(metric=metric.key).delete()
+            continue
+
+        averages = np.array([row[metric.session_column] for row in users], dtype=float)
+        p25, p50, p75 = np.percentile(averages, [25, 50, 75])
+        GameBaseline.objects.update_or_create(
+            metric=metric.key,
+            defaults={
+                'mean': float(averages.mean()),
+                'std': float(averages.std(ddof=1)) if averages.size > 1 else 0.0,
+                'p25': float(p25),
+                'p50': float(p50),
+                'p75': float(p75),
+                'user_count': len(users),
+                'result_count': sum(row['plays'] for row in users),
+            },
+        )
+    return counts
@@ -5,3 +5,7 @@ class GamesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mentalGames'
     label = 'mentalGames'
+
+    def ready(self):
+        # Mirrors result saves/deletes into GameSession
+        from . import signals  # noqa: F401
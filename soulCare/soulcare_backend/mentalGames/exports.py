@@ -0,0 +1,218 @@
+# soulcare_backend/mentalGames/exports.py
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import (
+    ReactionTimeResult, MemoryGameResult, StroopGameResult,
+    LongestNumberGameResult, NumpuzGameResult, AdditionsGameResult, GameSession,
+)
+from .summaries import SUMMARY_SPECS
+
+# Rows fetched per keyset page. Each page is one small query, so memory stays
+# flat no matter how large the result tables grow.
+EXPORT_CHUNK_SIZE = 2000
+
+MOOD_LABELS = dict(ReactionTimeResult.MOOD_CHOICES)
+
+# Matrix fields shared by every game model
+COMMON_FIELDS = ('post_game_mood', 'perceived_effort', 'stress_reduction_rating')
+COMMON_HEADERS = ('Mood', 'Effort', 'Calmness')
+
+
+class GameSource:
+    """
+    Describes one game result model for exports.
+
+    `columns` is a list of (model field, admin CSV header, matrix column);
+    the matrix column is None for fields the combined matrix does not carry.
+    """
+    def __init__(self, slug, game_type, model, columns):
+        self.slug = slug
+        self.game_type = game_type
+        self.model = model
+        self.columns = columns
+
+    @property
+    def score_fields(self):
+        return [field for field, _, _ in self.columns]
+
+
+GAME_SOURCES = {source.slug: source for source in [
+    GameSource('reaction-time', 'reaction_time', ReactionTimeResult, [
+        ('reaction_time_ms', 'Reaction Time (ms)', 'rt_ms'),
+    ]),
+    GameSource('memory-game', 'memory_game', MemoryGameResult, [
+        ('max_sequence_length', 'Max Sequence', 'max_sequence_length'),
+        ('total_attempts', 'Attempts', None),
+    ]),
+    GameSource('stroop-game', 'stroop_test', StroopGameResult, [
+        ('total_correct', 'Correct', 'total_correct'),
+        ('interference_score_ms', 'Interference (ms)', 'interference_score_ms'),
+        ('total_time_s', 'Time (s)', None),
+    ]),
+    GameSource('longest-number', 'longest_number', LongestNumberGameResult, [
+        ('max_number_length', 'Max Digits', None),
+        ('total_reaction_time_ms', 'Reaction Time (ms)', None),
+        ('total_attempts', 'Attempts', None),
+    ]),
+    GameSource('numpuz-game', 'numpuz_game', NumpuzGameResult, [
+        ('time_taken_s', 'Time (s)', None),
+        ('puzzle_size', 'Size', None),
+        ('moves_made', 'Moves', None),
+    ]),
+    GameSource('additions-game', 'additions_game', AdditionsGameResult, [
+        ('total_correct', 'Correct', None),
+        ('time_taken_s', 'Time (s)', None),
+        ('difficulty_level', 'Difficulty', None),
+    ]),
+]}
+
+# The combined CSV matrix (export_all_game_data_csv)
+MATRIX_GAMES = ('reaction-time', 'memory-game', 'stroop-game')
+MATRIX_SCORE_COLUMNS = ('rt_ms', 'max_sequence_length', 'total_correct', 'interference_score_ms')
+MATRIX_HEADER = ('user_id', 'username', 'game_type', 'created_at') + COMMON_FIELDS + MATRIX_SCORE_COLUMNS
+
+
+# --- FILTERS ---
+
+def _parse_bound(value, end=False):
+    """
+    Parses an ISO date or datetime. A bare date used as an end bound covers
+    the whole day. Returns (aware datetime, inclusive).
+    """
+    # parse_datetime() also accepts a bare date, so try the date form first
+    day = parse_date(value)
+    if day is not None:
+        if end:
+            day += timedelta(days=1)
+        moment = datetime.combine(day, time.min)
+        inclusive = not end
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD or an ISO datetime.")
+        inclusive = True
+    if settings.USE_TZ and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment, inclusive
+
+
+def parse_export_filters(params):
+    """
+    Reads the optional `start`, `end` and `user` query parameters.
+    Raises ValueError with a user-facing message on bad input.
+    """
+    filters = {}
+    if params.get('start'):
+        filters['start'] = _parse_bound(params['start'])
+    if params.get('end'):
+        filters['end'] = _parse_bound(params['end'], end=True)
+    if params.get('user'):
+        try:
+            filters['user_id'] = int(params['user'])
+        except ValueError:
+            raise ValueError("user must be a numeric user id.")
+    return filters
+
+
+def apply_export_filters(queryset, start=None, end=None, user_id=None):
+    if start is not None:
+        moment, inclusive = start
+        queryset = queryset.filter(**{'created_at__gte' if inclusive else 'created_at__gt': moment})
+    if end is not None:
+        moment, inclusive = end
+        queryset = queryset.filter(**{'created_at__lte' if inclusive else 'created_at__lt': moment})
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    return queryset
+
+
+# --- ROW SOURCES ---
+
+def iter_result_rows(queryset, fields, descending=False, chunk_size=None):
+    """
+    Yields ('id', 'created_at', *fields) tuples ordered by (created_at, id).
+
+    Uses keyset pagination instead of one long cursor: PyMySQL buffers a whole
+    result set client-side even with .iterator(), so every page is a separate
+    bounded query that resumes after the last (created_at, id) seen.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    if descending:
+        queryset = queryset.order_by('-created_at', '-id')
+    else:
+        queryset = queryset.order_by('created_at', 'id')
+    columns = ('id', 'created_at') + tuple(fields)
+
+    after = None
+    while True:
+        page = queryset
+        if after is not None:
+            created_at, pk = after
+            if descending:
+                page = page.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+            else:
+                page = page.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        rows = list(page.values_list(*columns)[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        after = (rows[-1][1], rows[-1][0])
+
+
+def game_rows(source, filters, descending=False):
+    """Rows of one game for the admin CSV: user, date, score fields, mood matrix."""
+    queryset = apply_export_filters(source.model.objects.all(), **filters)
+    fields = ('user__username',) + tuple(source.score_fields) + COMMON_FIELDS
+    for row in iter_result_rows(queryset, fields, descending=descending):
+        _, created_at, username, *values = row
+        scores, (mood, effort, calmness) = values[:-3], values[-3:]
+        yield [username, created_at.strftime("%Y-%m-%d %H:%M"), *scores, MOOD_LABELS.get(mood, mood), effort, calmness]
+
+
+def _matrix_layout(games):
+    """game_type -> [(GameSession column, matrix score position)]."""
+    layout = {}
+    for slug in games:
+        source = GAME_SOURCES[slug]
+        spec = SUMMARY_SPECS[source.game_type]
+        layout[source.game_type] = [
+            ('score' if field == spec.score else 'metric', MATRIX_SCORE_COLUMNS.index(column))
+            for field, _, column in source.columns
+            if column
+        ]
+    return layout
+
+
+def _whole(value):
+    # GameSession stores scores as floats; the matrix games all record integers
+    return int(value) if value is not None and float(value).is_integer() else value
+
+
+def matrix_rows(filters, games=MATRIX_GAMES):
+    """
+    All matrix rows across games in created_at order, read with one keyset
+    scan of GameSession instead of merging a stream per result table.
+    """
+    layout = _matrix_layout(games)
+    queryset = apply_export_filters(GameSession.objects.filter(game_type__in=list(layout)), **filters)
+    fields = ('user_id', 'user__username', 'game_type') + COMMON_FIELDS + ('score', 'metric')
+
+    for row in iter_result_rows(queryset, fields):
+        _, created_at, user_id, username, game_type, mood, effort, calmness, score, metric = row
+        values = {'score': score, 'metric': metric}
+        scores = [''] * len(MATRIX_SCORE_COLUMNS)
+        for column, position in layout[game_type]:
+            scores[position] = _whole(values[column])
+        yield [user_id, username, game_type, created_at.isoformat(), mood, effort, calmness, *scores]
+
+
+# --- HEADERS ---
+
+def admin_headers(source):
+    return ['User', 'Date'] + [header for _, header, _ in source.columns] + list(COMMON_HEADERS)
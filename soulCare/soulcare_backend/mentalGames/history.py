@@ -0,0 +1,90 @@
+# soulcare_backend/mentalGames/history.py
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncDay, TruncWeek
+from django.utils import timezone
+from rest_framework.pagination import CursorPagination
+
+from .exports import GAME_SOURCES
+from .summaries import SUMMARY_SPECS
+
+# Raw points embedded in a stats response; older points are paged through
+# the history endpoint.
+HISTORY_LIMIT = 30
+
+# bucket -> (truncation function, default window in days)
+BUCKETS = {
+    'day': (TruncDay, 90),
+    'week': (TruncWeek, 52 * 7),
+}
+MAX_BUCKET_WINDOW_DAYS = 5 * 365
+
+
+class GameHistoryPagination(CursorPagination):
+    """Newest-first keyset pages over one user's results of one game."""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
+def game_source(slug):
+    """GameSource for a URL slug (e.g. 'longest-number'), or None."""
+    return GAME_SOURCES.get(slug)
+
+
+def recent_results(model, user, limit=HISTORY_LIMIT):
+    """The user's last `limit` results, newest first."""
+    return model.objects.filter(user=user).order_by('-created_at', '-id')[:limit]
+
+
+def parse_bucket_params(params):
+    """
+    Reads `bucket` (day|week, default day) and `window` (days).
+    Raises ValueError on bad input.
+    """
+    bucket = params.get('bucket', 'day')
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+    window = params.get('window')
+    if window is None:
+        window_days = BUCKETS[bucket][1]
+    else:
+        try:
+            window_days = int(window)
+        except ValueError:
+            raise ValueError("window must be a number of days.")
+        if not 1 <= window_days <= MAX_BUCKET_WINDOW_DAYS:
+            raise ValueError(f"window must be between 1 and {MAX_BUCKET_WINDOW_DAYS} days.")
+    return bucket, window_days
+
+
+def bucket_aggregates(game_type, user, bucket='day', window_days=None):
+    """
+    Per-day or per-week best / average score and play count for one game,
+    computed with a single GROUP BY over the last `window_days`.
+    """
+    spec = SUMMARY_SPECS[game_type]
+    model = next(source.model for source in GAME_SOURCES.values() if source.game_type == game_type)
+    trunc, default_window = BUCKETS[bucket]
+    since = timezone.now() - timedelta(days=window_days or default_window)
+
+    best = Min(spec.score) if spec.best == 'min' else Max(spec.score)
+    rows = (
+        model.objects.filter(user=user, created_at__gte=since)
+        .annotate(period=trunc('created_at'))
+        .values('period')
+        .annotate(best=best, average=Avg(spec.score), plays=Count('id'))
+        .order_by('period')
+    )
+    return [
+        {
+            'period': row['period'].date().isoformat(),
+            'best': row['best'],
+            'average': round(row['average'], 2) if row['average'] is not None else None,
+            'plays': row['plays'],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,161 @@
+# soulcare_backend/mentalGames/ingest.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .exports import GAME_SOURCES
+from .serializers import GAME_RESULT_SERIALIZERS
+from .sessions import record_sessions
+from .summaries import record_game_results
+
+# Largest batch accepted in one request
+MAX_BATCH_SIZE = 500
+# Oldest played_at accepted, and the client clock skew tolerated into the future
+MAX_PLAYED_AT_AGE = timedelta(days=30)
+PLAYED_AT_SKEW = timedelta(minutes=5)
+
+GAME_SLUG_BY_MODEL = {source.model: slug for slug, source in GAME_SOURCES.items()}
+
+
+class GameResultBatchSerializer(serializers.Serializer):
+    """
+    Validates a mixed batch: {"results": [{"game": "<slug>", "client_id": "<uuid>", ...}]}.
+    Each item is checked with its game's own serializer; errors are returned
+    per item index, like a ListSerializer. An optional "played_at" (when the
+    game was played offline) becomes the result's created_at.
+    """
+    results = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_BATCH_SIZE,
+    )
+
+    def validate_results(self, items):
+        validated = []
+        errors = []
+        seen = set()
+        has_errors = False
+        for item in items:
+            item = dict(item)
+            item_errors = {}
+            game = item.pop('game', None)
+            raw_client_id = item.pop('client_id', None)
+
+            client_id = None
+            try:
+                client_id = serializers.UUIDField().run_validation(raw_client_id)
+            except serializers.ValidationError as exc:
+                item_errors['client_id'] = exc.detail
+            if client_id is not None and client_id in seen:
+                item_errors['client_id'] = ["Duplicate client_id in this batch."]
+            seen.add(client_id)
+
+            played_at = None
+            try:
+                played_at = serializers.DateTimeField(allow_null=True).run_validation(item.pop('played_at', None))
+            except serializers.ValidationError as exc:
+                item_errors['played_at'] = exc.detail
+            if played_at is not None:
+                now = timezone.now()
+                if played_at > now + PLAYED_AT_SKEW:
+                    item_errors['played_at'] = ["played_at cannot be in the future."]
+                elif played_at < now - MAX_PLAYED_AT_AGE:
+                    item_errors['played_at'] = [f"played_at cannot be more than {MAX_PLAYED_AT_AGE.days} days ago."]
+
+            serializer_class = GAME_RESULT_SERIALIZERS.get(game)
+            if serializer_class is None:
+                item_errors['game'] = [f"Unknown game. Expected one of: {', '.join(GAME_RESULT_SERIALIZERS)}"]
+            else:
+                serializer = serializer_class(data=item)
+                if not serializer.is_valid():
+                    item_errors.update(serializer.errors)
+
+            if item_errors:
+                has_errors = True
+                errors.append(item_errors)
+                continue
+            errors.append({})
+            validated.append((game, client_id, played_at, serializer.validated_data))
+
+        if has_errors:
+            raise serializers.ValidationError(errors)
+        return validated
+
+
+def _insert(user, items):
+    """
+    Inserts the items whose client_id is not stored yet, one bulk_create per
+    model. Returns ({(game, client_id): pk}, created instances).
+    """
+    by_game = defaultdict(list)
+    for game, client_id, played_at, data in items:
+        by_game[game].append((client_id, played_at, data))
+
+    ids = {}
+    created = []
+    for game, game_items in by_game.items():
+        model = GAME_SOURCES[game].model
+        client_ids = [client_id for client_id, _, _ in game_items]
+        existing = dict(
+            model.objects.filter(user=user, client_id__in=client_ids).values_list('client_id', 'id')
+        )
+        new = [
+            model(user=user, client_id=client_id, **data)
+            for client_id, _, data in game_items
+            if client_id not in existing
+        ]
+        stored = {}
+        if new:
+            model.objects.bulk_create(new)
+            # MySQL does not return primary keys from bulk_create, so re-read them
+            stored = dict(
+                model.objects.filter(user=user, client_id__in=[obj.client_id for obj in new]).values_list('client_id', 'id')
+            )
+            for obj in new:
+                obj.pk = stored[obj.client_id]
+            # created_at is auto_now_add, so offline play times are written afterwards
+            played = {client_id: played_at for client_id, played_at, _ in game_items if played_at is not None}
+            backdated = [obj for obj in new if obj.client_id in played]
+            for obj in backdated:
+                obj.created_at = played[obj.client_id]
+            if backdated:
+                model.objects.bulk_update(backdated, ['created_at'])
+            created.extend(new)
+        for client_id in client_ids:
+            ids[(game, client_id)] = existing[client_id] if client_id in existing else stored[client_id]
+    return ids, created
+
+
+def ingest_results(user, items):
+    """
+    Stores a validated batch for `user` in one transaction and folds the new
+    rows into GameSummary once per game. Items whose client_id was already
+    stored (a retried upload) are reported as duplicates and not re-counted.
+    Returns a list of {game, client_id, id, status} in input order.
+    """
+    # A concurrent retry of the same batch can win the unique (user, client_id)
+    # race; the second attempt then sees those rows as duplicates.
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                ids, created = _insert(user, items)
+                # bulk_create skips post_save, so sessions are written here
+                record_sessions(created)
+                record_game_results(created)
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+
+    created_keys = {(GAME_SLUG_BY_MODEL[type(obj)], obj.client_id) for obj in created}
+    return [
+        {
+            'game': game,
+            'client_id': str(client_id),
+            'id': ids[(game, client_id)],
+            'status': 'created' if (game, client_id) in created_keys else 'duplicate',
+        }
+        for game, client_id, _, _ in items
+    ]
@@ -0,0 +1,234 @@
+# soulcare_backend/mentalGames/leaderboards.py
+
+import logging
+import time
+from datetime import timedelta
+
+import redis
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .summaries import SUMMARY_SPECS, SPEC_BY_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Each leaderboard is a Redis sorted set: member = user id, score = the
+# user's best result in that game and period. Scores of games where lower is
+# better are stored negated, so a higher stored score always ranks higher and
+# ZADD ... GT keeps each user's personal best in O(log n).
+KEY_PREFIX = 'soulcare:leaderboard'
+TOP_LIMIT = 100
+# Members per ZADD when rebuilding a board
+REBUILD_CHUNK_SIZE = 10000
+# After a connection failure, requests skip Redis for this many seconds
+# instead of each waiting out the connect timeout
+FAILURE_BACKOFF = 30
+
+# period -> (key for a datetime, SQL truncation for rebuilds, periods kept)
+PERIODS = {
+    'all': (lambda moment: 'all', None, None),
+    'week': (lambda moment: moment.strftime('%G-W%V'), TruncWeek, timedelta(weeks=8)),
+    'month': (lambda moment: moment.strftime('%Y-%m'), TruncMonth, timedelta(days=400)),
+}
+
+
+class LeaderboardUnavailable(Exception):
+    pass
+
+
+_client = None
+# time.monotonic() until which Redis is treated as down
+_unavailable_until = 0.0
+
+
+def get_client():
+    global _client
+    if _client is None:
+        # Short timeouts: an unreachable Redis must not stall result uploads
+        _client = redis.Redis.from_url(settings.LEADERBOARD_REDIS_URL, socket_connect_timeout=1, socket_timeout=2)
+    return _client
+
+
+def _backing_off():
+    return time.monotonic() < _unavailable_until
+
+
+def _record_failure(exc):
+    """Starts the backoff when Redis could not be reached at all."""
+    global _unavailable_until
+    if isinstance(exc, (redis.ConnectionError, redis.TimeoutError)):
+        _unavailable_until = time.monotonic() + FAILURE_BACKOFF
+
+
+def board_key(game_type, period, moment=None):
+    key_for, _, _ = PERIODS[period]
+    return f"{KEY_PREFIX}:{game_type}:{period}:{key_for(moment or timezone.now())}"
+
+
+def _stored_score(spec, score):
+    return -float(score) if spec.best == 'min' else float(score)
+
+
+def _display_score(spec, stored):
+    score = -stored if spec.best == 'min' else stored
+    return int(score) if float(score).is_integer() else round(score, 3)
+
+
+# --- INCREMENTAL UPDATES ---
+
+def update_leaderboards(results):
+    """
+    Adds new results to every period's board with one pipelined round trip.
+    Failures are logged, not raised: the boards can be rebuilt from SQL.
+    While Redis is backing off after a connection failure, updates are dropped.
+    """
+    if _backing_off():
+        return
+    best = {}
+    for result in results:
+        spec = SPEC_BY_MODEL[type(result).__name__]
+        stored = _stored_score(spec, getattr(result, spec.score))
+        for period, (_, _, keep) in PERIODS.items():
+            key = board_key(spec.game_type, period, result.created_at)
+            member = str(result.user_id)
+            if stored > best.get((key, member), (float('-inf'),))[0]:
+                best[(key, member)] = (stored, keep)
+
+    if not best:
+        return
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        for (key, member), (stored, keep) in best.items():
+            pipe.zadd(key, {member: stored}, gt=True)
+            if keep is not None:
+                pipe.expire(key, int(keep.total_seconds()))
+        pipe.execute()
+    except redis.RedisError as exc:
+        _record_failure(exc)
+        logger.exception("Leaderboard update failed; run rebuild_leaderboards to resync")
+
+
+# --- READS ---
+
+def get_leaderboard(game_type, user, period='all', limit=TOP_LIMIT):
+    """
+    Top `limit` players plus the requesting user's rank and percentile, read
+    with one pipelined round trip (ZREVRANGE + ZREVRANK + ZSCORE + ZCARD).
+    """
+    spec = SUMMARY_SPECS[game_type]
+    key = board_key(game_type, period)
+    member = str(user.pk)
+    if _backing_off():
+        raise LeaderboardUnavailable("Leaderboard store unreachable; retrying shortly")
+    try:
+        pipe = get_client().pipeline(transaction=False)
+        pipe.zrevrange(key, 0, limit - 1, withscores=True)
+        pipe.zrevrank(key, member)
+        pipe.zscore(key, member)
+        pipe.zcard(key)
+        top, my_rank, my_score, total = pipe.execute()
+    except redis.RedisError as exc:
+        _record_failure(exc)
+        raise LeaderboardUnavailable(str(exc))
+
+    user_ids = [int(member_id) for member_id, _ in top]
+    usernames = dict(get_user_model().objects.filter(id__in=user_ids).values_list('id', 'username'))
+
+    entries = [
+        {
+            'rank': position,
+            'user_id': user_id,
+            'username': usernames.get(user_id, ''),
+            'score': _display_score(spec, stored),
+        }
+        for position, (user_id, (_, stored)) in enumerate(zip(user_ids, top), start=1)
+    ]
+
+    me = None
+    if my_rank is not None:
+        rank = my_rank + 1
+        me = {
+            'rank': rank,
+            'score': _display_score(spec, my_score),
+            # Share of players ranked at or below you
+            'percentile': round((total - rank + 1) / total * 100, 1),
+        }
+
+    return {
+        'game': game_type,
+        'period': period,
+        'lower_is_better': spec.best == 'min',
+        'total_players': total,
+        'top': entries,
+        'me': me,
+    }
+
+
+# --- REBUILD ---
+
+def _period_bests(spec, period):
+    """{period key: {user_id: best}} for one game, from one GROUP BY query."""
+    model = apps.get_model('mentalGames', spec.model_name)
+    key_for, trunc, keep = PERIODS[period]
+    best = Min(spec.score) if spec.best == 'min' else Max(spec.score)
+
+    boards = {}
+    if trunc is None:
+        rows = model.objects.order_by().values('user_id').annotate(best=best)
+        boards[key_for(None)] = {row['user_id']: row['best'] for row in rows}
+        return boards
+
+    rows = (
+        model.objects.filter(created_at__gte=timezone.now() - keep)
+        .annotate(period=trunc('created_at'))
+        .order_by()
+        .values('period', 'user_id')
+        .annotate(best=best)
+    )
+    for row in rows:
+        boards.setdefault(key_for(row['period']), {})[row['user_id']] = row['best']
+    return boards
+
+
+def rebuild_leaderboards(game_types=None):
+    """
+    Recomputes the boards still within their retention window from SQL.
+    Each board is written to a temporary key and swapped in with RENAME, so
+    readers never see a half-built board; boards of the game that existed
+    before the rebuild and were not rewritten are deleted. Returns the number
+    of boards written.
+    """
+    client = get_client()
+    written = 0
+    for game_type in game_types or SUMMARY_SPECS:
+        spec = SUMMARY_SPECS[game_type]
+        # Listed before writing, so boards created meanwhile by incremental
+        # updates are left alone
+        stale = {
+            key.decode() if isinstance(key, bytes) else key
+            for key in client.scan_iter(match=f"{KEY_PREFIX}:{game_type}:*", count=1000)
+        }
+        for period, (_, _, keep) in PERIODS.items():
+            for period_key, bests in _period_bests(spec, period).items():
+                key = f"{KEY_PREFIX}:{game_type}:{period}:{period_key}"
+                if not bests:
+                    continue
+                stale.discard(key)
+                tmp_key = f"{key}:rebuild"
+                pipe = client.pipeline(transaction=True)
+                pipe.delete(tmp_key)
+                members = [(str(user_id), _stored_score(spec, score)) for user_id, score in bests.items()]
+                for start in range(0, len(members), REBUILD_CHUNK_SIZE):
+                    pipe.zadd(tmp_key, dict(members[start:start + REBUILD_CHUNK_SIZE]))
+                pipe.rename(tmp_key, key)
+                if keep is not None:
+                    pipe.expire(key, int(keep.total_seconds()))
+                pipe.execute()
+                written += 1
+        if stale:
+            client.delete(*stale)
+    return written
@@ -0,0 +1,16 @@
+# soulcare_backend/mentalGames/management/commands/compute_game_baselines.py
+
+from django.core.management.base import BaseCommand
+from mentalGames.analytics import MIN_BASELINE_PLAYS, compute_baselines
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the population baselines used for cognitive-trend z-scores. Run nightly.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-plays', type=int, default=MIN_BASELINE_PLAYS, help='Plays a user needs to be included.')
+
+    def handle(self, *args, **options):
+        counts = compute_baselines(min_plays=options['min_plays'])
+        summary = ', '.join(f"{metric}: {users} users" for metric, users in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Game baselines computed ({summary})."))
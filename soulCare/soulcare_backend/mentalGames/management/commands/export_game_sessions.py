@@ -0,0 +1,48 @@
+# soulcare_backend/mentalGames/management/commands/export_game_sessions.py
+
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from mentalGames.exports import parse_export_filters
+from mentalGames.research import RESEARCH_FORMATS, parse_watermark, research_export
+
+
+class Command(BaseCommand):
+    help = 'Exports the unified game-session matrix (all games) as Parquet, Arrow IPC or NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Output file.')
+        parser.add_argument('--format', choices=list(RESEARCH_FORMATS), default='parquet')
+        parser.add_argument('--since', default=None, help='Watermark from a previous export; newer rows are written, plus an overlap to de-duplicate.')
+        parser.add_argument(
+            '--watermark-file', default=None,
+            help='Reads --since from this file (if it exists) and stores the new watermark in it afterwards.',
+        )
+        parser.add_argument('--start', default=None, help='Only sessions on/after this ISO date or datetime.')
+        parser.add_argument('--end', default=None, help='Only sessions on/before this ISO date or datetime.')
+        parser.add_argument('--user', default=None, help='Only sessions of this user id.')
+
+    def handle(self, *args, **options):
+        since_token = options['since']
+        watermark_file = Path(options['watermark_file']) if options['watermark_file'] else None
+        if since_token is None and watermark_file and watermark_file.exists():
+            since_token = watermark_file.read_text().strip()
+
+        try:
+            filters = parse_export_filters({k: options[k] for k in ('start', 'end', 'user')})
+            chunks, watermark, _, _ = research_export(
+                options['format'], filters=filters, since=parse_watermark(since_token),
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        size = 0
+        with open(options['path'], 'wb') as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+                size += len(chunk)
+
+        # Only advance the watermark once the file is fully written
+        if watermark_file:
+            watermark_file.write_text(watermark + '\n')
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {size} bytes to {options['path']}. Watermark: {watermark}"))
@@ -0,0 +1,19 @@
+# soulcare_backend/mentalGames/management/commands/rebuild_game_summaries.py
+
+from django.core.management.base import BaseCommand
+from mentalGames.summaries import SUMMARY_SPECS, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Reconciles the GameSummary table with the raw game result tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=None, help='Only rebuild this user id.')
+        parser.add_argument('--game', choices=list(SUMMARY_SPECS), action='append', help='Only rebuild this game (repeatable).')
+
+    def handle(self, *args, **options):
+        counts = rebuild_summaries(user_id=options['user'], game_types=options['game'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Game summaries rebuilt: {counts['created']} created, {counts['updated']} corrected, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged."
+        ))
@@ -0,0 +1,20 @@
+# soulcare_backend/mentalGames/management/commands/rebuild_leaderboards.py
+
+from django.core.management.base import BaseCommand, CommandError
+from mentalGames.leaderboards import rebuild_leaderboards
+from mentalGames.summaries import SUMMARY_SPECS
+import redis
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the Redis game leaderboards (all-time, current weeks and months) from the result tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--game', choices=list(SUMMARY_SPECS), action='append', help='Only rebuild this game (repeatable).')
+
+    def handle(self, *args, **options):
+        try:
+            written = rebuild_leaderboards(game_types=options['game'])
+        except redis.RedisError as exc:
+            raise CommandError(f"Could not reach the leaderboard Redis: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} leaderboards."))
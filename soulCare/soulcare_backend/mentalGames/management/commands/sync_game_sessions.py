@@ -0,0 +1,19 @@
+# soulcare_backend/mentalGames/management/commands/sync_game_sessions.py
+
+from django.core.management.base import BaseCommand
+from mentalGames.sessions import sync_sessions
+from mentalGames.summaries import SUMMARY_SPECS
+
+
+class Command(BaseCommand):
+    help = 'Reconciles the GameSession table with the six game result tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--game', choices=list(SUMMARY_SPECS), action='append', help='Only sync this game (repeatable).')
+
+    def handle(self, *args, **options):
+        counts = sync_sessions(game_types=options['game'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Game sessions synced: {counts['created']} created, {counts['updated']} corrected, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged."
+        ))
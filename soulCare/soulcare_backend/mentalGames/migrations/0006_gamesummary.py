@@ -0,0 +1,88 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# (game_type, result model, score, metric, time field, time scale to ms) as of
+# this migration; frozen here so later changes to summaries.py don't alter it.
+SUMMARY_SOURCES = [
+    ('reaction_time', 'ReactionTimeResult', 'reaction_time_ms', None, 'reaction_time_ms', 1),
+    ('memory_game', 'MemoryGameResult', 'max_sequence_length', None, None, 1),
+    ('stroop_test', 'StroopGameResult', 'total_correct', 'interference_score_ms', 'total_time_s', 1000),
+    ('longest_number', 'LongestNumberGameResult', 'max_number_length', None, 'total_reaction_time_ms', 1),
+    ('numpuz_game', 'NumpuzGameResult', 'time_taken_s', 'moves_made', 'time_taken_s', 1000),
+    ('additions_game', 'AdditionsGameResult', 'total_correct', None, 'time_taken_s', 1000),
+]
+
+
+def backfill_game_summaries(apps, schema_editor):
+    GameSummary = apps.get_model('mentalGames', 'GameSummary')
+    float_sum = lambda field: models.Sum(field, output_field=models.FloatField())
+
+    for game_type, model_name, score, metric, time_field, time_scale in SUMMARY_SOURCES:
+        aggregates = {
+            'plays': models.Count('id'),
+            'score_sum': float_sum(score),
+            'score_min': models.Min(score),
+            'score_max': models.Max(score),
+            'last_played_at': models.Max('created_at'),
+        }
+        if metric:
+            aggregates.update(metric_sum=float_sum(metric), metric_min=models.Min(metric), metric_max=models.Max(metric))
+        if time_field:
+            aggregates['time_ms_sum'] = float_sum(time_field)
+
+        rows = apps.get_model('mentalGames', model_name).objects.order_by().values('user_id').annotate(**aggregates)
+        GameSummary.objects.bulk_create([
+            GameSummary(
+                user_id=row['user_id'],
+                game_type=game_type,
+                plays=row['plays'],
+                score_sum=row['score_sum'] or 0,
+                score_min=row['score_min'],
+                score_max=row['score_max'],
+                metric_sum=row.get('metric_sum') or 0,
+                metric_min=row.get('metric_min'),
+                metric_max=row.get('metric_max'),
+                time_ms_sum=(row.get('time_ms_sum') or 0) * time_scale,
+                last_played_at=row['last_played_at'],
+            )
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentalGames', '0005_additionsgameresult'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('reaction_time', 'Reaction Time'), ('memory_game', 'Memory Game'), ('stroop_test', 'Stroop Test'), ('longest_number', 'Longest Number'), ('numpuz_game', 'Numpuz'), ('additions_game', 'Additions')], max_length=32)),
+                ('plays', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('score_min', models.FloatField(blank=True, null=True)),
+                ('score_max', models.FloatField(blank=True, null=True)),
+                ('metric_sum', models.FloatField(default=0)),
+                ('metric_min', models.FloatField(blank=True, null=True)),
+                ('metric_max', models.FloatField(blank=True, null=True)),
+                ('time_ms_sum', models.FloatField(default=0)),
+                ('last_played_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Game Summary',
+                'verbose_name_plural': 'Game Summaries',
+                'constraints': [models.UniqueConstraint(fields=('user', 'game_type'), name='unique_game_summary')],
+            },
+        ),
+        migrations.RunPython(backfill_game_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentalGames', '0006_gamesummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='additionsgameresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='longestnumbergameresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='memorygameresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='numpuzgameresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reactiontimeresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stroopgameresult',
+            name='client_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='additionsgameresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_additions_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='longestnumbergameresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_longest_number_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='memorygameresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_memory_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='numpuzgameresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_numpuz_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='reactiontimeresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_reaction_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='stroopgameresult',
+            constraint=models.UniqueConstraint(fields=('user', 'client_id'), name='unique_stroop_client_id'),
+        ),
+    ]
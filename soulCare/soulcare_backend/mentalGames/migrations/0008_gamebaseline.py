@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentalGames', '0007_result_client_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50, unique=True)),
+                ('mean', models.FloatField()),
+                ('std', models.FloatField()),
+                ('p25', models.FloatField()),
+                ('p50', models.FloatField()),
+                ('p75', models.FloatField()),
+                ('user_count', models.PositiveIntegerField(help_text='Users included in the baseline.')),
+                ('result_count', models.PositiveIntegerField(help_text="Results behind those users' averages.")),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Game Baseline',
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# (game_type, result model, score, metric, time field, time scale to ms) as of
+# this migration; frozen here so later changes to summaries.py don't alter it.
+SESSION_SOURCES = [
+    ('reaction_time', 'ReactionTimeResult', 'reaction_time_ms', None, 'reaction_time_ms', 1),
+    ('memory_game', 'MemoryGameResult', 'max_sequence_length', None, None, 1),
+    ('stroop_test', 'StroopGameResult', 'total_correct', 'interference_score_ms', 'total_time_s', 1000),
+    ('longest_number', 'LongestNumberGameResult', 'max_number_length', None, 'total_reaction_time_ms', 1),
+    ('numpuz_game', 'NumpuzGameResult', 'time_taken_s', 'moves_made', 'time_taken_s', 1000),
+    ('additions_game', 'AdditionsGameResult', 'total_correct', None, 'time_taken_s', 1000),
+]
+COMMON_FIELDS = ('post_game_mood', 'perceived_effort', 'stress_reduction_rating')
+CHUNK_SIZE = 2000
+
+
+def backfill_game_sessions(apps, schema_editor):
+    GameSession = apps.get_model('mentalGames', 'GameSession')
+
+    for game_type, model_name, score, metric, time_field, time_scale in SESSION_SOURCES:
+        fields = ['id', 'user_id', 'created_at', *COMMON_FIELDS, *{score, metric, time_field} - {None}]
+        results = apps.get_model('mentalGames', model_name).objects.order_by('id').values(*fields)
+        after = 0
+        while True:
+            page = list(results.filter(id__gt=after)[:CHUNK_SIZE])
+            GameSession.objects.bulk_create([
+                GameSession(
+                    game_type=game_type,
+                    result_id=row['id'],
+                    user_id=row['user_id'],
+                    created_at=row['created_at'],
+                    score=row[score],
+                    metric=row[metric] if metric else None,
+                    time_ms=row[time_field] * time_scale if time_field else 0,
+                    **{field: row[field] for field in COMMON_FIELDS},
+                )
+                for row in page
+            ], batch_size=1000)
+            if len(page) < CHUNK_SIZE:
+                break
+            after = page[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentalGames', '0008_gamebaseline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('reaction_time', 'Reaction Time'), ('memory_game', 'Memory Game'), ('stroop_test', 'Stroop Test'), ('longest_number', 'Longest Number'), ('numpuz_game', 'Numpuz'), ('additions_game', 'Additions')], max_length=32)),
+                ('result_id', models.PositiveBigIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('post_game_mood', models.SmallIntegerField(default=3)),
+                ('perceived_effort', models.SmallIntegerField(blank=True, null=True)),
+                ('stress_reduction_rating', models.SmallIntegerField(blank=True, null=True)),
+                ('score', models.FloatField()),
+                ('metric', models.FloatField(blank=True, null=True)),
+                ('time_ms', models.FloatField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Game Session',
+                'indexes': [models.Index(fields=['created_at', 'id'], name='game_session_created_idx'), models.Index(fields=['user', 'game_type', 'created_at'], name='game_session_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('game_type', 'result_id'), name='unique_game_session_result')],
+            },
+        ),
+        migrations.RunPython(backfill_game_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentalGames', '0009_gamesession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='additionsgameresult',
+            index=models.Index(fields=['user', 'created_at'], name='additions_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='longestnumbergameresult',
+            index=models.Index(fields=['user', 'created_at'], name='longest_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memorygameresult',
+            index=models.Index(fields=['user', 'created_at'], name='memory_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='numpuzgameresult',
+            index=models.Index(fields=['user', 'created_at'], name='numpuz_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reactiontimeresult',
+            index=models.Index(fields=['user', 'created_at'], name='reaction_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stroopgameresult',
+            index=models.Index(fields=['user', 'created_at'], name='stroop_user_created_idx'),
+        ),
+    ]
@@ -39,12 +39,24 @@ class ReactionTimeResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
         help_text="Timestamp of when the result was recorded."
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_reaction_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='reaction_user_created_idx'),
+        ]
+
 class MemoryGameResult(models.Model):
     # --- Core Game Result ---
     user = models.ForeignKey(
@@ -80,6 +92,9 @@ class MemoryGameResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -92,6 +107,13 @@ class MemoryGameResult(models.Model):
     class Meta:
         verbose_name = "Memory Game Result"
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_memory_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='memory_user_created_idx'),
+        ]
 
 class StroopGameResult(models.Model):
     # --- Core Game Result ---
@@ -131,6 +153,9 @@ class StroopGameResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -143,6 +168,13 @@ class StroopGameResult(models.Model):
     class Meta:
         verbose_name = "Stroop Game Result"
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_stroop_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='stroop_user_created_idx'),
+        ]
 
 
 class LongestNumberGameResult(models.Model):
@@ -184,6 +216,9 @@ class LongestNumberGameResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -196,6 +231,13 @@ class LongestNumberGameResult(models.Model):
     class Meta:
         verbose_name = "Longest Number Game Result"
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_longest_number_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='longest_user_created_idx'),
+        ]
 
 class NumpuzGameResult(models.Model):
     # --- Core Game Result ---
@@ -237,6 +279,9 @@ class NumpuzGameResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -249,6 +294,13 @@ class NumpuzGameResult(models.Model):
     class Meta:
         verbose_name = "Numpuz Game Result"
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_numpuz_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='numpuz_user_created_idx'),
+        ]
 
 
 class AdditionsGameResult(models.Model):
@@ -292,6 +344,9 @@ class AdditionsGameResult(models.Model):
         help_text="Do you feel calmer after the game? (1=No, 10=Definitely Yes)"
     )
 
+    # Client-generated id that makes batch uploads idempotent (see mentalGames/ingest.py)
+    client_id = models.UUIDField(null=True, blank=True)
+
     # --- Standard Metadata ---
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -304,3 +359,125 @@ class AdditionsGameResult(models.Model):
     class Meta:
         verbose_name = "Additions Game Result"
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='unique_additions_client_id'),
+        ]
+        indexes = [
+            # Per-user history, newest first
+            models.Index(fields=['user', 'created_at'], name='additions_user_created_idx'),
+        ]
+
+
+class GameSummary(models.Model):
+    """
+    Running per-user, per-game aggregates, updated on every new result so the
+    stats endpoints read one row instead of aggregating the raw result tables.
+    Which field feeds score/metric/time for each game is defined in
+    mentalGames/summaries.py. Rebuild with `manage.py rebuild_game_summaries`.
+    """
+    GAME_TYPE_CHOICES = [
+        ('reaction_time', 'Reaction Time'),
+        ('memory_game', 'Memory Game'),
+        ('stroop_test', 'Stroop Test'),
+        ('longest_number', 'Longest Number'),
+        ('numpuz_game', 'Numpuz'),
+        ('additions_game', 'Additions'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='game_summaries',
+    )
+    game_type = models.CharField(max_length=32, choices=GAME_TYPE_CHOICES)
+
+    plays = models.PositiveIntegerField(default=0)
+    # Primary score of the game (e.g. reaction_time_ms, max_sequence_length)
+    score_sum = models.FloatField(default=0)
+    score_min = models.FloatField(null=True, blank=True)
+    score_max = models.FloatField(null=True, blank=True)
+    # Secondary metric (e.g. Stroop interference, Numpuz moves), if any
+    metric_sum = models.FloatField(default=0)
+    metric_min = models.FloatField(null=True, blank=True)
+    metric_max = models.FloatField(null=True, blank=True)
+    # Total time spent playing, in milliseconds
+    time_ms_sum = models.FloatField(default=0)
+
+    last_played_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.game_type}: {self.plays} plays"
+
+    class Meta:
+        verbose_name = "Game Summary"
+        verbose_name_plural = "Game Summaries"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'game_type'], name='unique_game_summary'),
+        ]
+
+
+class GameSession(models.Model):
+    """
+    One row per played game across all six result tables, with the columns
+    every game shares. Cross-game reads (matrix exports, baselines, admin)
+    scan this table instead of six; the per-game tables keep the full
+    game-specific detail behind the existing endpoints.
+
+    score / metric / time_ms follow the same per-game mapping as GameSummary
+    (mentalGames/summaries.py). Kept in sync by mentalGames/sessions.py;
+    reconcile with `manage.py sync_game_sessions`.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='game_sessions',
+    )
+    game_type = models.CharField(max_length=32, choices=GameSummary.GAME_TYPE_CHOICES)
+    # Primary key of the row in the game's own result table
+    result_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField()
+
+    post_game_mood = models.SmallIntegerField(default=3)
+    perceived_effort = models.SmallIntegerField(null=True, blank=True)
+    stress_reduction_rating = models.SmallIntegerField(null=True, blank=True)
+
+    score = models.FloatField()
+    metric = models.FloatField(null=True, blank=True)
+    time_ms = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.game_type} #{self.result_id} ({self.user_id})"
+
+    class Meta:
+        verbose_name = "Game Session"
+        constraints = [
+            models.UniqueConstraint(fields=['game_type', 'result_id'], name='unique_game_session_result'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='game_session_created_idx'),
+            models.Index(fields=['user', 'game_type', 'created_at'], name='game_session_user_idx'),
+        ]
+
+
+class GameBaseline(models.Model):
+    """
+    Population distribution of per-user average scores for one analytics
+    metric (see mentalGames/analytics.py). Recomputed nightly by
+    `manage.py compute_game_baselines`.
+    """
+    metric = models.CharField(max_length=50, unique=True)
+    mean = models.FloatField()
+    std = models.FloatField()
+    p25 = models.FloatField()
+    p50 = models.FloatField()
+    p75 = models.FloatField()
+    user_count = models.PositiveIntegerField(help_text="Users included in the baseline.")
+    result_count = models.PositiveIntegerField(help_text="Results behind those users' averages.")
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.metric}: mean {self.mean:.2f} (n={self.user_count})"
+
+    class Meta:
+        verbose_name = "Game Baseline"
@@ -0,0 +1,268 @@
+# soulcare_backend/mentalGames/research.py
+
+"""
+Research export of the unified game-session matrix, as NDJSON, Arrow or
+Parquet, with watermarks for incremental pulls.
+
+Result ids are not committed in id order: a result saved inside a longer
+transaction can commit after a higher id was already exported. An
+incremental pull therefore restarts WATERMARK_SAFETY_MARGIN ids below each
+game's watermark, so rows can repeat across pulls; consumers de-duplicate on
+(game_type, result_id).
+"""
+
+import heapq
+import json
+
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from soulcare_backend.streaming import gzip_chunks
+
+from .exports import (
+    GAME_SOURCES, COMMON_FIELDS, EXPORT_CHUNK_SIZE,
+    apply_export_filters, iter_result_rows,
+)
+
+# --- SESSION MATRIX SCHEMA ---
+# One row per game session across all six result tables. Score columns that
+# a game does not record are null; fields with the same name and meaning
+# (e.g. total_correct) share a column.
+
+MATRIX_COLUMNS = [
+    # (column, arrow type name)
+    ('game_type', 'string'),
+    ('result_id', 'int64'),
+    ('user_id', 'int64'),
+    ('created_at', 'timestamp'),
+    ('post_game_mood', 'int64'),
+    ('perceived_effort', 'int64'),
+    ('stress_reduction_rating', 'int64'),
+    ('reaction_time_ms', 'int64'),
+    ('max_sequence_length', 'int64'),
+    ('total_attempts', 'int64'),
+    ('total_correct', 'int64'),
+    ('interference_score_ms', 'int64'),
+    ('total_time_s', 'float64'),
+    ('max_number_length', 'int64'),
+    ('total_reaction_time_ms', 'int64'),
+    ('time_taken_s', 'float64'),
+    ('puzzle_size', 'string'),
+    ('moves_made', 'int64'),
+    ('difficulty_level', 'int64'),
+]
+MATRIX_COLUMN_NAMES = [name for name, _ in MATRIX_COLUMNS]
+
+RESEARCH_FORMATS = {
+    # format -> (content type, file extension)
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Rows per Arrow record batch / Parquet row group
+BATCH_ROWS = EXPORT_CHUNK_SIZE
+# Ids below a `since` watermark that are exported again, covering results
+# that committed after a higher id had been exported
+WATERMARK_SAFETY_MARGIN = 1000
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Arrow and Parquet exports require the 'pyarrow' package on the server.")
+    return pyarrow
+
+
+def arrow_schema():
+    pa = _import_pyarrow()
+    types = {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in MATRIX_COLUMNS])
+
+
+# --- WATERMARKS ---
+# A watermark records the highest result id exported per game, e.g.
+# "reaction_time:120,memory_game:45,...". Passing it back as `since` ships
+# the rows created after the previous pull, plus the last
+# WATERMARK_SAFETY_MARGIN ids before it again.
+
+def parse_watermark(token):
+    if not token:
+        return {}
+    known = {source.game_type for source in GAME_SOURCES.values()}
+    watermark = {}
+    for part in token.split(','):
+        game_type, _, last_id = part.strip().partition(':')
+        if game_type not in known or not last_id.isdigit():
+            raise ValueError(f"Invalid watermark '{token}'.")
+        watermark[game_type] = int(last_id)
+    return watermark
+
+
+def format_watermark(watermark):
+    return ','.join(f"{game_type}:{last_id}" for game_type, last_id in watermark.items())
+
+
+def current_watermark():
+    """Highest id per game right now (one primary-key MAX per table)."""
+    return {
+        source.game_type: source.model.objects.aggregate(last=Max('id'))['last'] or 0
+        for source in GAME_SOURCES.values()
+    }
+
+
+# --- ROWS ---
+
+def _session_rows(source, filters, since_id, until_id):
+    queryset = apply_export_filters(source.model.objects.all(), **filters)
+    queryset = queryset.filter(id__gt=since_id, id__lte=until_id)
+    fields = ('user_id',) + COMMON_FIELDS + tuple(source.score_fields)
+    names = ['user_id', *COMMON_FIELDS, *source.score_fields]
+    for row in iter_result_rows(queryset, fields):
+        result_id, created_at, *values = row
+        record = dict.fromkeys(MATRIX_COLUMN_NAMES)
+        record.update(zip(names, values))
+        record['game_type'] = source.game_type
+        record['result_id'] = result_id
+        record['created_at'] = created_at
+        yield record
+
+
+def session_rows(filters, since, until):
+    """
+    All sessions with since[game] - WATERMARK_SAFETY_MARGIN < id <= until[game],
+    merged by created_at. `until` pins the export to a snapshot so the
+    returned watermark is exact.
+    """
+    starts = {
+        game_type: max(0, last_id - WATERMARK_SAFETY_MARGIN) for game_type, last_id in since.items()
+    }
+    streams = [
+        _session_rows(source, filters, starts.get(source.game_type, 0), until[source.game_type])
+        for source in GAME_SOURCES.values()
+        if until[source.game_type] > starts.get(source.game_type, 0)
+    ]
+    return heapq.merge(*streams, key=lambda record: record['created_at'])
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- ENCODERS (each yields bytes) ---
+
+def ndjson_chunks(rows):
+    for batch in _batches(rows, BATCH_ROWS):
+        lines = []
+        for record in batch:
+            record = dict(record, created_at=record['created_at'].isoformat())
+            lines.append(json.dumps(record, separators=(',', ':')))
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes back in chunks while
+    keeping an absolute position (Parquet footers store byte offsets).
+    """
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _columnar_chunks(rows, open_writer):
+    pa = _import_pyarrow()
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    writer = open_writer(pa.PythonFile(sink, mode='w'), schema)
+    for batch in _batches(rows, BATCH_ROWS):
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def arrow_chunks(rows):
+    pa = _import_pyarrow()
+    options = pa.ipc.IpcWriteOptions(compression='zstd')
+    return _columnar_chunks(rows, lambda sink, schema: pa.ipc.new_stream(sink, schema, options=options))
+
+
+def parquet_chunks(rows):
+    pa = _import_pyarrow()
+    return _columnar_chunks(rows, lambda sink, schema: pa.parquet.ParquetWriter(sink, schema, compression='zstd'))
+
+
+ENCODERS = {
+    'ndjson': ndjson_chunks,
+    'arrow': arrow_chunks,
+    'parquet': parquet_chunks,
+}
+
+
+def research_export(fmt, filters=None, since=None, compress=False):
+    """
+    Builds an export of the unified game-session matrix.
+    Returns (byte chunk iterator, watermark token, content type, file extension).
+    Raises ValueError for an unknown or unavailable format.
+    """
+    if fmt not in RESEARCH_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Expected one of: {', '.join(RESEARCH_FORMATS)}")
+    if fmt != 'ndjson':
+        # Fail before the response starts rather than mid-stream
+        _import_pyarrow()
+
+    until = current_watermark()
+    rows = session_rows(filters or {}, since or {}, until)
+    chunks = ENCODERS[fmt](rows)
+    content_type, extension = RESEARCH_FORMATS[fmt]
+    # Parquet and Arrow compress internally
+    if compress and fmt == 'ndjson':
+        chunks = gzip_chunks(chunks)
+        content_type, extension = 'application/gzip', f"{extension}.gz"
+    return chunks, format_watermark(until), content_type, extension
+
+
+def research_export_response(fmt, filters=None, since=None, compress=False):
+    chunks, watermark, content_type, extension = research_export(fmt, filters, since, compress)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="soulcare_game_sessions.{extension}"'
+    response['X-Export-Watermark'] = watermark
+    return response
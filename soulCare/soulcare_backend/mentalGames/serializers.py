@@ -134,3 +134,14 @@ class AdditionsGameResultSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+
+
+# URL slug -> serializer, shared by the history and batch ingestion endpoints
+GAME_RESULT_SERIALIZERS = {
+    'reaction-time': ReactionTimeResultSerializer,
+    'memory-game': MemoryGameResultSerializer,
+    'stroop-game': StroopGameResultSerializer,
+    'longest-number': LongestNumberGameResultSerializer,
+    'numpuz-game': NumpuzGameResultSerializer,
+    'additions-game': AdditionsGameResultSerializer,
+}
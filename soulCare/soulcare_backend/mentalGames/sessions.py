@@ -0,0 +1,120 @@
+# soulcare_backend/mentalGames/sessions.py
+
+from django.apps import apps as global_apps
+from django.db import transaction
+
+from .exports import COMMON_FIELDS
+from .summaries import SPEC_BY_MODEL, SUMMARY_SPECS, _same
+
+SESSION_VALUE_FIELDS = ['user_id', 'created_at', *COMMON_FIELDS, 'score', 'metric', 'time_ms']
+# Result rows read per page when reconciling
+SYNC_CHUNK_SIZE = 2000
+
+
+def _session_model(apps=None):
+    return (apps or global_apps).get_model('mentalGames', 'GameSession')
+
+
+def session_values(spec, result):
+    """GameSession column values for one result instance."""
+    score, metric, time_ms = spec.values(result)
+    values = {field: getattr(result, field) for field in COMMON_FIELDS}
+    values.update({
+        'user_id': result.user_id,
+        'created_at': result.created_at,
+        'score': score,
+        'metric': metric,
+        'time_ms': time_ms,
+    })
+    return values
+
+
+# --- INCREMENTAL UPDATES ---
+
+def record_sessions(results):
+    """
+    Adds GameSession rows for newly created results in one INSERT. Used after
+    bulk_create, which skips the post_save signal.
+    """
+    sessions = []
+    for result in results:
+        spec = SPEC_BY_MODEL[type(result).__name__]
+        sessions.append(_session_model()(game_type=spec.game_type, result_id=result.pk, **session_values(spec, result)))
+    if sessions:
+        _session_model().objects.bulk_create(sessions)
+
+
+def sync_session(result, created=False):
+    """Creates or refreshes the GameSession row of one saved result."""
+    spec = SPEC_BY_MODEL[type(result).__name__]
+    GameSession = _session_model()
+    values = session_values(spec, result)
+    if created:
+        GameSession.objects.create(game_type=spec.game_type, result_id=result.pk, **values)
+    else:
+        GameSession.objects.update_or_create(game_type=spec.game_type, result_id=result.pk, defaults=values)
+
+
+def delete_session(result):
+    spec = SPEC_BY_MODEL[type(result).__name__]
+    _session_model().objects.filter(game_type=spec.game_type, result_id=result.pk).delete()
+
+
+# --- RECONCILE ---
+
+def _result_pages(model, spec, chunk_size):
+    """Result instances in id order, one bounded query per page."""
+    fields = {'user', 'created_at', *COMMON_FIELDS, spec.score, spec.metric, spec.time_field} - {None}
+    after = 0
+    while True:
+        page = list(model.objects.filter(id__gt=after).order_by('id').only(*fields)[:chunk_size])
+        yield page, after, page[-1].id if len(page) == chunk_size else None
+        if len(page) < chunk_size:
+            return
+        after = page[-1].id
+
+
+def sync_sessions(apps=None, game_types=None, chunk_size=None):
+    """
+    Reconciles GameSession with the six result tables: creates missing rows,
+    fixes drifted ones and deletes rows whose result is gone. Works through
+    each table in id ranges, so memory stays bounded however large it is.
+    Returns counts: created, updated, deleted, unchanged.
+    """
+    GameSession = _session_model(apps)
+    chunk_size = chunk_size or SYNC_CHUNK_SIZE
+    counts = {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+    for game_type in game_types or SUMMARY_SPECS:
+        spec = SUMMARY_SPECS[game_type]
+        model = (apps or global_apps).get_model('mentalGames', spec.model_name)
+        for page, after, upper in _result_pages(model, spec, chunk_size):
+            # Sessions in the same id range as this page (open-ended on the last page)
+            window = GameSession.objects.filter(game_type=game_type, result_id__gt=after)
+            if upper is not None:
+                window = window.filter(result_id__lte=upper)
+
+            with transaction.atomic():
+                existing = {session.result_id: session for session in window.select_for_update()}
+                to_create, to_update = [], []
+                for result in page:
+                    values = session_values(spec, result)
+                    session = existing.pop(result.id, None)
+                    if session is None:
+                        to_create.append(GameSession(game_type=game_type, result_id=result.id, **values))
+                    elif any(not _same(getattr(session, field), value) for field, value in values.items()):
+                        for field, value in values.items():
+                            setattr(session, field, value)
+                        to_update.append(session)
+                    else:
+                        counts['unchanged'] += 1
+
+                GameSession.objects.bulk_create(to_create, batch_size=1000)
+                GameSession.objects.bulk_update(to_update, SESSION_VALUE_FIELDS, batch_size=1000)
+                if existing:
+                    GameSession.objects.filter(id__in=[session.id for session in existing.values()]).delete()
+
+            counts['created'] += len(to_create)
+            counts['updated'] += len(to_update)
+            counts['deleted'] += len(existing)
+    return counts
@@ -0,0 +1,31 @@
+# soulcare_backend/mentalGames/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import (
+    ReactionTimeResult, MemoryGameResult, StroopGameResult,
+    LongestNumberGameResult, NumpuzGameResult, AdditionsGameResult,
+)
+from .sessions import sync_session, delete_session
+
+
+@receiver(post_save, sender=ReactionTimeResult)
+@receiver(post_save, sender=MemoryGameResult)
+@receiver(post_save, sender=StroopGameResult)
+@receiver(post_save, sender=LongestNumberGameResult)
+@receiver(post_save, sender=NumpuzGameResult)
+@receiver(post_save, sender=AdditionsGameResult)
+def update_game_session(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    sync_session(instance, created=created)
+
+
+@receiver(post_delete, sender=ReactionTimeResult)
+@receiver(post_delete, sender=MemoryGameResult)
+@receiver(post_delete, sender=StroopGameResult)
+@receiver(post_delete, sender=LongestNumberGameResult)
+@receiver(post_delete, sender=NumpuzGameResult)
+@receiver(post_delete, sender=AdditionsGameResult)
+def remove_game_session(sender, instance, **kwargs):
+    delete_session(instance)
@@ -0,0 +1,257 @@
+# soulcare_backend/mentalGames/summaries.py
+
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+
+class SummarySpec:
+    """
+    How one result model feeds its GameSummary row.
+
+    - score: the game's headline number; `best` says whether lower ('min')
+      or higher ('max') is better.
+    - metric: optional secondary number (Stroop interference, Numpuz moves).
+    - time_field / time_scale: play time, converted to ms (1000 for seconds).
+    """
+    def __init__(self, game_type, model_name, score, best, metric=None, time_field=None, time_scale=1):
+        self.game_type = game_type
+        self.model_name = model_name
+        self.score = score
+        self.best = best
+        self.metric = metric
+        self.time_field = time_field
+        self.time_scale = time_scale
+
+    def values(self, result):
+        """(score, metric, time_ms) for one result instance."""
+        metric = getattr(result, self.metric) if self.metric else None
+        time_ms = getattr(result, self.time_field) * self.time_scale if self.time_field else 0
+        return getattr(result, self.score), metric, time_ms
+
+
+SUMMARY_SPECS = {spec.game_type: spec for spec in [
+    SummarySpec('reaction_time', 'ReactionTimeResult', 'reaction_time_ms', 'min',
+                time_field='reaction_time_ms'),
+    SummarySpec('memory_game', 'MemoryGameResult', 'max_sequence_length', 'max'),
+    SummarySpec('stroop_test', 'StroopGameResult', 'total_correct', 'max',
+                metric='interference_score_ms', time_field='total_time_s', time_scale=1000),
+    SummarySpec('longest_number', 'LongestNumberGameResult', 'max_number_length', 'max',
+                time_field='total_reaction_time_ms'),
+    SummarySpec('numpuz_game', 'NumpuzGameResult', 'time_taken_s', 'min',
+                metric='moves_made', time_field='time_taken_s', time_scale=1000),
+    SummarySpec('additions_game', 'AdditionsGameResult', 'total_correct', 'max',
+                time_field='time_taken_s', time_scale=1000),
+]}
+
+SPEC_BY_MODEL = {spec.model_name: spec for spec in SUMMARY_SPECS.values()}
+
+
+def _summary_model(apps=None):
+    return (apps or global_apps).get_model('mentalGames', 'GameSummary')
+
+
+# --- INCREMENTAL UPDATE ---
+
+def _running(field, value, function):
+    # LEAST/GREATEST return NULL if any argument is NULL (MySQL), so seed with the value
+    return function(Coalesce(F(field), Value(value)), Value(value))
+
+
+def _fold(spec, results):
+    """Combined deltas for several results of one game and one user."""
+    values = [spec.values(result) for result in results]
+    scores = [float(score) for score, _, _ in values]
+    metrics = [float(metric) for _, metric, _ in values if metric is not None]
+    return {
+        'plays': len(values),
+        'score_sum': sum(scores), 'score_min': min(scores), 'score_max': max(scores),
+        'metric_sum': sum(metrics),
+        'metric_min': min(metrics) if metrics else None,
+        'metric_max': max(metrics) if metrics else None,
+        'time_ms_sum': sum(time_ms for _, _, time_ms in values),
+        'last_played_at': max(result.created_at for result in results),
+    }
+
+
+def _apply(GameSummary, user_id, game_type, delta):
+    updates = {
+        'plays': F('plays') + delta['plays'],
+        'score_sum': F('score_sum') + delta['score_sum'],
+        'score_min': _running('score_min', delta['score_min'], Least),
+        'score_max': _running('score_max', delta['score_max'], Greatest),
+        'time_ms_sum': F('time_ms_sum') + delta['time_ms_sum'],
+        'last_played_at': _running('last_played_at', delta['last_played_at'], Greatest),
+    }
+    if delta['metric_min'] is not None:
+        updates.update({
+            'metric_sum': F('metric_sum') + delta['metric_sum'],
+            'metric_min': _running('metric_min', delta['metric_min'], Least),
+            'metric_max': _running('metric_max', delta['metric_max'], Greatest),
+        })
+
+    rows = GameSummary.objects.filter(user_id=user_id, game_type=game_type)
+    if rows.update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            GameSummary.objects.create(user_id=user_id, game_type=game_type, **delta)
+    except IntegrityError:
+        # Another request created the row first
+        rows.update(**updates)
+
+
+def record_game_results(results):
+    """
+    Folds new results into their GameSummary rows: one UPDATE (or INSERT for
+    a first play) per (user, game), however many results there are. Safe
+    under concurrent requests: the arithmetic happens in SQL and a lost
+    insert race falls back to UPDATE. The leaderboards are updated after the
+    surrounding transaction commits.
+    """
+    from .leaderboards import update_leaderboards
+
+    GameSummary = _summary_model()
+    results = list(results)
+    groups = defaultdict(list)
+    for result in results:
+        groups[(SPEC_BY_MODEL[type(result).__name__], result.user_id)].append(result)
+    for (spec, user_id), group in groups.items():
+        _apply(GameSummary, user_id, spec.game_type, _fold(spec, group))
+
+    # Leaderboards live in Redis: only publish rows that actually committed
+    if results:
+        transaction.on_commit(lambda: update_leaderboards(results))
+
+
+def record_game_result(result):
+    record_game_results([result])
+
+
+# --- REBUILD ---
+
+def aggregate_summaries(spec, apps=None, user_id=None):
+    """
+    Recomputes summaries for one game from the raw results with one GROUP BY.
+    Returns {user_id: dict of GameSummary field values}.
+    """
+    model = (apps or global_apps).get_model('mentalGames', spec.model_name)
+    queryset = model.objects.all()
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+
+    float_sum = lambda field: Sum(field, output_field=FloatField())
+    aggregates = {
+        'plays': Count('id'),
+        'score_sum': float_sum(spec.score),
+        'score_min': Min(spec.score),
+        'score_max': Max(spec.score),
+        'last_played_at': Max('created_at'),
+    }
+    if spec.metric:
+        aggregates.update({
+            'metric_sum': float_sum(spec.metric),
+            'metric_min': Min(spec.metric),
+            'metric_max': Max(spec.metric),
+        })
+    if spec.time_field:
+        aggregates['time_ms_sum'] = float_sum(spec.time_field)
+
+    summaries = {}
+    for row in queryset.order_by().values('user_id').annotate(**aggregates):
+        values = {
+            'plays': row['plays'],
+            'score_sum': row['score_sum'] or 0,
+            'score_min': row['score_min'],
+            'score_max': row['score_max'],
+            'metric_sum': row.get('metric_sum') or 0,
+            'metric_min': row.get('metric_min'),
+            'metric_max': row.get('metric_max'),
+            'time_ms_sum': (row.get('time_ms_sum') or 0) * spec.time_scale,
+            'last_played_at': row['last_played_at'],
+        }
+        summaries[row['user_id']] = values
+    return summaries
+
+
+SUMMARY_VALUE_FIELDS = [
+    'plays', 'score_sum', 'score_min', 'score_max',
+    'metric_sum', 'metric_min', 'metric_max', 'time_ms_sum', 'last_played_at',
+]
+
+
+def _same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and abs(a - b) < 1e-6
+    return a == b
+
+
+def rebuild_summaries(apps=None, user_id=None, game_types=None):
+    """
+    Reconciles GameSummary with the raw result tables: fixes drifted rows,
+    creates missing ones and deletes rows with no remaining results.
+    Returns counts: created, updated, deleted, unchanged.
+    """
+    GameSummary = _summary_model(apps)
+    counts = {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+    for game_type in game_types or SUMMARY_SPECS:
+        spec = SUMMARY_SPECS[game_type]
+        fresh = aggregate_summaries(spec, apps=apps, user_id=user_id)
+
+        existing_rows = GameSummary.objects.filter(game_type=game_type)
+        if user_id is not None:
+            existing_rows = existing_rows.filter(user_id=user_id)
+
+        with transaction.atomic():
+            existing = {summary.user_id: summary for summary in existing_rows.select_for_update()}
+            to_create, to_update = [], []
+            for summary_user_id, values in fresh.items():
+                summary = existing.pop(summary_user_id, None)
+                if summary is None:
+                    to_create.append(GameSummary(user_id=summary_user_id, game_type=game_type, **values))
+                elif any(not _same(getattr(summary, field), value) for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(summary, field, value)
+                    to_update.append(summary)
+                else:
+                    counts['unchanged'] += 1
+
+            GameSummary.objects.bulk_create(to_create, batch_size=1000)
+            GameSummary.objects.bulk_update(to_update, SUMMARY_VALUE_FIELDS, batch_size=1000)
+            if existing:
+                GameSummary.objects.filter(id__in=[summary.id for summary in existing.values()]).delete()
+
+        counts['created'] += len(to_create)
+        counts['updated'] += len(to_update)
+        counts['deleted'] += len(existing)
+    return counts
+
+
+# --- READS ---
+
+def get_user_summaries(user):
+    """All of a user's summaries in one indexed read, keyed by game_type."""
+    return {summary.game_type: summary for summary in _summary_model().objects.filter(user=user)}
+
+
+def get_user_summary(user, game_type):
+    return _summary_model().objects.filter(user=user, game_type=game_type).first()
+
+
+def summary_stat(summary, field, cast=None):
+    """A summary field, or None when the user has not played the game."""
+    value = getattr(summary, field) if summary is not None else None
+    if value is None or cast is None:
+        return value
+    return cast(value)
+
+
+def summary_average(summary, field='score_sum'):
+    if summary is None or not summary.plays:
+        return None
+    return getattr(summary, field) / summary.plays
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import ReactionTimeResultListCreateView,MemoryGameResultListCreateView, StroopGameResultListCreateView,LongestNumberGameResultListCreateView,NumpuzGameResultListCreateView,numpuz_stats_view,longest_number_stats_view,AdditionsGameResultListCreateView,additions_stats_view,dashboard_stats_view,export_all_game_data_csv,AdminGameDataExportView
+from .views import ReactionTimeResultListCreateView,MemoryGameResultListCreateView, StroopGameResultListCreateView,LongestNumberGameResultListCreateView,NumpuzGameResultListCreateView,numpuz_stats_view,longest_number_stats_view,AdditionsGameResultListCreateView,additions_stats_view,dashboard_stats_view,export_all_game_data_csv,AdminGameDataExportView,research_export_view,GameHistoryView,game_history_buckets_view,GameResultBatchView,leaderboard_view,cognitive_trends_view
 urlpatterns = [
     # The view is a Class-Based View, so we call .as_view()
     path('reaction-time/', ReactionTimeResultListCreateView.as_view(), name='reaction-time-results'),
@@ -9,11 +9,18 @@ urlpatterns = [
     path('longest-number/', LongestNumberGameResultListCreateView.as_view(), name='longest-number-list-create'),
     path('longest-number-stats/', longest_number_stats_view, name='longest-number-stats'),
     path('export-all-data/', export_all_game_data_csv, name='export-all-game-data-csv'),
+    path('research-export/', research_export_view, name='research-export'),
     path('numpuz-game/', NumpuzGameResultListCreateView.as_view(), name='numpuz-game-list-create'),
     path('numpuz-stats/', numpuz_stats_view, name='numpuz-stats'),
     path('additions-game/', AdditionsGameResultListCreateView.as_view(), name='additions-game-list-create'),
     path('additions-stats/', additions_stats_view, name='additions-stats'),
     path('dashboard-stats/', dashboard_stats_view, name='dashboard-stats'),
+    path('results/batch/', GameResultBatchView.as_view(), name='game-results-batch'),
+    path('leaderboards/<slug:game>/', leaderboard_view, name='game-leaderboard'),
+    path('analytics/', cognitive_trends_view, name='cognitive-trends'),
+    path('analytics/<int:patient_id>/', cognitive_trends_view, name='patient-cognitive-trends'),
+    path('history/<slug:game>/', GameHistoryView.as_view(), name='game-history'),
+    path('history/<slug:game>/buckets/', game_history_buckets_view, name='game-history-buckets'),
     
     path('export-csv/', AdminGameDataExportView.as_view(), name='export-game-csv'),
 
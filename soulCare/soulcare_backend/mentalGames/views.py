@@ -2,18 +2,32 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes # New Imports
 from rest_framework.response import Response
-from django.http import HttpResponse # New Import for CSV response
-import csv # New Import
-import io
-from django.db.models import Max, Avg, Count, Sum, Min
+from django.db import transaction
+from soulcare_backend.streaming import streaming_csv_response, wants_gzip
 from .models import ReactionTimeResult, MemoryGameResult, StroopGameResult,AdditionsGameResult,LongestNumberGameResult,NumpuzGameResult
-from .serializers import ReactionTimeResultSerializer, MemoryGameResultSerializer, StroopGameResultSerializer,LongestNumberGameResultSerializer,NumpuzGameResultSerializer,AdditionsGameResultSerializer
+from .serializers import ReactionTimeResultSerializer, MemoryGameResultSerializer, StroopGameResultSerializer,LongestNumberGameResultSerializer,NumpuzGameResultSerializer,AdditionsGameResultSerializer,GAME_RESULT_SERIALIZERS
+from .exports import (
+    GAME_SOURCES, MATRIX_HEADER, parse_export_filters, matrix_rows, game_rows, admin_headers,
+)
+from .research import parse_watermark, research_export_response
+from .history import (
+    GameHistoryPagination, game_source, recent_results, parse_bucket_params, bucket_aggregates,
+)
+from .ingest import GameResultBatchSerializer, ingest_results
+from .analytics import ANALYTICS_METRICS, ROLLING_WINDOW, cognitive_report
+from .leaderboards import PERIODS, TOP_LIMIT, LeaderboardUnavailable, get_leaderboard
+from .summaries import (
+    record_game_result, get_user_summary, get_user_summaries, summary_stat, summary_average,
+)
 from authapp.permissions import IsAdminOrCounselor
 
 
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAdminUser
 from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied
+from django.contrib.auth import get_user_model
+from appointments.models import Appointment
 
 
 class ReactionTimeResultListCreateView(generics.ListCreateAPIView):
@@ -28,7 +42,9 @@ class ReactionTimeResultListCreateView(generics.ListCreateAPIView):
 
     # For POST requests: automatically attach the logged-in user
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 class MemoryGameResultListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
@@ -40,7 +56,9 @@ class MemoryGameResultListCreateView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         # Automatically set the 'user' field to the logged-in user before saving
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 
 class StroopGameResultListCreateView(generics.ListCreateAPIView):
@@ -53,7 +71,9 @@ class StroopGameResultListCreateView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         # Automatically set the 'user' field to the logged-in user before saving
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 
 # --- New Admin Export View (Function-Based) ---
@@ -62,81 +82,47 @@ class StroopGameResultListCreateView(generics.ListCreateAPIView):
 @permission_classes([IsAdminOrCounselor]) # Enforce Admin/Counselor only
 def export_all_game_data_csv(request):
     """
-    Exports all game results (Reaction Time, Memory, Stroop) as a single CSV.
+    Exports all game results (Reaction Time, Memory, Stroop) as a single CSV,
+    streamed in created_at order.
+
+    Optional query params: start / end (ISO date or datetime), user (user id),
+    compress=gzip.
     """
-    # 1. Setup CSV Response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="soulcare_game_matrix.csv"'
-    writer = csv.writer(response)
-
-    # 2. Define universal header fields for the matrix
-    # The header includes common fields and game-specific fields
-    header = [
-        'user_id', 'username', 'game_type', 'created_at',
-        # Universal Matrix Fields
-        'post_game_mood', 'perceived_effort', 'stress_reduction_rating',
-        # Core Score Fields (Game-Specific)
-        'rt_ms', 'max_sequence_length', 'total_correct', 'interference_score_ms',
-    ]
-    writer.writerow(header)
-
-    # 3. Fetch and Write Data
-    all_models_data = []
-
-    # Reaction Time Data
-    for result in ReactionTimeResult.objects.all().select_related('user'):
-        all_models_data.append({
-            'user_id': result.user.id,
-            'username': result.user.username,
-            'game_type': 'reaction_time',
-            'created_at': result.created_at.isoformat(),
-            'post_game_mood': result.post_game_mood,
-            'perceived_effort': result.perceived_effort,
-            'stress_reduction_rating': result.stress_reduction_rating,
-            'rt_ms': result.reaction_time_ms,
-            'max_sequence_length': '',
-            'total_correct': '',
-            'interference_score_ms': '',
-        })
-
-    # Memory Game Data
-    for result in MemoryGameResult.objects.all().select_related('user'):
-        all_models_data.append({
-            'user_id': result.user.id,
-            'username': result.user.username,
-            'game_type': 'memory_game',
-            'created_at': result.created_at.isoformat(),
-            'post_game_mood': result.post_game_mood,
-            'perceived_effort': result.perceived_effort,
-            'stress_reduction_rating': result.stress_reduction_rating,
-            'rt_ms': '',
-            'max_sequence_length': result.max_sequence_length,
-            'total_correct': '',
-            'interference_score_ms': '',
-        })
-
-    # Stroop Game Data
-    for result in StroopGameResult.objects.all().select_related('user'):
-        all_models_data.append({
-            'user_id': result.user.id,
-            'username': result.user.username,
-            'game_type': 'stroop_test',
-            'created_at': result.created_at.isoformat(),
-            'post_game_mood': result.post_game_mood,
-            'perceived_effort': result.perceived_effort,
-            'stress_reduction_rating': result.stress_reduction_rating,
-            'rt_ms': '',
-            'max_sequence_length': '',
-            'total_correct': result.total_correct,
-            'interference_score_ms': result.interference_score_ms,
-        })
-
-    # Write all data rows
-    for row_data in all_models_data:
-        row = [row_data.get(field, '') for field in header] # Get data, use empty string if missing
-        writer.writerow(row)
-
-    return response
+    try:
+        filters = parse_export_filters(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return streaming_csv_response(
+        'soulcare_game_matrix.csv',
+        MATRIX_HEADER,
+        matrix_rows(filters),
+        compress=wants_gzip(request.query_params),
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrCounselor])
+def research_export_view(request):
+    """
+    Exports the unified game-session matrix (all six games) for analysis tools.
+
+    Query params: export_format=ndjson|arrow|parquet (default ndjson; DRF
+    reserves `format`), since=<watermark>
+    from a previous pull's X-Export-Watermark header, plus the same start / end /
+    user / compress filters as the CSV export. Incremental pulls overlap the
+    previous one; de-duplicate on (game_type, result_id).
+    """
+    try:
+        filters = parse_export_filters(request.query_params)
+        since = parse_watermark(request.query_params.get('since'))
+        return research_export_response(
+            request.query_params.get('export_format', 'ndjson'),
+            filters=filters,
+            since=since,
+            compress=wants_gzip(request.query_params),
+        )
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
 class LongestNumberGameResultListCreateView(generics.ListCreateAPIView):
     # Only authenticated users can access this endpoint
@@ -149,7 +135,9 @@ class LongestNumberGameResultListCreateView(generics.ListCreateAPIView):
 
     # For POST requests: automatically attach the logged-in user
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 
 
@@ -157,21 +145,26 @@ class LongestNumberGameResultListCreateView(generics.ListCreateAPIView):
 @permission_classes([IsAuthenticated])
 def longest_number_stats_view(request):
     """
-    Fetches the current user's highest score, average score, total plays, and a brief history
-    for the Longest Number Game.
+    Fetches the current user's highest score, average score, total plays, the most recent
+    results and daily/weekly trend buckets for the Longest Number Game.
+    Older results are paged through history/longest-number/.
     """
-    user_results = LongestNumberGameResult.objects.filter(user=request.user)
-
-    # 1. Calculate Aggregate Stats
-    aggregates = user_results.aggregate(
-        max_score=Max('max_number_length'),
-        avg_score=Avg('max_number_length'),
-        total_plays=Count('id'),
-        total_time_ms=Sum('total_reaction_time_ms') # <--- ADDED
-    )
+    try:
+        bucket, window_days = parse_bucket_params(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 1. Aggregate Stats (one read of the precomputed GameSummary row)
+    summary = get_user_summary(request.user, 'longest_number')
+    aggregates = {
+        'max_score': summary_stat(summary, 'score_max', int),
+        'avg_score': summary_average(summary),
+        'total_plays': summary_stat(summary, 'plays') or 0,
+        'total_time_ms': summary_stat(summary, 'time_ms_sum', int),
+    }
 
-    # 2. Get Recent History (e.g., last 15 results, or all if we can)
-    history_data = user_results.order_by('-created_at').values('max_number_length', 'total_reaction_time_ms', 'created_at')
+    # 2. Get Recent History (last HISTORY_LIMIT results)
+    history_data = recent_results(LongestNumberGameResult, request.user).values('max_number_length', 'total_reaction_time_ms', 'created_at')
 
     # Format the history data for the frontend
     formatted_history = [
@@ -189,6 +182,8 @@ def longest_number_stats_view(request):
         'total_plays': aggregates['total_plays'],
         'total_time_ms': aggregates['total_time_ms'] if aggregates['total_time_ms'] is not None else 0, # NEW
         'history': formatted_history,
+        'history_has_more': aggregates['total_plays'] > len(formatted_history),
+        'buckets': bucket_aggregates('longest_number', request.user, bucket, window_days),
     }
 
     return Response(stats)
@@ -204,24 +199,32 @@ class NumpuzGameResultListCreateView(generics.ListCreateAPIView):
 
     # For POST requests: automatically attach the logged-in user
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def numpuz_stats_view(request):
     """
-    Fetches the current user's best time, minimum moves, and total plays
-    for the Numpuz Game.
+    Fetches the current user's best time, minimum moves, total plays, best results
+    and daily/weekly trend buckets for the Numpuz Game.
     """
+    try:
+        bucket, window_days = parse_bucket_params(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
     user_results = NumpuzGameResult.objects.filter(user=request.user)
 
-    # 1. Calculate Aggregate Stats
-    aggregates = user_results.aggregate(
-        best_time=Min('time_taken_s'), # Min time is the best score
-        min_moves=Min('moves_made'), # Min moves is also a key metric
-        total_plays=Count('id')
-    )
+    # 1. Aggregate Stats (one read of the precomputed GameSummary row)
+    summary = get_user_summary(request.user, 'numpuz_game')
+    aggregates = {
+        'best_time': summary_stat(summary, 'score_min'), # Min time is the best score
+        'min_moves': summary_stat(summary, 'metric_min', int), # Min moves is also a key metric
+        'total_plays': summary_stat(summary, 'plays') or 0,
+    }
 
     # 2. Get Recent History (e.g., last 10 results, sorted by best time)
     history_data = user_results.order_by('time_taken_s')[:10].values('time_taken_s', 'moves_made', 'puzzle_size', 'created_at')
@@ -242,6 +245,7 @@ def numpuz_stats_view(request):
         'min_moves': aggregates['min_moves'] or 0,
         'total_plays': aggregates['total_plays'],
         'history': formatted_history,
+        'buckets': bucket_aggregates('numpuz_game', request.user, bucket, window_days),
     }
 
     return Response(stats)
@@ -257,24 +261,32 @@ class AdditionsGameResultListCreateView(generics.ListCreateAPIView):
 
     # For POST requests: automatically attach the logged-in user
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            result = serializer.save(user=self.request.user)
+            record_game_result(result)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def additions_stats_view(request):
     """
-    Fetches the current user's highest correct score, average correct score, and total plays
-    for the Additions Game.
+    Fetches the current user's highest correct score, average correct score, total plays,
+    best results and daily/weekly trend buckets for the Additions Game.
     """
+    try:
+        bucket, window_days = parse_bucket_params(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
     user_results = AdditionsGameResult.objects.filter(user=request.user)
 
-    # 1. Calculate Aggregate Stats
-    aggregates = user_results.aggregate(
-        highest_correct=Max('total_correct'),
-        avg_correct=Avg('total_correct'),
-        total_plays=Count('id')
-    )
+    # 1. Aggregate Stats (one read of the precomputed GameSummary row)
+    summary = get_user_summary(request.user, 'additions_game')
+    aggregates = {
+        'highest_correct': summary_stat(summary, 'score_max', int),
+        'avg_correct': summary_average(summary),
+        'total_plays': summary_stat(summary, 'plays') or 0,
+    }
 
     # 2. Get Recent History (e.g., last 10 results, sorted by highest correct DESC)
     history_data = user_results.order_by('-total_correct', 'time_taken_s')[:10].values('total_correct', 'time_taken_s', 'difficulty_level', 'created_at')
@@ -295,19 +307,149 @@ def additions_stats_view(request):
         'avg_correct': round(aggregates['avg_correct'] or 0, 1),
         'total_plays': aggregates['total_plays'],
         'history': formatted_history,
+        'buckets': bucket_aggregates('additions_game', request.user, bucket, window_days),
     }
 
     return Response(stats)
 
 
+# --- Shared Game History API ---
+
+class GameHistoryView(generics.ListAPIView):
+    """
+    Newest-first, cursor-paginated raw results of one game for the current user.
+    ?limit= sets the page size (max 200).
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = GameHistoryPagination
+
+    def get_source(self):
+        source = game_source(self.kwargs['game'])
+        if source is None:
+            raise NotFound("Unknown game.")
+        return source
+
+    def get_serializer_class(self):
+        return GAME_RESULT_SERIALIZERS[self.get_source().slug]
+
+    def get_queryset(self):
+        return self.get_source().model.objects.filter(user=self.request.user)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def game_history_buckets_view(request, game):
+    """
+    Daily or weekly best/average/plays for one game, aggregated in SQL.
+    Query params: bucket=day|week, window=<days>.
+    """
+    source = game_source(game)
+    if source is None:
+        return Response({"error": "Unknown game."}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        bucket, window_days = parse_bucket_params(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'game': source.slug,
+        'bucket': bucket,
+        'window_days': window_days,
+        'buckets': bucket_aggregates(source.game_type, request.user, bucket, window_days),
+    })
+
+
+class GameResultBatchView(APIView):
+    """
+    Stores a batch of results from several games in one request (offline sync).
+
+    Body: {"results": [{"game": "reaction-time", "client_id": "<uuid>", "played_at": "<iso datetime>", ...fields}, ...]}.
+    Re-sending the same client_id is a no-op, so a failed upload can simply be retried.
+    played_at is optional (default: upload time) and at most 30 days old.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = GameResultBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = ingest_results(request.user, serializer.validated_data['results'])
+        created = sum(1 for result in results if result['status'] == 'created')
+        return Response(
+            {'created': created, 'duplicates': len(results) - created, 'results': results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_view(request, game):
+    """
+    Top players of one game plus the current user's rank and percentile.
+    Query params: period=all|week|month (default all), limit (max 100).
+    """
+    source = game_source(game)
+    if source is None:
+        return Response({"error": "Unknown game."}, status=status.HTTP_404_NOT_FOUND)
+
+    period = request.query_params.get('period', 'all')
+    if period not in PERIODS:
+        return Response({"error": f"period must be one of: {', '.join(PERIODS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.query_params.get('limit', TOP_LIMIT)), 1), TOP_LIMIT)
+    except ValueError:
+        return Response({"error": "limit must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        board = get_leaderboard(source.game_type, request.user, period, limit)
+    except LeaderboardUnavailable:
+        return Response({"error": "Leaderboards are temporarily unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(board)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cognitive_trends_view(request, patient_id=None):
+    """
+    Rolling means, linear trends, population z-scores and mood/stress
+    correlations for each cognitive metric. Patients see their own report;
+    doctors and counselors see patients they have appointment history with.
+    Query params: metric (repeatable, default all), window (rolling window size).
+    """
+    user = request.user
+    if patient_id is None or patient_id == user.id:
+        patient_id = user.id
+    elif user.role != 'admin':
+        if user.role not in ['doctor', 'counselor']:
+            raise PermissionDenied("You do not have permission to view patient details.")
+        if not Appointment.objects.filter(provider=user, patient_id=patient_id).exists():
+            raise PermissionDenied("You do not have appointment history with this patient.")
+    if not get_user_model().objects.filter(id=patient_id).exists():
+        raise NotFound("Patient not found.")
+
+    metrics = request.query_params.getlist('metric') or None
+    unknown = [metric for metric in metrics or [] if metric not in ANALYTICS_METRICS]
+    if unknown:
+        return Response({"error": f"metric must be one of: {', '.join(ANALYTICS_METRICS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        window = int(request.query_params.get('window', ROLLING_WINDOW))
+    except ValueError:
+        return Response({"error": "window must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= window <= 50:
+        return Response({"error": "window must be between 1 and 50."}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(cognitive_report(patient_id, metrics, window))
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats_view(request):
     """
     Fetches aggregate statistics for the patient's games dashboard.
-    This view performs all necessary aggregations across all game models.
+    All per-game aggregates come from the user's GameSummary rows (one query).
     """
     user = request.user
+    summaries = get_user_summaries(user)
 
     # 1. Initialize result structure matching the GameDashboardStats interface
     stats_data = {
@@ -336,12 +478,12 @@ def dashboard_stats_view(request):
     average_scores = []
 
     # --- 2. Reaction Time Stats ---
-    rt_results = ReactionTimeResult.objects.filter(user=user)
-    rt_agg = rt_results.aggregate(
-        best_time=Min('reaction_time_ms'),
-        count=Count('id'),
-        time_sum=Sum('reaction_time_ms')
-    )
+    rt_summary = summaries.get('reaction_time')
+    rt_agg = {
+        'best_time': summary_stat(rt_summary, 'score_min', int),
+        'count': summary_stat(rt_summary, 'plays') or 0,
+        'time_sum': summary_stat(rt_summary, 'time_ms_sum', int),
+    }
     if rt_agg['count'] > 0:
         best_time = rt_agg['best_time']
         stats_data['summary']['reaction_time']['best_time_ms'] = best_time
@@ -353,11 +495,11 @@ def dashboard_stats_view(request):
         # Let's use a normalized score (e.g., 100 - min_ms / 10). For now, we omit it from overall average.
 
     # --- 3. Memory Game Stats ---
-    mem_results = MemoryGameResult.objects.filter(user=user)
-    mem_agg = mem_results.aggregate(
-        max_length=Max('max_sequence_length'),
-        count=Count('id')
-    )
+    mem_summary = summaries.get('memory_game')
+    mem_agg = {
+        'max_length': summary_stat(mem_summary, 'score_max', int),
+        'count': summary_stat(mem_summary, 'plays') or 0,
+    }
     if mem_agg['count'] > 0:
         max_length = mem_agg['max_length']
         stats_data['summary']['memory_game']['max_sequence_length'] = max_length
@@ -370,13 +512,13 @@ def dashboard_stats_view(request):
 
 
     # --- 4. Stroop Game Stats ---
-    stroop_results = StroopGameResult.objects.filter(user=user)
-    stroop_agg = stroop_results.aggregate(
-        best_total_correct=Max('total_correct'),
-        avg_interference=Avg('interference_score_ms'),
-        count=Count('id'),
-        total_time_s_sum=Sum('total_time_s')
-    )
+    stroop_summary = summaries.get('stroop_test')
+    stroop_agg = {
+        'best_total_correct': summary_stat(stroop_summary, 'score_max', int),
+        'avg_interference': summary_average(stroop_summary, 'metric_sum'),
+        'count': summary_stat(stroop_summary, 'plays') or 0,
+        'total_time_s_sum': (summary_stat(stroop_summary, 'time_ms_sum') or 0) / 1000,
+    }
     if stroop_agg['count'] > 0:
         total_plays = stroop_agg['count']
         best_correct = stroop_agg['best_total_correct']
@@ -397,12 +539,12 @@ def dashboard_stats_view(request):
 
 
     # --- 5. Longest Number Stats ---
-    ln_results = LongestNumberGameResult.objects.filter(user=user)
-    ln_agg = ln_results.aggregate(
-        max_length=Max('max_number_length'),
-        count=Count('id'),
-        time_sum=Sum('total_reaction_time_ms')
-    )
+    ln_summary = summaries.get('longest_number')
+    ln_agg = {
+        'max_length': summary_stat(ln_summary, 'score_max', int),
+        'count': summary_stat(ln_summary, 'plays') or 0,
+        'time_sum': summary_stat(ln_summary, 'time_ms_sum', int),
+    }
     if ln_agg['count'] > 0:
         max_length = ln_agg['max_length']
         stats_data['summary']['longest_number']['max_number_length'] = max_length
@@ -416,13 +558,13 @@ def dashboard_stats_view(request):
 
 
     # --- 6. Numpuz Game Stats ---
-    npz_results = NumpuzGameResult.objects.filter(user=user)
-    npz_agg = npz_results.aggregate(
-        best_time=Min('time_taken_s'),
-        min_moves=Min('moves_made'),
-        count=Count('id'),
-        time_sum=Sum('time_taken_s')
-    )
+    npz_summary = summaries.get('numpuz_game')
+    npz_agg = {
+        'best_time': summary_stat(npz_summary, 'score_min'),
+        'min_moves': summary_stat(npz_summary, 'metric_min', int),
+        'count': summary_stat(npz_summary, 'plays') or 0,
+        'time_sum': (summary_stat(npz_summary, 'time_ms_sum') or 0) / 1000,
+    }
     if npz_agg['count'] > 0:
         stats_data['summary']['numpuz_game']['best_time_s'] = round(npz_agg['best_time'], 2) if npz_agg['best_time'] is not None else None
         stats_data['summary']['numpuz_game']['min_moves'] = npz_agg['min_moves']
@@ -434,13 +576,13 @@ def dashboard_stats_view(request):
 
 
     # --- 7. Additions Game Stats ---
-    add_results = AdditionsGameResult.objects.filter(user=user)
-    add_agg = add_results.aggregate(
-        highest_correct=Max('total_correct'),
-        avg_correct=Avg('total_correct'),
-        count=Count('id'),
-        time_sum=Sum('time_taken_s')
-    )
+    add_summary = summaries.get('additions_game')
+    add_agg = {
+        'highest_correct': summary_stat(add_summary, 'score_max', int),
+        'avg_correct': summary_average(add_summary),
+        'count': summary_stat(add_summary, 'plays') or 0,
+        'time_sum': (summary_stat(add_summary, 'time_ms_sum') or 0) / 1000,
+    }
     if add_agg['count'] > 0:
         highest_correct = add_agg['highest_correct']
         stats_data['summary']['additions_game']['highest_correct'] = highest_correct
@@ -478,100 +620,19 @@ class AdminGameDataExportView(APIView):
         if not game_type:
             return Response({"error": "Game type is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        response = HttpResponse(content_type='text/csv')
-        filename = f"{game_type}_data.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        writer = csv.writer(response)
-
-        if game_type == 'reaction-time':
-            writer.writerow(['User', 'Date', 'Reaction Time (ms)', 'Mood', 'Effort', 'Calmness'])
-            results = ReactionTimeResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.reaction_time_ms, 
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-
-        elif game_type == 'memory-game':
-            writer.writerow(['User', 'Date', 'Max Sequence', 'Attempts', 'Mood', 'Effort', 'Calmness'])
-            results = MemoryGameResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.max_sequence_length, 
-                    r.total_attempts,
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-
-        elif game_type == 'stroop-game':
-            writer.writerow(['User', 'Date', 'Correct', 'Interference (ms)', 'Time (s)', 'Mood', 'Effort', 'Calmness'])
-            results = StroopGameResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.total_correct, 
-                    r.interference_score_ms,
-                    r.total_time_s,
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-        
-        elif game_type == 'longest-number':
-            writer.writerow(['User', 'Date', 'Max Digits', 'Reaction Time (ms)', 'Attempts', 'Mood', 'Effort', 'Calmness'])
-            results = LongestNumberGameResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.max_number_length,
-                    r.total_reaction_time_ms,
-                    r.total_attempts,
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-
-        elif game_type == 'numpuz-game':
-            writer.writerow(['User', 'Date', 'Time (s)', 'Size', 'Moves', 'Mood', 'Effort', 'Calmness'])
-            results = NumpuzGameResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.time_taken_s,
-                    r.puzzle_size,
-                    r.moves_made,
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-
-        elif game_type == 'additions-game':
-            writer.writerow(['User', 'Date', 'Correct', 'Time (s)', 'Difficulty', 'Mood', 'Effort', 'Calmness'])
-            results = AdditionsGameResult.objects.select_related('user').all().order_by('-created_at')
-            for r in results:
-                writer.writerow([
-                    r.user.username, 
-                    r.created_at.strftime("%Y-%m-%d %H:%M"), 
-                    r.total_correct,
-                    r.time_taken_s,
-                    r.difficulty_level,
-                    r.get_post_game_mood_display(), 
-                    r.perceived_effort, 
-                    r.stress_reduction_rating
-                ])
-
-        else:
+        source = GAME_SOURCES.get(game_type)
+        if source is None:
             return Response({"error": "Invalid game type."}, status=status.HTTP_400_BAD_REQUEST)
 
-        return response
\ No newline at end of file
+        try:
+            filters = parse_export_filters(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Newest first, streamed page by page
+        return streaming_csv_response(
+            f"{game_type}_data.csv",
+            admin_headers(source),
+            game_rows(source, filters, descending=True),
+            compress=wants_gzip(request.query_params),
+        )
@@ -0,0 +1,294 @@
+# soulcare_backend/moodtracker/analytics.py
+
+"""
+Mood analytics over arbitrary ranges. Every statistic (means, standard
+deviations, correlations, volatility) comes from the running sums in
+MoodStats, filled from MoodEntry rows for daily/weekly buckets or by adding
+up MoodMonthlyRollup rows for monthly buckets, so a multi-year range costs
+one small query.
+"""
+
+import math
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from .models import MoodEntry, MoodMonthlyRollup
+
+GRANULARITIES = ('daily', 'weekly', 'monthly')
+MAX_RANGE_DAYS = 5 * 366
+# Longer ranges default to monthly buckets, served from the rollups
+DAILY_MAX_DAYS = 92
+DEFAULT_WINDOWS = {'daily': 7, 'weekly': 4, 'monthly': 3}
+# Fewer entries than this gives no correlation
+MIN_CORRELATION_ENTRIES = 3
+
+SCALES = ('mood', 'energy', 'anxiety')
+PAIRS = (('mood', 'energy'), ('mood', 'anxiety'), ('energy', 'anxiety'))
+
+BREAKDOWN_RELATIONS = ('activities', 'tags')
+
+
+class MoodStats:
+    """Sums, squares and cross-products of the three scales; merge with `+=`."""
+    FIELDS = (
+        ['entries']
+        + [f'{scale}_sum' for scale in SCALES]
+        + [f'{scale}_sq_sum' for scale in SCALES]
+        + [f'{a}_{b}_sum' for a, b in PAIRS]
+        + ['mood_ssd', 'mood_ssd_count']
+    )
+
+    def __init__(self, **sums):
+        for field in self.FIELDS:
+            setattr(self, field, sums.get(field, 0))
+
+    @classmethod
+    def from_entries(cls, entries, previous=None):
+        """
+        `entries` are (date, mood, energy, anxiety) tuples in date order;
+        `previous` is the (date, mood) just before them, for volatility.
+        """
+        stats = cls()
+        for day, mood, energy, anxiety in entries:
+            stats.add(mood, energy, anxiety)
+            if previous is not None and (day - previous[0]).days == 1:
+                stats.mood_ssd += (mood - previous[1]) ** 2
+                stats.mood_ssd_count += 1
+            previous = (day, mood)
+        return stats
+
+    @classmethod
+    def from_rollup(cls, rollup):
+        return cls(**{field: getattr(rollup, field) for field in cls.FIELDS})
+
+    def add(self, mood, energy, anxiety):
+        values = {'mood': mood, 'energy': energy, 'anxiety': anxiety}
+        self.entries += 1
+        for scale, value in values.items():
+            setattr(self, f'{scale}_sum', getattr(self, f'{scale}_sum') + value)
+            setattr(self, f'{scale}_sq_sum', getattr(self, f'{scale}_sq_sum') + value * value)
+        for a, b in PAIRS:
+            setattr(self, f'{a}_{b}_sum', getattr(self, f'{a}_{b}_sum') + values[a] * values[b])
+
+    def __iadd__(self, other):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+
+    def mean(self, scale):
+        return getattr(self, f'{scale}_sum') / self.entries if self.entries else None
+
+    def std(self, scale):
+        if not self.entries:
+            return None
+        variance = getattr(self, f'{scale}_sq_sum') / self.entries - self.mean(scale) ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def correlation(self, a, b):
+        """Pearson r between two scales, None when undefined."""
+        if self.entries < MIN_CORRELATION_ENTRIES:
+            return None
+        spread = self.std(a) * self.std(b)
+        if not spread:
+            return None
+        covariance = getattr(self, f'{a}_{b}_sum') / self.entries - self.mean(a) * self.mean(b)
+        return covariance / spread
+
+    def volatility(self):
+        """Root mean square of mood changes between consecutive days (RMSSD)."""
+        return math.sqrt(self.mood_ssd / self.mood_ssd_count) if self.mood_ssd_count else None
+
+    def means(self):
+        return {scale: _round(self.mean(scale)) for scale in SCALES}
+
+    def summary(self):
+        return {
+            'entries': self.entries,
+            **{scale: {'mean': _round(self.mean(scale)), 'std': _round(self.std(scale))} for scale in SCALES},
+            'volatility': _round(self.volatility()),
+            'correlations': {f'{a}_{b}': _round(self.correlation(a, b), 3) for a, b in PAIRS},
+        }
+
+
+def _round(value, digits=2):
+    return round(value, digits) if value is not None else None
+
+
+# --- BUCKETS ---
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    return (month_start(day) + timedelta(days=32)).replace(day=1)
+
+
+def bucket_start(day, granularity):
+    if granularity == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'monthly':
+        return month_start(day)
+    return day
+
+
+def _next_bucket(day, granularity):
+    if granularity == 'weekly':
+        return day + timedelta(weeks=1)
+    if granularity == 'monthly':
+        return next_month(day)
+    return day + timedelta(days=1)
+
+
+def bucket_starts(start, end, granularity):
+    day = bucket_start(start, granularity)
+    while day <= end:
+        yield day
+        day = _next_bucket(day, granularity)
+
+
+def rolling(buckets, window):
+    """Trailing means over `window` buckets (empty buckets add nothing)."""
+    points = []
+    for position, (period, _) in enumerate(buckets):
+        combined = MoodStats()
+        for _, stats in buckets[max(0, position - window + 1):position + 1]:
+            combined += stats
+        points.append({'period': period.isoformat(), 'entries': combined.entries, **combined.means()})
+    return points
+
+
+# --- ROLLUPS ---
+
+def refresh_month(patient_id, month):
+    """Recomputes one patient's rollup for the month containing `month`."""
+    month = month_start(month)
+    rows = list(
+        MoodEntry.objects.filter(patient_id=patient_id, date__range=[month - timedelta(days=1), next_month(month) - timedelta(days=1)])
+        .order_by('date').values_list('date', 'mood', 'energy', 'anxiety')
+    )
+    previous = None
+    if rows and rows[0][0] < month:
+        previous = (rows[0][0], rows[0][1])
+        rows = rows[1:]
+    if not rows:
+        MoodMonthlyRollup.objects.filter(patient_id=patient_id, month=month).delete()
+        return
+    stats = MoodStats.from_entries(rows, previous)
+    MoodMonthlyRollup.objects.update_or_create(
+        patient_id=patient_id, month=month,
+        defaults={field: getattr(stats, field) for field in MoodStats.FIELDS},
+    )
+
+
+def refresh_entry_date(patient_id, day):
+    """
+    Refreshes the rollups an entry on `day` feeds: its month, and the next
+    month when it is the last day (its volatility starts from that entry).
+    """
+    refresh_month(patient_id, day)
+    if (day + timedelta(days=1)).month != day.month:
+        refresh_month(patient_id, day + timedelta(days=1))
+
+
+def rebuild_rollups(patient_ids=None):
+    """
+    Rebuilds the monthly rollups of `patient_ids` (default: everyone) from
+    their entries in one ordered scan. Returns the number of rollups written.
+    """
+    entries = MoodEntry.objects.all()
+    rollups = MoodMonthlyRollup.objects.all()
+    if patient_ids is not None:
+        entries = entries.filter(patient_id__in=list(patient_ids))
+        rollups = rollups.filter(patient_id__in=list(patient_ids))
+
+    months = {}
+    previous = {}
+    rows = entries.order_by('patient_id', 'date').values_list('patient_id', 'date', 'mood', 'energy', 'anxiety')
+    for patient_id, day, mood, energy, anxiety in rows.iterator(chunk_size=5000):
+        key = (patient_id, month_start(day))
+        stats = months.setdefault(key, MoodStats())
+        stats += MoodStats.from_entries([(day, mood, energy, anxiety)], previous.get(patient_id))
+        previous[patient_id] = (day, mood)
+
+    with transaction.atomic():
+        rollups.delete()
+        MoodMonthlyRollup.objects.bulk_create([
+            MoodMonthlyRollup(patient_id=patient_id, month=month, **{field: getattr(stats, field) for field in MoodStats.FIELDS})
+            for (patient_id, month), stats in months.items()
+        ], batch_size=2000)
+    return len(months)
+
+
+# --- ANALYTICS ---
+
+def breakdown(user, start, end, relation):
+    """
+    Entry count and mean scales per activity or tag ('activities' or 'tags')
+    in one grouped query over the M2M through table.
+    """
+    field = MoodEntry._meta.get_field(relation)
+    entry, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    rows = (
+        field.remote_field.through.objects
+        .filter(**{f'{entry}__patient': user, f'{entry}__date__range': [start, end]})
+        .values(f'{target}__name')
+        .annotate(
+            entries=Count(entry),
+            **{scale: Avg(f'{entry}__{scale}') for scale in SCALES},
+        )
+        .order_by('-entries', f'{target}__name')
+    )
+    return [
+        {'name': row[f'{target}__name'], 'entries': row['entries'], **{scale: _round(row[scale]) for scale in SCALES}}
+        for row in rows
+    ]
+
+
+def mood_analytics(user, start, end, granularity=None, window=None):
+    """
+    Bucketed means, trailing rolling means, summary statistics and the
+    activity/tag breakdown for `start`..`end`. Monthly buckets (the default
+    beyond DAILY_MAX_DAYS) are read from the rollups and cover whole months.
+    """
+    granularity = granularity or ('daily' if (end - start).days < DAILY_MAX_DAYS else 'monthly')
+    window = window or DEFAULT_WINDOWS[granularity]
+
+    if granularity == 'monthly':
+        start, end = month_start(start), next_month(end) - timedelta(days=1)
+        by_bucket = {
+            rollup.month: MoodStats.from_rollup(rollup)
+            for rollup in MoodMonthlyRollup.objects.filter(patient=user, month__range=[start, end])
+        }
+        source = 'rollups'
+    else:
+        rows = (
+            MoodEntry.objects.filter(patient=user, date__range=[start, end])
+            .order_by('date').values_list('date', 'mood', 'energy', 'anxiety')
+        )
+        by_bucket = {}
+        previous = None
+        for day, mood, energy, anxiety in rows:
+            stats = by_bucket.setdefault(bucket_start(day, granularity), MoodStats())
+            stats += MoodStats.from_entries([(day, mood, energy, anxiety)], previous)
+            previous = (day, mood)
+        source = 'entries'
+
+    buckets = [(period, by_bucket.get(period, MoodStats())) for period in bucket_starts(start, end, granularity)]
+    total = MoodStats()
+    for _, stats in buckets:
+        total += stats
+
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'window': window,
+        'source': source,
+        'summary': total.summary(),
+        'series': [{'period': period.isoformat(), 'entries': stats.entries, **stats.means()} for period, stats in buckets],
+        'rolling': rolling(buckets, window),
+        **{relation: breakdown(user, start, end, relation) for relation in BREAKDOWN_RELATIONS},
+    }
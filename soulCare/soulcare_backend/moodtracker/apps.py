@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MoodtrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'moodtracker'
+
+    def ready(self):
+        # Keeps the mood rollups and caches in step with writes
+        from . import signals  # noqa: F401
@@ -0,0 +1,15 @@
+# soulcare_backend/moodtracker/management/commands/rebuild_mood_rollups.py
+
+from django.core.management.base import BaseCommand
+from moodtracker.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the monthly mood rollups behind long-range mood analytics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--patient', type=int, action='append', help='Only rebuild this patient id (repeatable).')
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options['patient'])
+        self.stdout.write(self.style.SUCCESS(f"Mood rollups rebuilt ({written} months)."))
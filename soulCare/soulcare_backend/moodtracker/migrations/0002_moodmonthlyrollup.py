@@ -0,0 +1,79 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# As of this migration; frozen here so later changes to analytics.py don't alter it.
+SCALES = ('mood', 'energy', 'anxiety')
+PAIRS = (('mood', 'energy'), ('mood', 'anxiety'), ('energy', 'anxiety'))
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Monthly sums from every entry in one ordered scan. Mood volatility counts
+    consecutive days, including a month's first day after the last of the
+    month before.
+    """
+    MoodEntry = apps.get_model('moodtracker', 'MoodEntry')
+    MoodMonthlyRollup = apps.get_model('moodtracker', 'MoodMonthlyRollup')
+
+    months = {}
+    previous = {}
+    rows = MoodEntry.objects.order_by('patient_id', 'date').values_list('patient_id', 'date', 'mood', 'energy', 'anxiety')
+    for patient_id, day, mood, energy, anxiety in rows.iterator(chunk_size=5000):
+        sums = months.setdefault((patient_id, day.replace(day=1)), {'entries': 0, 'mood_ssd': 0, 'mood_ssd_count': 0})
+        values = {'mood': mood, 'energy': energy, 'anxiety': anxiety}
+        sums['entries'] += 1
+        for scale in SCALES:
+            sums[f'{scale}_sum'] = sums.get(f'{scale}_sum', 0) + values[scale]
+            sums[f'{scale}_sq_sum'] = sums.get(f'{scale}_sq_sum', 0) + values[scale] ** 2
+        for a, b in PAIRS:
+            sums[f'{a}_{b}_sum'] = sums.get(f'{a}_{b}_sum', 0) + values[a] * values[b]
+        last = previous.get(patient_id)
+        if last is not None and (day - last[0]).days == 1:
+            sums['mood_ssd'] += (mood - last[1]) ** 2
+            sums['mood_ssd_count'] += 1
+        previous[patient_id] = (day, mood)
+
+    MoodMonthlyRollup.objects.bulk_create([
+        MoodMonthlyRollup(patient_id=patient_id, month=month, **sums)
+        for (patient_id, month), sums in months.items()
+    ], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moodtracker', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month.')),
+                ('entries', models.PositiveIntegerField(default=0)),
+                ('mood_sum', models.PositiveIntegerField(default=0)),
+                ('energy_sum', models.PositiveIntegerField(default=0)),
+                ('anxiety_sum', models.PositiveIntegerField(default=0)),
+                ('mood_sq_sum', models.PositiveIntegerField(default=0)),
+                ('energy_sq_sum', models.PositiveIntegerField(default=0)),
+                ('anxiety_sq_sum', models.PositiveIntegerField(default=0)),
+                ('mood_energy_sum', models.PositiveIntegerField(default=0)),
+                ('mood_anxiety_sum', models.PositiveIntegerField(default=0)),
+                ('energy_anxiety_sum', models.PositiveIntegerField(default=0)),
+                ('mood_ssd', models.PositiveIntegerField(default=0)),
+                ('mood_ssd_count', models.PositiveIntegerField(default=0)),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mood_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month'],
+                'unique_together': {('patient', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -33,3 +33,34 @@ class MoodEntry(models.Model):
 
     def __str__(self):
         return f"Mood entry for {self.patient.username} on {self.date}"
+
+
+class MoodMonthlyRollup(models.Model):
+    """
+    Running sums of one patient's entries in one month, enough to combine
+    months into exact means, standard deviations and correlations. Kept up to
+    date on MoodEntry writes (see signals.py); read by the mood analytics for
+    long ranges.
+    """
+    patient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='mood_rollups')
+    month = models.DateField(help_text="First day of the month.")
+    entries = models.PositiveIntegerField(default=0)
+    mood_sum = models.PositiveIntegerField(default=0)
+    energy_sum = models.PositiveIntegerField(default=0)
+    anxiety_sum = models.PositiveIntegerField(default=0)
+    mood_sq_sum = models.PositiveIntegerField(default=0)
+    energy_sq_sum = models.PositiveIntegerField(default=0)
+    anxiety_sq_sum = models.PositiveIntegerField(default=0)
+    mood_energy_sum = models.PositiveIntegerField(default=0)
+    mood_anxiety_sum = models.PositiveIntegerField(default=0)
+    energy_anxiety_sum = models.PositiveIntegerField(default=0)
+    # Squared mood changes between entries on consecutive days, for volatility
+    mood_ssd = models.PositiveIntegerField(default=0)
+    mood_ssd_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('patient', 'month')
+        ordering = ['month']
+
+    def __str__(self):
+        return f"Mood rollup for {self.patient.username}, {self.month:%Y-%m}"
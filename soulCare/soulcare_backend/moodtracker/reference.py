@@ -0,0 +1,68 @@
+# soulcare_backend/moodtracker/reference.py
+
+"""
+The Activity and Tag lists, which rarely change and are fetched on every
+mood-tracker screen. Each process keeps the serialized list in memory
+together with a version number read from the shared cache (Redis, see
+settings.CACHES); writes to either table bump the version (see signals.py),
+so every process reloads on its next request. While the cache is
+unreachable, lists are reloaded every REFERENCE_MAX_AGE instead. The list's
+ETag is a hash of its content, so clients can revalidate with If-None-Match
+and get a 304.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+import redis
+from django.core.cache import cache
+
+from .models import Activity, Tag
+from .serializers import ActivitySerializer, TagSerializer
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_LISTS = {
+    'activities': (Activity, ActivitySerializer),
+    'tags': (Tag, TagSerializer),
+}
+# Reload at least this often even without a version bump (a lost cache key,
+# or an unreachable cache)
+REFERENCE_MAX_AGE = 5 * 60
+
+# name -> (version, loaded at, etag, data)
+_loaded = {}
+
+
+def _version_key(name):
+    return f'mood-reference-version:{name}'
+
+
+def invalidate_reference(name):
+    """Makes every process reload the `name` list on its next request."""
+    _loaded.pop(name, None)
+    try:
+        try:
+            cache.incr(_version_key(name))
+        except ValueError:
+            cache.set(_version_key(name), 1, None)
+    except redis.RedisError:
+        logger.exception("Could not invalidate the %s list", name)
+
+
+def reference_list(name):
+    """(etag, data) for 'activities' or 'tags'; one cache read when unchanged."""
+    loaded = _loaded.get(name)
+    try:
+        version = cache.get(_version_key(name), 0)
+    except redis.RedisError:
+        # Keep what this process has until REFERENCE_MAX_AGE
+        version = loaded[0] if loaded else 0
+    if loaded is None or loaded[0] != version or time.monotonic() - loaded[1] > REFERENCE_MAX_AGE:
+        model, serializer_class = REFERENCE_LISTS[name]
+        data = serializer_class(model.objects.order_by('id'), many=True).data
+        digest = hashlib.md5(json.dumps(data, separators=(',', ':')).encode(), usedforsecurity=False).hexdigest()
+        loaded = _loaded[name] = (version, time.monotonic(), f'"{digest}"', data)
+    return loaded[2], loaded[3]
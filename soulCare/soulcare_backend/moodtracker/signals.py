@@ -0,0 +1,65 @@
+# soulcare_backend/moodtracker/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .analytics import refresh_entry_date
+from .impact import invalidate_impact
+from .models import Activity, MoodEntry, Tag
+from .reference import invalidate_reference
+
+
+@receiver(pre_save, sender=MoodEntry)
+def remember_entry_date(sender, instance, raw=False, **kwargs):
+    # An edit can move the entry to another month; both rollups change
+    instance._previous_date = None
+    if not raw and instance.pk:
+        instance._previous_date = MoodEntry.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=MoodEntry)
+def update_mood_rollup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_entry_date(instance.patient_id, instance.date)
+    previous = getattr(instance, '_previous_date', None)
+    if previous is not None and previous != instance.date:
+        refresh_entry_date(instance.patient_id, previous)
+    invalidate_impact(instance.patient_id)
+
+
+@receiver(post_delete, sender=MoodEntry)
+def remove_from_mood_rollup(sender, instance, **kwargs):
+    refresh_entry_date(instance.patient_id, instance.date)
+    invalidate_impact(instance.patient_id)
+
+
+@receiver(m2m_changed, sender=MoodEntry.activities.through)
+@receiver(m2m_changed, sender=MoodEntry.tags.through)
+def invalidate_mood_impact(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_impact(instance.patient_id)
+        return
+    # Changed from the activity/tag side: the patients of the affected entries
+    # (read before a clear, while the links still exist)
+    if action == 'pre_clear':
+        relation = 'activities' if sender is MoodEntry.activities.through else 'tags'
+        entries = MoodEntry.objects.filter(**{relation: instance})
+    elif action in ('post_add', 'post_remove'):
+        entries = MoodEntry.objects.filter(pk__in=pk_set)
+    else:
+        return
+    for patient_id in entries.values_list('patient_id', flat=True).distinct():
+        invalidate_impact(patient_id)
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def invalidate_activity_list(sender, **kwargs):
+    invalidate_reference('activities')
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_list(sender, **kwargs):
+    invalidate_reference('tags')
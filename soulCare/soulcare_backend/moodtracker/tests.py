@@ -1,3 +1,135 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from authapp.models import User
+from . import impact
+from .analytics import MoodStats, mood_analytics, rebuild_rollups
+from .models import Activity, MoodEntry, MoodMonthlyRollup
+
+# Entry writes bump cache versions (see signals.py); keep them off Redis
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def rollup_rows():
+    return sorted(MoodMonthlyRollup.objects.values_list('patient_id', 'month', *MoodStats.FIELDS))
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class RollupTests(TestCase):
+    """The monthly rollups, kept up to date on writes, always match a full rebuild."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='moody', email='moody@example.com', password='x', role='user')
+
+    def entry(self, day, mood, energy=5, anxiety=5):
+        return MoodEntry.objects.create(patient=self.user, date=day, mood=mood, energy=energy, anxiety=anxiety)
+
+    def assertMatchesRebuild(self):
+        maintained = rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(maintained, rollup_rows())
+
+    def test_summary_from_rollups_matches_entries_over_whole_months(self):
+        # Consecutive days across both month boundaries, so volatility spans rollups
+        day = date(2025, 1, 25)
+        while day <= date(2025, 3, 8):
+            self.entry(day, mood=1 + day.toordinal() * 7 % 10, energy=1 + day.day % 10, anxiety=10 - day.day % 7)
+            day += timedelta(days=2 if day.day % 5 == 0 else 1)
+
+        start, end = date(2025, 1, 1), date(2025, 3, 31)
+        from_rollups = mood_analytics(self.user, start, end, 'monthly')
+        from_entries = mood_analytics(self.user, start, end, 'daily')
+        self.assertEqual((from_rollups['source'], from_entries['source']), ('rollups', 'entries'))
+        self.assertEqual(from_rollups['summary'], from_entries['summary'])
+        self.assertIsNotNone(from_rollups['summary']['volatility'])
+
+    def test_create_edit_move_and_delete(self):
+        entries = [self.entry(day, mood) for day, mood in (
+            (date(2025, 1, 30), 4), (date(2025, 1, 31), 6), (date(2025, 2, 1), 9), (date(2025, 2, 2), 3),
+        )]
+        self.assertEqual(MoodMonthlyRollup.objects.count(), 2)
+        self.assertMatchesRebuild()
+
+        entries[1].mood = 2
+        entries[1].save()
+        self.assertMatchesRebuild()
+
+        # Moving the last day of January away also changes February's volatility
+        entries[1].date = date(2025, 3, 5)
+        entries[1].save()
+        self.assertEqual(MoodMonthlyRollup.objects.count(), 3)
+        self.assertMatchesRebuild()
+
+        entries[2].date = date(2025, 1, 31)
+        entries[2].save()
+        self.assertMatchesRebuild()
+
+        entries[3].delete()
+        entries[1].delete()
+        self.assertEqual(MoodMonthlyRollup.objects.count(), 1)
+        self.assertMatchesRebuild()
+
+
+class CompareTests(SimpleTestCase):
+    """Welch intervals from the sums compute_impact aggregates."""
+
+    def test_known_welch_interval(self):
+        # with: 6..10 (mean 8, variance 2.5); without: 1..7 (mean 4, variance 14/3).
+        # Welch df = 9.966, t(0.975, 9.966) = 2.2292, standard error = 1.0801,
+        # so the interval is 4 -/+ 2.4078 = (1.592, 6.408).
+        result = impact.compare(5, 40, 330, 7, 28, 140)
+        self.assertEqual(result['delta'], 4.0)
+        self.assertAlmostEqual(result['ci_low'], 1.592, delta=0.01)
+        self.assertAlmostEqual(result['ci_high'], 6.408, delta=0.01)
+
+    def test_no_interval_for_small_or_flat_groups(self):
+        self.assertEqual(impact.compare(2, 10, 50, 7, 28, 140), {'delta': 1.0, 'ci_low': None, 'ci_high': None})
+        self.assertEqual(impact.compare(5, 40, 320, 7, 28, 112)['ci_low'], None)
+        self.assertEqual(impact.compare(0, 0, 0, 7, 28, 140)['delta'], None)
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class ImpactCacheTests(TestCase):
+    """Cached impact results are dropped whenever the patient's entries change."""
+
+    def setUp(self):
+        # The local cache outlives each test's rolled-back rows (and reused ids)
+        cache.clear()
+        self.user = User.objects.create_user(username='impact', email='impact@example.com', password='x', role='user')
+        self.walk = Activity.objects.create(name='Walk')
+        self.start, self.end = date(2025, 1, 1), date(2025, 1, 31)
+        for day in range(1, 7):
+            entry = MoodEntry.objects.create(patient=self.user, date=date(2025, 1, day), mood=day, energy=5, anxiety=5)
+            if day % 2:
+                entry.activities.add(self.walk)
+
+    def impact(self):
+        return impact.mood_impact(self.user, self.start, self.end)
+
+    def test_cached_until_an_entry_changes(self):
+        with mock.patch.object(impact, 'compute_impact', wraps=impact.compute_impact) as compute:
+            self.assertEqual(self.impact()['entries'], 6)
+            self.impact()
+            self.assertEqual(compute.call_count, 1)
+
+            entry = MoodEntry.objects.create(patient=self.user, date=date(2025, 1, 7), mood=9, energy=5, anxiety=5)
+            self.assertEqual(self.impact()['entries'], 7)
+            self.assertEqual(compute.call_count, 2)
+
+            entry.activities.add(self.walk)
+            self.assertEqual(self.impact()['activities'][0]['entries'], 4)
+
+            entry.delete()
+            self.assertEqual(self.impact()['entries'], 6)
+            self.assertEqual(compute.call_count, 4)
+
+    def test_other_patients_keep_their_cache(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='x', role='user')
+        with mock.patch.object(impact, 'compute_impact', wraps=impact.compute_impact) as compute:
+            self.impact()
+            MoodEntry.objects.create(patient=other, date=date(2025, 1, 7), mood=9, energy=5, anxiety=5)
+            self.impact()
+            self.assertEqual(compute.call_count, 1)
@@ -0,0 +1,237 @@
+# soulcare_backend/moodtracker/transfer.py
+
+"""
+Bulk import and export of a patient's mood entries, as JSON
+({"entries": [...]}) or CSV with the same columns; in CSV, activities and
+tags are ';'-separated names.
+
+An import upserts on (patient, date), so re-importing a file or an export
+replaces those days' entries (including their activities and tags) rather
+than duplicating them. Bulk writes skip model signals, so the monthly
+rollups and impact cache are refreshed here.
+"""
+
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.db.models import Value
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from soulcare_backend.db import upsert
+from soulcare_backend.streaming import STREAM_BUFFER_SIZE, gzip_chunks, streaming_csv_response
+
+from .analytics import BREAKDOWN_RELATIONS, rebuild_rollups
+from .impact import invalidate_impact
+from .models import Activity, MoodEntry, Tag
+
+# Ten years of daily entries
+MAX_IMPORT_ENTRIES = 10 * 366
+EXPORT_CHUNK_SIZE = 2000
+TRANSFER_FIELDS = ('date', 'mood', 'energy', 'anxiety', 'notes', 'activities', 'tags')
+CSV_LIST_SEPARATOR = ';'
+
+RELATION_MODELS = {'activities': Activity, 'tags': Tag}
+
+
+# --- IMPORT ---
+
+class MoodEntryCSVParser(BaseParser):
+    """text/csv bodies, parsed into the same {"entries": [...]} shape as JSON."""
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            text = stream.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ParseError('CSV must be UTF-8 encoded.')
+        reader = csv.DictReader(io.StringIO(text))
+        missing = {'date', 'mood', 'energy', 'anxiety'} - set(reader.fieldnames or ())
+        if missing:
+            raise ParseError(f"CSV is missing the columns: {', '.join(sorted(missing))}.")
+        entries = []
+        for row in reader:
+            entry = {field: row[field] for field in TRANSFER_FIELDS if field in row}
+            for relation in BREAKDOWN_RELATIONS:
+                names = (entry.get(relation) or '').split(CSV_LIST_SEPARATOR)
+                entry[relation] = [name.strip() for name in names if name.strip()]
+            entries.append(entry)
+        return {'entries': entries}
+
+
+class MoodEntryRowSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    mood = serializers.IntegerField(min_value=1, max_value=10)
+    energy = serializers.IntegerField(min_value=1, max_value=10)
+    anxiety = serializers.IntegerField(min_value=1, max_value=10)
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True, default=None)
+    activities = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+    tags = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+
+
+class MoodEntryImportSerializer(serializers.Serializer):
+    """
+    Validates {"entries": [...]}: one row per date, and activity and tag
+    names that exist, resolved to ids with one query for both. Errors are
+    returned per row index, like a ListSerializer.
+    """
+    entries = MoodEntryRowSerializer(many=True, allow_empty=False, max_length=MAX_IMPORT_ENTRIES)
+
+    def validate_entries(self, rows):
+        names = {relation: {name for row in rows for name in row[relation]} for relation in BREAKDOWN_RELATIONS}
+        first, *rest = [
+            RELATION_MODELS[relation].objects.filter(name__in=names[relation])
+            .values_list(Value(relation), 'name', 'id').order_by()
+            for relation in BREAKDOWN_RELATIONS
+        ]
+        ids = {(relation, name): pk for relation, name, pk in first.union(*rest, all=True)}
+
+        errors = []
+        seen = set()
+        for row in rows:
+            row_errors = {}
+            if row['date'] in seen:
+                row_errors['date'] = ['Duplicate date in this import.']
+            seen.add(row['date'])
+            for relation in BREAKDOWN_RELATIONS:
+                unknown = [name for name in row[relation] if (relation, name) not in ids]
+                if unknown:
+                    row_errors[relation] = [f"Unknown {relation}: {', '.join(unknown)}."]
+                row[relation] = sorted({ids.get((relation, name)) for name in row[relation]} - {None})
+            errors.append(row_errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return rows
+
+
+def _replace_links(entry_ids, rows):
+    """
+    Sets the activities and tags of the upserted entries: per relation, one
+    read of the current links, then only the changed ones are deleted or added.
+    """
+    for relation in BREAKDOWN_RELATIONS:
+        field = MoodEntry._meta.get_field(relation)
+        through = field.remote_field.through
+        entry, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+        wanted = {(entry_ids[row['date']], target_id) for row in rows for target_id in row[relation]}
+        current = {
+            (entry_id, target_id): pk
+            for pk, entry_id, target_id in through.objects.filter(**{f'{entry}__in': list(entry_ids.values())})
+            .values_list('pk', entry, target)
+        }
+        stale = [pk for link, pk in current.items() if link not in wanted]
+        if stale:
+            through.objects.filter(pk__in=stale).delete()
+        through.objects.bulk_create(
+            [through(**{entry: entry_id, target: target_id}) for entry_id, target_id in wanted - current.keys()],
+            batch_size=2000,
+        )
+
+
+def import_entries(user, rows):
+    """
+    Upserts validated rows as `user`'s entries in one transaction, then
+    rebuilds their rollups. Returns {'created': n, 'updated': n}.
+    """
+    dates = [row['date'] for row in rows]
+    in_range = MoodEntry.objects.filter(patient=user, date__range=[min(dates), max(dates)])
+    with transaction.atomic():
+        existing = set(in_range.values_list('date', flat=True)) & set(dates)
+        upsert(
+            MoodEntry,
+            [
+                MoodEntry(patient=user, **{field: row[field] for field in ('date', 'mood', 'energy', 'anxiety', 'notes')})
+                for row in rows
+            ],
+            unique_fields=['patient', 'date'],
+            update_fields=['mood', 'energy', 'anxiety', 'notes'],
+        )
+        # MySQL does not return primary keys from an upsert, so re-read them
+        imported = set(dates)
+        entry_ids = {day: pk for day, pk in in_range.values_list('date', 'id') if day in imported}
+        _replace_links(entry_ids, rows)
+        rebuild_rollups(patient_ids=[user.pk])
+    invalidate_impact(user.pk)
+    return {'created': len(rows) - len(existing), 'updated': len(existing)}
+
+
+# --- EXPORT ---
+
+def iter_entries(user, start=None, end=None, chunk_size=None):
+    """
+    `user`'s entries as TRANSFER_FIELDS dicts in date order; keyset pages of
+    `chunk_size`, each read with one query plus one per relation.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    entries = MoodEntry.objects.filter(patient=user).order_by('date')
+    if start is not None:
+        entries = entries.filter(date__gte=start)
+    if end is not None:
+        entries = entries.filter(date__lte=end)
+
+    after = None
+    while True:
+        page = entries if after is None else entries.filter(date__gt=after)
+        rows = list(page.values_list('id', 'date', 'mood', 'energy', 'anxiety', 'notes')[:chunk_size])
+        if not rows:
+            return
+        names = {relation: {} for relation in BREAKDOWN_RELATIONS}
+        for relation in BREAKDOWN_RELATIONS:
+            field = MoodEntry._meta.get_field(relation)
+            entry, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            links = (
+                field.remote_field.through.objects.filter(**{f'{entry}_id__in': [row[0] for row in rows]})
+                .order_by(f'{target}__name').values_list(f'{entry}_id', f'{target}__name')
+            )
+            for entry_id, name in links:
+                names[relation].setdefault(entry_id, []).append(name)
+        for pk, day, mood, energy, anxiety, notes in rows:
+            yield {
+                'date': day.isoformat(), 'mood': mood, 'energy': energy, 'anxiety': anxiety, 'notes': notes,
+                **{relation: names[relation].get(pk, []) for relation in BREAKDOWN_RELATIONS},
+            }
+        if len(rows) < chunk_size:
+            return
+        after = rows[-1][1]
+
+
+def _json_chunks(entries):
+    buffer = io.StringIO()
+    buffer.write('{"entries":[')
+    for position, entry in enumerate(entries):
+        if position:
+            buffer.write(',')
+        buffer.write(json.dumps(entry, separators=(',', ':')))
+        if buffer.tell() >= STREAM_BUFFER_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    buffer.write(']}')
+    yield buffer.getvalue().encode('utf-8')
+
+
+def export_response(entries, export_format='json', compress=False):
+    """Streams `entries` (from iter_entries) as a JSON or CSV download."""
+    if export_format == 'csv':
+        rows = (
+            [
+                CSV_LIST_SEPARATOR.join(entry[field]) if field in BREAKDOWN_RELATIONS else entry[field]
+                for field in TRANSFER_FIELDS
+            ]
+            for entry in entries
+        )
+        return streaming_csv_response('mood_entries.csv', TRANSFER_FIELDS, rows, compress=compress)
+
+    chunks = _json_chunks(entries)
+    filename = 'mood_entries.json'
+    if compress:
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='application/json')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
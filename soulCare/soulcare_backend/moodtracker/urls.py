@@ -2,7 +2,7 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import MoodEntryViewSet, ActivityListView, TagListView, WeeklyMoodStatsView
+from .views import MoodEntryViewSet, ActivityListView, TagListView, WeeklyMoodStatsView, MoodAnalyticsView, MoodImpactView
 # NEW: import TagListView
 
 router = DefaultRouter()
@@ -14,5 +14,7 @@ urlpatterns = [
     # NEW: Add the URL for the tags list
     path('tags/', TagListView.as_view(), name='tag-list'),
     path('weekly-stats/', WeeklyMoodStatsView.as_view(), name='weekly-mood-stats'),
+    path('analytics/', MoodAnalyticsView.as_view(), name='mood-analytics'),
+    path('impact/', MoodImpactView.as_view(), name='mood-impact'),
 
 ]
@@ -1,32 +1,100 @@
-from rest_framework import viewsets, permissions, generics
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from datetime import date, timedelta
-from django.db.models.functions import TruncDay
-from django.db.models import Avg, F, Value
-from .models import MoodEntry, Activity, Tag
-from .serializers import MoodEntrySerializer, ActivitySerializer, TagSerializer
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags
+from soulcare_backend.streaming import wants_gzip
+from .analytics import GRANULARITIES, MAX_RANGE_DAYS, mood_analytics
+from .impact import mood_impact
+from .models import MoodEntry
+from .reference import reference_list
+from .serializers import MoodEntrySerializer
+from .transfer import MoodEntryCSVParser, MoodEntryImportSerializer, export_response, import_entries, iter_entries
+
+
+class MoodEntryPagination(CursorPagination):
+    """Newest-first keyset pages over one patient's entries."""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = ('-date', '-id')
+
 
 class MoodEntryViewSet(viewsets.ModelViewSet):
+    """
+    The patient's mood entries, cursor-paginated (?limit= up to 200). A page
+    costs three queries: the entries and one prefetch per M2M.
+    """
     serializer_class = MoodEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MoodEntryPagination
 
     def get_queryset(self):
-        return MoodEntry.objects.filter(patient=self.request.user)
+        return MoodEntry.objects.filter(patient=self.request.user).prefetch_related('activities', 'tags')
 
     def perform_create(self, serializer):
         serializer.save(patient=self.request.user)
 
-class ActivityListView(generics.ListAPIView):
-    queryset = Activity.objects.all()
-    serializer_class = ActivitySerializer
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[JSONParser, MoodEntryCSVParser])
+    def bulk_import(self, request):
+        """
+        Upserts many entries at once (e.g. from another tracker). Body: JSON
+        {"entries": [{"date", "mood", "energy", "anxiety", "notes",
+        "activities": [names], "tags": [names]}, ...]} or a text/csv upload
+        with those columns. Existing entries on the same dates are replaced.
+        """
+        data = {'entries': request.data} if isinstance(request.data, list) else request.data
+        serializer = MoodEntryImportSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        counts = import_entries(request.user, serializer.validated_data['entries'])
+        return Response(counts, status=status.HTTP_201_CREATED if counts['created'] else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Streams every entry (or ?start=&end=) in the import format.
+        ?export_format=json|csv (default json), ?compress=gzip.
+        """
+        params = request.query_params
+        export_format = params.get('export_format', 'json')
+        if export_format not in ('json', 'csv'):
+            return Response({'detail': 'export_format must be json or csv.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start, end = (parse_date(params[bound]) if params.get(bound) else None for bound in ('start', 'end'))
+            if (params.get('start') and start is None) or (params.get('end') and end is None):
+                raise ValueError
+        except ValueError:
+            return Response({'detail': 'Dates must be in YYYY-MM-DD format.'}, status=status.HTTP_400_BAD_REQUEST)
+        return export_response(iter_entries(request.user, start, end), export_format, compress=wants_gzip(params))
+
+
+class ReferenceListView(APIView):
+    """
+    A cached reference list (see reference.py) with an ETag; a matching
+    If-None-Match gets an empty 304.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    reference = None
+
+    def get(self, request, format=None):
+        etag, data = reference_list(self.reference)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
+
+
+class ActivityListView(ReferenceListView):
+    reference = 'activities'
 
 # NEW: A read-only endpoint to list all available tags
-class TagListView(generics.ListAPIView):
-    queryset = Tag.objects.all()
-    serializer_class = TagSerializer
-    permission_classes = [permissions.IsAuthenticated]
+class TagListView(ReferenceListView):
+    reference = 'tags'
 
 class WeeklyMoodStatsView(APIView):
     """
@@ -44,40 +112,86 @@ class WeeklyMoodStatsView(APIView):
             date__range=[seven_days_ago, today]
         )
 
-        # Annotate and Aggregate: Average mood, energy, and anxiety per day
-        daily_stats = queryset.annotate(
-            day=TruncDay('date')
-        ).values('day').annotate(
-            mood=Avg('mood'),
-            energy=Avg('energy'),
-            anxiety=Avg('anxiety')
-        ).order_by('day')
-
-        # Format the output to match the frontend WeeklyMoodDataPoint interface
-        days_of_week = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-
-        # Build a dictionary for easy lookup
-        stats_map = {
-            item['day'].strftime('%a'): {
-                'day': item['day'].strftime('%a'),
-                'mood': round(item['mood'], 1) if item['mood'] else 0,
-                'energy': round(item['energy'], 1) if item['energy'] else 0,
-                'anxiety': round(item['anxiety'], 1) if item['anxiety'] else 0,
-            }
-            for item in daily_stats
+        # One entry per day (unique per patient and date), so no grouping is needed
+        by_date = {
+            day: (mood, energy, anxiety)
+            for day, mood, energy, anxiety in queryset.values_list('date', 'mood', 'energy', 'anxiety')
         }
 
-        # Ensure all 7 days are in the response (use 0 for missing data)
+        # Format the output to match the frontend WeeklyMoodDataPoint interface
         response_data = []
         for i in range(7):
             current_date = seven_days_ago + timedelta(days=i)
-            day_abbr = current_date.strftime('%a')
-
-            response_data.append(stats_map.get(day_abbr, {
-                'day': day_abbr,
-                'mood': 0,
-                'energy': 0,
-                'anxiety': 0,
-            }))
+            mood, energy, anxiety = by_date.get(current_date, (0, 0, 0))
+            response_data.append({
+                'day': current_date.strftime('%a'),
+                'mood': mood,
+                'energy': energy,
+                'anxiety': anxiety,
+            })
 
         return Response(response_data)
+
+
+def _requested_range(params, default_days):
+    """
+    (start, end) from ?days= (ending today) or ?start=&end=; raises
+    ValueError with a message for the client.
+    """
+    try:
+        end = parse_date(params['end']) if params.get('end') else date.today()
+        if params.get('start'):
+            start = parse_date(params['start'])
+        else:
+            start = end - timedelta(days=int(params.get('days', default_days)) - 1) if end else None
+    except ValueError:
+        raise ValueError('Invalid start, end or days.')
+    if start is None or end is None:
+        raise ValueError('Dates must be in YYYY-MM-DD format.')
+    if start > end or (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f'start must not be after end, and the range must be under {MAX_RANGE_DAYS} days.')
+    return start, end
+
+
+class MoodAnalyticsView(APIView):
+    """
+    Mood analytics for ?days=30|90|365 (default 30, ending today) or
+    ?start=&end=, with ?granularity=daily|weekly|monthly and a rolling
+    ?window= in buckets. See analytics.py.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, format=None):
+        params = request.query_params
+        try:
+            start, end = _requested_range(params, default_days=30)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            window = int(params['window']) if params.get('window') else None
+        except ValueError:
+            return Response({'detail': 'Invalid window.'}, status=status.HTTP_400_BAD_REQUEST)
+        if window is not None and window < 1:
+            return Response({'detail': 'window must be at least 1.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        granularity = params.get('granularity')
+        if granularity is not None and granularity not in GRANULARITIES:
+            return Response({'detail': f'granularity must be one of {", ".join(GRANULARITIES)}.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(mood_analytics(request.user, start, end, granularity, window))
+
+
+class MoodImpactView(APIView):
+    """
+    How mood, energy and anxiety differ on days with each activity and tag,
+    with 95% confidence intervals, over ?days= (default 365) or ?start=&end=.
+    See impact.py.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, format=None):
+        try:
+            start, end = _requested_range(request.query_params, default_days=365)
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(mood_impact(request.user, start, end))
@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from .models import Prescription
 from .serializers import PrescriptionSerializer
 from authapp.models import User
+from authapp.profiles import with_role_profiles
 from .permissions import IsDoctorAndOwner
 from authapp.utils import send_prescription_shared_email
 
@@ -20,12 +21,16 @@ class PrescriptionViewSet(viewsets.ModelViewSet):
         Filter prescriptions based on the user's role.
         """
         user = self.request.user
+        prescriptions = with_role_profiles(
+            with_role_profiles(Prescription.objects.all(), role='user', prefix='patient'),
+            role='doctor', prefix='doctor',
+        ).prefetch_related('medications')
         
         # --- NEW: Check for patient_id filter from the doctor ---
         patient_id = self.request.query_params.get('patient_id')
         
         if user.role == 'doctor':
-            queryset = Prescription.objects.filter(doctor=user)
+            queryset = prescriptions.filter(doctor=user)
             
             # If a patient_id is provided in the URL, filter the queryset further
             if patient_id:
@@ -39,7 +44,7 @@ class PrescriptionViewSet(viewsets.ModelViewSet):
             
         elif user.role == 'user':
             # Patient logic remains unchanged
-            return Prescription.objects.filter(patient=user)
+            return prescriptions.filter(patient=user)
             
         return Prescription.objects.none() # Other roles see nothing
 
@@ -22,5 +22,11 @@ class Review(models.Model):
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['provider', 'created_at'], name='review_provider_created_idx'),
+            models.Index(fields=['patient', 'created_at'], name='review_patient_created_idx'),
+        ]
+
     def __str__(self):
         return f"Rating {self.rating} for {self.provider.username}"
\ No newline at end of file
@@ -0,0 +1,125 @@
+# soulcare_backend/soulcare_backend/benchmarks.py
+
+"""
+Endpoint benchmarks run by `manage.py benchmark_endpoints`. Each endpoint is
+requested through DRF's test client as a representative synthetic user (see
+synthetic.py), recording latency and the number of SQL queries per request.
+"""
+
+import statistics
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .synthetic import SYNTHETIC_PREFIX
+
+
+class Endpoint:
+    """`path` is a string or a callable taking the subjects dict."""
+    def __init__(self, name, role, path):
+        self.name = name
+        self.role = role
+        self.path = path
+
+    def url(self, subjects):
+        return self.path(subjects) if callable(self.path) else self.path
+
+
+def _availability(subjects):
+    start = timezone.localdate()
+    end = start + timedelta(days=13)
+    return f"/api/auth/providers/{subjects['provider'].pk}/availability/?start_date={start}&end_date={end}"
+
+
+ENDPOINTS = [
+    Endpoint('chat.contacts.provider', 'provider', '/api/chat/contacts/'),
+    Endpoint('chat.contacts.patient', 'patient', '/api/chat/contacts/'),
+    Endpoint('blog.posts', 'patient', '/api/blogs/'),
+    Endpoint('habits.list', 'patient', '/api/habits/'),
+    Endpoint('habits.calendar', 'patient', '/api/habits/calendar/'),
+    Endpoint('games.dashboard', 'patient', '/api/games/dashboard-stats/'),
+    Endpoint('mood.analytics', 'patient', '/api/moodtracker/analytics/?days=365'),
+    Endpoint('mood.impact', 'patient', '/api/moodtracker/impact/?days=365'),
+    Endpoint('mood.entries', 'patient', '/api/moodtracker/entries/'),
+    Endpoint('mood.activities', 'patient', '/api/moodtracker/activities/'),
+    Endpoint('providers.availability', 'patient', _availability),
+    Endpoint('appointments.list', 'patient', '/api/appointments/'),
+    Endpoint('dashboard.patient', 'patient', '/api/auth/patient/dashboard-stats/'),
+    Endpoint('dashboard.provider', 'provider', '/api/auth/provider/dashboard-stats/'),
+    Endpoint('dashboard.admin', 'admin', '/api/auth/admin/dashboard-stats/'),
+]
+
+
+def pick_subjects():
+    """
+    The synthetic users to request as: the provider with the most
+    appointments, one of their patients, and the synthetic admin.
+    """
+    User = apps.get_model('authapp.User')
+    Appointment = apps.get_model('appointments.Appointment')
+    synthetic = User.objects.filter(username__startswith=SYNTHETIC_PREFIX)
+
+    provider = (
+        synthetic.filter(role__in=['doctor', 'counselor'])
+        .annotate(appointments=Count('provider_appointments'))
+        .order_by('-appointments', 'id')
+        .first()
+    )
+    admin = synthetic.filter(role='admin').first()
+    if provider is None or admin is None:
+        raise ValueError("No synthetic population found. Run generate_synthetic_data first.")
+    patient_id = (
+        Appointment.objects.filter(provider=provider).order_by('id').values_list('patient_id', flat=True).first()
+    )
+    patient = User.objects.get(pk=patient_id) if patient_id else synthetic.filter(role='user').first()
+    return {'provider': provider, 'patient': patient, 'admin': admin}
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_benchmarks(endpoints=None, repeat=5, warmup=1):
+    """
+    Requests every endpoint `warmup` + `repeat` times (warm-up runs are not
+    measured). Returns one dict per endpoint with the status code, queries per
+    request and median / p95 / max latency in milliseconds.
+    """
+    subjects = pick_subjects()
+    results = []
+    for endpoint in endpoints or ENDPOINTS:
+        client = APIClient()
+        client.force_authenticate(subjects[endpoint.role])
+        url = endpoint.url(subjects)
+
+        for _ in range(warmup):
+            client.get(url)
+
+        timings = []
+        queries = []
+        status_code = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+            status_code = response.status_code
+
+        results.append({
+            'endpoint': endpoint.name,
+            'url': url,
+            'status': status_code,
+            'queries': max(queries),
+            'median_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 0.95), 2),
+            'max_ms': round(max(timings), 2),
+        })
+    return results
@@ -0,0 +1,19 @@
+# soulcare_backend/soulcare_backend/db.py
+
+"""Database helpers shared by the apps."""
+
+from django.db import connections, router
+
+
+def upsert(model, objects, unique_fields, update_fields):
+    """
+    bulk_create(update_conflicts=True) that works on every backend: MySQL
+    upserts on any unique key and rejects an explicit `unique_fields`.
+    """
+    connection = connections[router.db_for_write(model)]
+    return model.objects.bulk_create(
+        objects,
+        update_conflicts=True,
+        unique_fields=unique_fields if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=update_fields,
+    )
@@ -0,0 +1,154 @@
+# soulcare_backend/soulcare_backend/query_plans.py
+
+"""
+Registry of hot per-user, time-ordered query patterns, checked by
+`manage.py check_query_plans`. Each pattern builds the queryset an endpoint
+runs; the checker EXPLAINs it (nothing is executed) and reports whether the
+plan seeks an index or reads the whole table. Register the main query of
+every new list/history endpoint here.
+"""
+
+import json
+import re
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.utils import timezone
+
+# EXPLAIN never runs the query, so any id works
+SAMPLE_ID = 1
+
+
+class QueryPattern:
+    def __init__(self, name, build):
+        self.name = name
+        self.build = build
+
+
+def _objects(label):
+    return apps.get_model(label).objects
+
+
+def _game_history(model_name):
+    return lambda: _objects(f'mentalGames.{model_name}').filter(user_id=SAMPLE_ID).order_by('-created_at', '-id')[:30]
+
+
+HOT_QUERIES = [
+    QueryPattern('games.reaction_time.history', _game_history('ReactionTimeResult')),
+    QueryPattern('games.memory_game.history', _game_history('MemoryGameResult')),
+    QueryPattern('games.stroop_test.history', _game_history('StroopGameResult')),
+    QueryPattern('games.longest_number.history', _game_history('LongestNumberGameResult')),
+    QueryPattern('games.numpuz_game.history', _game_history('NumpuzGameResult')),
+    QueryPattern('games.additions_game.history', _game_history('AdditionsGameResult')),
+    QueryPattern('games.sessions.user', lambda: _objects('mentalGames.GameSession').filter(
+        user_id=SAMPLE_ID, game_type='reaction_time').order_by('-created_at')[:500]),
+    QueryPattern('mood.entries.week', lambda: _objects('moodtracker.MoodEntry').filter(
+        patient_id=SAMPLE_ID, date__range=[timezone.localdate() - timedelta(days=6), timezone.localdate()])),
+    QueryPattern('mood.rollups.range', lambda: _objects('moodtracker.MoodMonthlyRollup').filter(
+        patient_id=SAMPLE_ID, month__range=[timezone.localdate() - timedelta(days=365), timezone.localdate()])),
+    QueryPattern('assessments.results.patient', lambda: _objects('assessments.AssessmentResult').filter(
+        patient_id=SAMPLE_ID).order_by('-submitted_at')),
+    QueryPattern('appointments.notes.provider_patient', lambda: _objects('appointments.ProgressNote').filter(
+        provider_id=SAMPLE_ID, patient_id=SAMPLE_ID).order_by('-created_at')),
+    QueryPattern('reviews.provider', lambda: _objects('reviews.Review').filter(
+        provider_id=SAMPLE_ID).order_by('-created_at')),
+    QueryPattern('reviews.patient', lambda: _objects('reviews.Review').filter(
+        patient_id=SAMPLE_ID).order_by('-created_at')),
+    QueryPattern('chat.messages.conversation', lambda: _objects('chat.Message').filter(
+        conversation_id=SAMPLE_ID).order_by('timestamp')),
+    QueryPattern('chat.messages.unread', lambda: _objects('chat.Message').filter(
+        conversation_id=SAMPLE_ID, is_read=False).exclude(sender_id=SAMPLE_ID)),
+    QueryPattern('habits.completions.period', lambda: _objects('habits.HabitTaskCompletion').filter(
+        task_id=SAMPLE_ID, completed_at__gte=timezone.now() - timedelta(days=7))),
+    QueryPattern('habits.rollups.calendar', lambda: _objects('habits.HabitDailyRollup').filter(
+        user_id=SAMPLE_ID, day__range=[timezone.localdate() - timedelta(days=364), timezone.localdate()])),
+]
+
+
+class PlanReport:
+    """What one EXPLAIN says: tables read in full and indexes used."""
+    def __init__(self, name, full_scans, indexes, plan):
+        self.name = name
+        self.full_scans = full_scans
+        self.indexes = indexes
+        self.plan = plan
+
+
+# --- PLAN PARSING (per database vendor) ---
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def _mysql_plan(plan):
+    scans, indexes = [], []
+    for node in _walk(json.loads(plan)):
+        if 'table_name' in node and 'access_type' in node:
+            if node['access_type'] in ('ALL', 'index'):
+                scans.append(node['table_name'])
+            elif node.get('key'):
+                indexes.append(node['key'])
+    return scans, indexes
+
+
+def _postgresql_plan(plan):
+    scans, indexes = [], []
+    for node in _walk(json.loads(plan) if isinstance(plan, str) else plan):
+        if node.get('Node Type') == 'Seq Scan':
+            scans.append(node.get('Relation Name'))
+        elif node.get('Index Name'):
+            indexes.append(node['Index Name'])
+    return scans, indexes
+
+
+def _sqlite_plan(plan):
+    # e.g. "SEARCH t USING INDEX idx (user_id=?)" vs "SCAN t"
+    scans = re.findall(r'\bSCAN (\w+)', plan)
+    indexes = re.findall(r'USING (?:COVERING )?INDEX (\w+)', plan)
+    if 'USING INTEGER PRIMARY KEY' in plan:
+        indexes.append('PRIMARY')
+    return scans, indexes
+
+
+def explain(pattern):
+    queryset = pattern.build()
+    vendor = connection.vendor
+    if vendor == 'mysql':
+        plan = queryset.explain(format='json')
+        scans, indexes = _mysql_plan(plan)
+    elif vendor == 'postgresql':
+        plan = queryset.explain(format='json')
+        scans, indexes = _postgresql_plan(plan)
+    elif vendor == 'sqlite':
+        plan = queryset.explain()
+        scans, indexes = _sqlite_plan(plan)
+    else:
+        raise ValueError(f"Query plan checks are not supported on {vendor}.")
+    return PlanReport(pattern.name, sorted(set(scans)), sorted(set(indexes)), plan)
+
+
+def check_plans(patterns=None, baseline=None):
+    """
+    EXPLAINs every pattern. Returns (reports, problems), where problems lists
+    full scans and, given a baseline {name: [indexes]}, patterns whose index
+    choice changed since the baseline was recorded.
+    """
+    reports = [explain(pattern) for pattern in patterns or HOT_QUERIES]
+    problems = []
+    for report in reports:
+        if report.full_scans:
+            problems.append(f"{report.name}: full scan of {', '.join(report.full_scans)}")
+        expected = (baseline or {}).get(report.name)
+        if expected is not None and sorted(expected) != report.indexes:
+            problems.append(
+                f"{report.name}: plan changed, uses {report.indexes or 'no index'} "
+                f"instead of {sorted(expected)}"
+            )
+    return reports, problems
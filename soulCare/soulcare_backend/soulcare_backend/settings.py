@@ -191,6 +191,23 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Game leaderboards are Redis sorted sets, rebuilt from SQL with:
+#   python manage.py rebuild_leaderboards
+LEADERBOARD_REDIS_URL = os.getenv("LEADERBOARD_REDIS_URL", "redis://127.0.0.1:6379/1")
+
+# Shared by every worker process: cached mood impact results, and the version
+# keys that make all processes drop them (moodtracker/impact.py, reference.py)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/2")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_REDIS_URL,
+        "KEY_PREFIX": "soulcare",
+        # Short timeouts: callers fall back to uncached reads when Redis is down
+        "OPTIONS": {"socket_connect_timeout": 1, "socket_timeout": 1},
+    },
+}
+
 
 # --- EMAIL CONFIGURATION ---
 # For Development: This prints emails to the console/terminal
@@ -203,6 +220,16 @@ EMAIL_HOST_PASSWORD = ''
 EMAIL_USE_TLS = False
 DEFAULT_FROM_EMAIL = 'SoulCare <noreply@soulcare.com>'
 
+# Outgoing emails are queued in authapp.OutboundEmail and delivered by:
+#   python manage.py process_outbox --loop
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 200,
+    'WORKERS': 4,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BASE_SECONDS': 60,
+    'DIGEST_WINDOW_SECONDS': 900,  # first digest row per recipient waits this long; later ones join it
+}
+
 
 STRIPE_PUBLIC_KEY = 'STRIPE_PUBLIC_KEY', 'pk_test_dummy_value'
 STRIPE_SECRET_KEY = 'STRIPE_SECRET_KEY', 'sk_test_dummy_value'
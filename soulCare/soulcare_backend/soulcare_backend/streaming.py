@@ -0,0 +1,58 @@
+# soulcare_backend/soulcare_backend/streaming.py
+
+"""
+Streamed downloads shared by the apps: CSV bodies written in buffered
+chunks, optionally gzip-compressed as they are sent.
+"""
+
+import csv
+import io
+import zlib
+
+from django.http import StreamingHttpResponse
+
+# Bytes buffered before a chunk is handed to the response.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def csv_chunks(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_BUFFER_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    # wbits=31 writes a gzip container (header + trailer) instead of raw zlib
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def wants_gzip(params):
+    return params.get('compress', '').lower() in ('gzip', 'gz', '1', 'true')
+
+
+def streaming_csv_response(filename, header, rows, compress=False):
+    """
+    Streams rows as a CSV download. With compress=True the body is a .csv.gz
+    file, compressed incrementally as it is written.
+    """
+    chunks = csv_chunks(header, rows)
+    if compress:
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        filename = f"{filename}.gz"
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
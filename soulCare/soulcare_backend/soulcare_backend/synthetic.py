@@ -0,0 +1,419 @@
+# soulcare_backend/soulcare_backend/synthetic.py
+
+"""
+Synthetic population for load testing (`manage.py generate_synthetic_data`,
+`manage.py benchmark_endpoints`). Everything is written with bulk_create, one
+transaction per chunk of patients. Every generated username starts with
+SYNTHETIC_PREFIX, so a population can be purged without touching real users.
+"""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+SYNTHETIC_PREFIX = 'synth_'
+SYNTHETIC_PASSWORD = 'synthetic-pass-123'
+BATCH_SIZE = 1000
+# Patients generated (and held in memory) per transaction
+PATIENT_CHUNK_SIZE = 500
+
+# Scale tiers: approximate number of rows generated
+TIERS = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+MOOD_ACTIVITIES = ['Exercise', 'Reading', 'Socializing', 'Meditation', 'Work', 'Gaming']
+MOOD_TAGS = ['calm', 'tired', 'stressed', 'motivated', 'lonely']
+
+GAME_MODELS = [
+    'ReactionTimeResult', 'MemoryGameResult', 'StroopGameResult',
+    'LongestNumberGameResult', 'NumpuzGameResult', 'AdditionsGameResult',
+]
+
+
+def _model(label):
+    return apps.get_model(label)
+
+
+class PopulationConfig:
+    """
+    Volumes of the generated population. Everything except providers and
+    blog content is per patient; use for_rows() to size it from a row target.
+    """
+    def __init__(self, patients, providers=None, appointments=4, messages=20, habits=3,
+                 tasks=2, completions=10, game_results=24, mood_entries=60, posts_per_provider=3,
+                 reactions_per_post=20):
+        self.patients = patients
+        self.providers = providers or max(2, patients // 50)
+        self.appointments = appointments
+        self.messages = messages
+        self.habits = habits
+        self.tasks = tasks
+        self.completions = completions
+        self.game_results = game_results
+        self.mood_entries = min(mood_entries, 365)
+        self.posts_per_provider = posts_per_provider
+        self.reactions_per_post = reactions_per_post
+
+    @property
+    def rows_per_patient(self):
+        # user + profile + identity, conversation, habit tree, each game
+        # result plus its GameSession row, and each mood entry with about one
+        # activity and one tag link
+        return (
+            3 + self.appointments + 1 + self.messages
+            + self.habits * (1 + self.tasks * (1 + self.completions))
+            + 2 * self.game_results
+            + 3 * self.mood_entries
+        )
+
+    @classmethod
+    def for_rows(cls, rows, **volumes):
+        per_patient = cls(patients=1, **volumes).rows_per_patient
+        return cls(patients=max(2, rows // per_patient), **volumes)
+
+
+@contextmanager
+def _explicit_timestamps(model, *names):
+    """
+    Lets bulk_create keep preset values of auto_now_add fields, so generated
+    history is spread over time instead of all stamped 'now'.
+    """
+    fields = [model._meta.get_field(name) for name in names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _bulk(model, objects):
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    return len(objects)
+
+
+class PopulationGenerator:
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.rng = random.Random(seed)
+        # Distinguishes runs so usernames, emails and NICs never collide
+        self.run = uuid.uuid4().hex[:6]
+        self.password = make_password(SYNTHETIC_PASSWORD)
+        self.now = timezone.now()
+        self.counts = {}
+
+    def _count(self, label, created):
+        self.counts[label] = self.counts.get(label, 0) + created
+
+    def _ago(self, days):
+        return self.now - timedelta(days=days, seconds=self.rng.randint(0, 86399))
+
+    # --- USERS ---
+
+    def _create_users(self, role, count, start=0):
+        """Bulk-creates users with their profile and IdentityIndex rows; returns the users."""
+        from authapp.identity import normalize_email, normalize_nic
+        User = _model('authapp.User')
+        IdentityIndex = _model('authapp.IdentityIndex')
+        profile_models = {
+            'user': 'authapp.PatientProfile',
+            'doctor': 'authapp.DoctorProfile',
+            'counselor': 'authapp.CounselorProfile',
+        }
+
+        users = []
+        for i in range(start, start + count):
+            username = f"{SYNTHETIC_PREFIX}{self.run}_{role}_{i}"
+            users.append(User(
+                username=username, email=f"{username}@example.invalid", password=self.password,
+                role=role, is_verified=True, is_staff=role == 'admin',
+            ))
+        self._count('users', _bulk(User, users))
+        # MySQL does not return primary keys from bulk_create, so re-read them
+        ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+        for user in users:
+            user.pk = ids[user.username]
+
+        nics = {user.pk: f"SYN{self.run}{role[0]}{i:07d}".upper() for i, user in enumerate(users, start=start)}
+        if role in profile_models:
+            profile_model = _model(profile_models[role])
+            profiles = []
+            for user in users:
+                data = {'user_id': user.pk, 'full_name': user.username, 'nic': nics[user.pk], 'contact_number': '0770000000'}
+                if role == 'user':
+                    data.update(address='1 Synthetic Road', risk_level=self.rng.choice(['low', 'medium', 'high']))
+                elif role == 'doctor':
+                    data.update(specialization='Psychiatry', availability='Weekdays', license_number=f"L-{user.pk}")
+                else:
+                    data.update(expertise='CBT', license_number=f"L-{user.pk}")
+                profiles.append(profile_model(**data))
+            self._count('profiles', _bulk(profile_model, profiles))
+
+        self._count('identities', _bulk(IdentityIndex, [
+            IdentityIndex(
+                user_id=user.pk,
+                nic=normalize_nic(nics[user.pk]) if role in profile_models else None,
+                email=normalize_email(user.email),
+            )
+            for user in users
+        ]))
+        return users
+
+    def _create_schedules(self, providers):
+        ProviderSchedule = _model('authapp.ProviderSchedule')
+        self._count('schedules', _bulk(ProviderSchedule, [
+            ProviderSchedule(provider_id=provider.pk, day_of_week=day, start_time=time(9), end_time=time(17))
+            for provider in providers
+            for day in range(5)
+        ]))
+
+    # --- PER-PATIENT ACTIVITY ---
+
+    def _create_appointments(self, patients, providers):
+        Appointment = _model('appointments.Appointment')
+        appointments = []
+        for patient in patients:
+            primary = providers[patient.pk % len(providers)]
+            for k in range(self.config.appointments):
+                provider = primary if k % 2 == 0 else self.rng.choice(providers)
+                day = (self.now + timedelta(days=self.rng.randint(-180, 30))).date()
+                start = datetime.combine(day, time(self.rng.randint(9, 16)))
+                appointments.append(Appointment(
+                    patient_id=patient.pk, provider_id=provider.pk, date=day, time=start.time(),
+                    start_time=timezone.make_aware(start),
+                    status='completed' if day < self.now.date() else 'scheduled',
+                ))
+        self._count('appointments', _bulk(Appointment, appointments))
+
+    def _create_conversations(self, patients, providers):
+        Conversation = _model('chat.Conversation')
+        Message = _model('chat.Message')
+        self._count('conversations', _bulk(Conversation, [
+            Conversation(patient_id=patient.pk, provider_id=providers[patient.pk % len(providers)].pk)
+            for patient in patients
+        ]))
+
+        conversations = Conversation.objects.filter(patient_id__in=[p.pk for p in patients]).values_list('id', 'patient_id', 'provider_id')
+        messages = []
+        for conversation_id, patient_id, provider_id in conversations:
+            sent = self._ago(90)
+            for k in range(self.config.messages):
+                sent += timedelta(minutes=self.rng.randint(1, 600))
+                messages.append(Message(
+                    conversation_id=conversation_id,
+                    sender_id=patient_id if k % 2 == 0 else provider_id,
+                    content=f"Synthetic message {k}",
+                    timestamp=min(sent, self.now),
+                    # The last couple of messages are still unread
+                    is_read=k < self.config.messages - 2,
+                ))
+        with _explicit_timestamps(Message, 'timestamp'):
+            self._count('messages', _bulk(Message, messages))
+
+    def _create_habits(self, patients):
+        from habits.periods import user_timezones
+        from habits.utils import get_period_start_date
+
+        Habit = _model('habits.Habit')
+        HabitTask = _model('habits.HabitTask')
+        HabitTaskCompletion = _model('habits.HabitTaskCompletion')
+        frequencies = ['daily', 'daily', 'weekly', 'monthly']
+
+        self._count('habits', _bulk(Habit, [
+            Habit(user_id=patient.pk, name=f"Habit {k}", frequency=self.rng.choice(frequencies), target=self.config.tasks)
+            for patient in patients
+            for k in range(self.config.habits)
+        ]))
+        habit_ids = list(Habit.objects.filter(user_id__in=[p.pk for p in patients]).values_list('id', flat=True))
+        self._count('habit_tasks', _bulk(HabitTask, [
+            HabitTask(habit_id=habit_id, name=f"Task {k}")
+            for habit_id in habit_ids
+            for k in range(self.config.tasks)
+        ]))
+        tasks = HabitTask.objects.filter(habit_id__in=habit_ids).values_list('id', 'habit__frequency', 'habit__user_id')
+        # Periods roll over in each user's own timezone, as in the app (habits.periods)
+        zones = user_timezones(p.pk for p in patients)
+        completions = []
+        for task_id, frequency, user_id in tasks:
+            # At most one completion per task and period
+            periods = {}
+            for days in self.rng.sample(range(61), min(self.config.completions, 61)):
+                completed_at = self._ago(days)
+                completed_on = timezone.localtime(completed_at, zones.get(user_id)).date()
+                period_start = get_period_start_date(frequency, completed_on)
+                periods.setdefault(period_start, completed_at)
+            completions.extend(
+                HabitTaskCompletion(task_id=task_id, completed_at=completed_at, period_start=period_start)
+                for period_start, completed_at in periods.items()
+            )
+        with _explicit_timestamps(HabitTaskCompletion, 'completed_at'):
+            self._count('habit_completions', _bulk(HabitTaskCompletion, completions))
+
+    def _game_values(self, name):
+        rng = self.rng
+        values = {
+            'post_game_mood': rng.randint(1, 5),
+            'perceived_effort': rng.randint(1, 10),
+            'stress_reduction_rating': rng.randint(1, 10),
+        }
+        if name == 'ReactionTimeResult':
+            values.update(reaction_time_ms=rng.randint(180, 600))
+        elif name == 'MemoryGameResult':
+            values.update(max_sequence_length=rng.randint(3, 12), total_attempts=rng.randint(1, 5))
+        elif name == 'StroopGameResult':
+            values.update(total_correct=rng.randint(5, 30), interference_score_ms=rng.randint(20, 300), total_time_s=rng.uniform(20, 90))
+        elif name == 'LongestNumberGameResult':
+            values.update(max_number_length=rng.randint(3, 12), total_reaction_time_ms=rng.randint(2000, 30000), total_attempts=rng.randint(1, 5))
+        elif name == 'NumpuzGameResult':
+            values.update(time_taken_s=rng.uniform(30, 400), puzzle_size=rng.choice(['3x3', '4x4']), moves_made=rng.randint(20, 200))
+        else:
+            values.update(total_correct=rng.randint(5, 30), time_taken_s=rng.uniform(20, 120), difficulty_level=rng.randint(1, 3))
+        return values
+
+    def _create_game_results(self, patients):
+        by_model = {name: [] for name in GAME_MODELS}
+        for patient in patients:
+            for k in range(self.config.game_results):
+                name = GAME_MODELS[k % len(GAME_MODELS)]
+                by_model[name].append((patient.pk, self._game_values(name)))
+        for name, rows in by_model.items():
+            model = _model(f'mentalGames.{name}')
+            objects = [model(user_id=user_id, created_at=self._ago(self.rng.randint(0, 120)), **values) for user_id, values in rows]
+            with _explicit_timestamps(model, 'created_at'):
+                self._count('game_results', _bulk(model, objects))
+
+    # --- MOOD ---
+
+    def _mood_vocabulary(self):
+        """Ids of the activities and tags entries are linked to; shared with real users, so never purged."""
+        Activity = _model('moodtracker.Activity')
+        Tag = _model('moodtracker.Tag')
+        activity_ids = [Activity.objects.get_or_create(name=name)[0].pk for name in MOOD_ACTIVITIES]
+        tag_ids = [Tag.objects.get_or_create(name=name)[0].pk for name in MOOD_TAGS]
+        return activity_ids, tag_ids
+
+    def _create_mood_entries(self, patients, activity_ids, tag_ids):
+        MoodEntry = _model('moodtracker.MoodEntry')
+        rng = self.rng
+        today = timezone.localtime(self.now).date()
+        entries = []
+        links = {}
+        for patient in patients:
+            # One entry per day at most (unique on patient and date)
+            for days in rng.sample(range(365), self.config.mood_entries):
+                activities = rng.sample(activity_ids, rng.randint(0, 2))
+                tags = rng.sample(tag_ids, rng.randint(0, 2))
+                # Activities lift the mood a little, so the impact view has something to find
+                mood = min(10, rng.randint(2, 8) + len(activities))
+                day = today - timedelta(days=days)
+                entries.append(MoodEntry(
+                    patient_id=patient.pk, date=day, mood=mood, energy=rng.randint(1, 10),
+                    anxiety=rng.randint(1, 10), created_at=self._ago(days),
+                ))
+                links[patient.pk, day] = (activities, tags)
+        with _explicit_timestamps(MoodEntry, 'created_at'):
+            self._count('mood_entries', _bulk(MoodEntry, entries))
+
+        # MySQL does not return primary keys from bulk_create, so re-read them
+        ActivityLink = MoodEntry.activities.through
+        TagLink = MoodEntry.tags.through
+        activity_links, tag_links = [], []
+        rows = MoodEntry.objects.filter(patient_id__in=[p.pk for p in patients]).values_list('id', 'patient_id', 'date')
+        for entry_id, patient_id, day in rows:
+            activities, tags = links[patient_id, day]
+            activity_links.extend(ActivityLink(moodentry_id=entry_id, activity_id=pk) for pk in activities)
+            tag_links.extend(TagLink(moodentry_id=entry_id, tag_id=pk) for pk in tags)
+        self._count('mood_entry_activities', _bulk(ActivityLink, activity_links))
+        self._count('mood_entry_tags', _bulk(TagLink, tag_links))
+
+    # --- BLOG ---
+
+    def _create_blog(self, providers, patient_ids):
+        BlogPost = _model('blog.BlogPost')
+        BlogReaction = _model('blog.BlogReaction')
+        posts = []
+        for provider in providers:
+            for k in range(self.config.posts_per_provider):
+                published = self._ago(self.rng.randint(0, 365))
+                posts.append(BlogPost(
+                    author_id=provider.pk, title=f"Synthetic post {k} by {provider.username}",
+                    content="Synthetic content. " * 50, excerpt="Synthetic excerpt",
+                    tags='wellbeing,synthetic', status='published', publishedAt=published,
+                ))
+        self._count('blog_posts', _bulk(BlogPost, posts))
+
+        post_ids = BlogPost.objects.filter(author_id__in=[p.pk for p in providers]).values_list('id', flat=True)
+        reactions = []
+        for post_id in post_ids:
+            for user_id in self.rng.sample(patient_ids, min(self.config.reactions_per_post, len(patient_ids))):
+                reactions.append(BlogReaction(
+                    post_id=post_id, user_id=user_id,
+                    reaction_type=self.rng.choice(['like', 'heart', 'insightful']),
+                ))
+        self._count('blog_reactions', _bulk(BlogReaction, reactions))
+
+    # --- ENTRY POINT ---
+
+    def generate(self, progress=None):
+        """
+        Creates the whole population. `progress` is called with the counts so
+        far after each patient chunk. Returns {table: rows created}.
+        """
+        from habits.calendar import rebuild_rollups
+        from mentalGames.sessions import sync_sessions
+        from mentalGames.summaries import rebuild_summaries
+        from moodtracker.analytics import rebuild_rollups as rebuild_mood_rollups
+
+        config = self.config
+        with transaction.atomic():
+            self._create_users('admin', 1)
+            doctors = self._create_users('doctor', (config.providers + 1) // 2)
+            counselors = self._create_users('counselor', config.providers // 2)
+            providers = doctors + counselors
+            self._create_schedules(providers)
+            activity_ids, tag_ids = self._mood_vocabulary()
+
+        patient_ids = []
+        for start in range(0, config.patients, PATIENT_CHUNK_SIZE):
+            with transaction.atomic():
+                patients = self._create_users('user', min(PATIENT_CHUNK_SIZE, config.patients - start), start=start)
+                self._create_appointments(patients, providers)
+                self._create_conversations(patients, providers)
+                self._create_habits(patients)
+                self._create_game_results(patients)
+                self._create_mood_entries(patients, activity_ids, tag_ids)
+            patient_ids.extend(patient.pk for patient in patients)
+            if progress:
+                progress(self.counts)
+
+        with transaction.atomic():
+            self._create_blog(providers, patient_ids)
+
+        # bulk_create skips the signals and toggles that maintain derived tables
+        self._count('game_sessions', sync_sessions()['created'])
+        rebuild_summaries()
+        self._count('habit_rollups', rebuild_rollups(
+            _model('habits.Habit').objects.filter(user__username__startswith=SYNTHETIC_PREFIX)
+        ))
+        self._count('mood_rollups', rebuild_mood_rollups(patient_ids))
+        return self.counts
+
+
+def purge_population(chunk_size=BATCH_SIZE):
+    """Deletes every synthetic user (and, by cascade, all their rows). Returns users deleted."""
+    User = _model('authapp.User')
+    synthetic = User.objects.filter(username__startswith=SYNTHETIC_PREFIX)
+    deleted = 0
+    while True:
+        ids = list(synthetic.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            User.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
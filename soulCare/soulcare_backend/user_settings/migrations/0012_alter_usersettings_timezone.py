@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_settings', '0011_usersettings_email_appointment_reminders_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usersettings',
+            name='timezone',
+            field=models.CharField(choices=[('UTC-5', 'EST (UTC-5)'), ('UTC-6', 'CST (UTC-6)'), ('UTC-7', 'MST (UTC-7)'), ('UTC-8', 'PST (UTC-8)'), ('UTC', 'UTC'), ('UTC+5:30', 'IST (UTC+5:30)')], default='UTC-5', max_length=10),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:40
+
+from django.db import migrations, models
+
+
+def clear_default_timezone(apps, schema_editor):
+    """
+    'UTC-5' was the default, and the Settings page sent it back with every
+    save, so it can't be told apart from an untouched setting.
+    """
+    apps.get_model('user_settings', 'UserSettings').objects.filter(timezone='UTC-5').update(timezone=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_settings', '0012_alter_usersettings_timezone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usersettings',
+            name='timezone',
+            field=models.CharField(blank=True, choices=[('UTC-5', 'EST (UTC-5)'), ('UTC-6', 'CST (UTC-6)'), ('UTC-7', 'MST (UTC-7)'), ('UTC-8', 'PST (UTC-8)'), ('UTC', 'UTC'), ('UTC+5:30', 'IST (UTC+5:30)')], default=None, max_length=10, null=True),
+        ),
+        migrations.RunPython(clear_default_timezone, migrations.RunPython.noop),
+    ]
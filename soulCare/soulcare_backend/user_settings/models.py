@@ -28,8 +28,11 @@ class UserSettings(models.Model):
         ('UTC-6', 'CST (UTC-6)'),
         ('UTC-7', 'MST (UTC-7)'),
         ('UTC-8', 'PST (UTC-8)'),
+        ('UTC', 'UTC'),
+        ('UTC+5:30', 'IST (UTC+5:30)'),
     ]
-    timezone = models.CharField(max_length=10, default='UTC-5', choices=TIMEZONE_CHOICES)
+    # Unset (null) means the server's timezone; habit periods roll over at its midnight
+    timezone = models.CharField(max_length=10, blank=True, null=True, default=None, choices=TIMEZONE_CHOICES)
 
     # Date Format Options
     DATE_FORMAT_CHOICES = [
@@ -157,13 +157,14 @@ export const fetchWeeklyMoodData = async (): Promise<WeeklyMoodDataPoint[]> => {
 // =================================================================
 
 /**
- * Fetches all mood entries for the patient.
- * The endpoint is GET /api/moodtracker/entries/
+ * Fetches the patient's latest mood entries (newest first).
+ * The endpoint is GET /api/moodtracker/entries/ and is cursor-paginated;
+ * follow `next` for older entries.
  */
 export const getMoodEntriesAPI = async (): Promise<MoodEntry[]> => {
   // CRITICAL FIX: Ensure the URL prefix is 'moodtracker/entries/'
-  const response = await api.get<MoodEntry[]>('moodtracker/entries/');
-  return response.data;
+  const response = await api.get<{ next: string | null; previous: string | null; results: MoodEntry[] }>('moodtracker/entries/');
+  return response.data.results;
 };
 
 /**
@@ -140,10 +140,17 @@ export default function Settings() {
     securityAlerts: true,
   });
 
-  const [preferences, setPreferences] = useState({
+  const [preferences, setPreferences] = useState<{
+    theme: string;
+    language: string;
+    timezone: string | null;
+    date_format: string;
+    time_format: string;
+  }>({
     theme: "light",
     language: "en",
-    timezone: "UTC-5",
+    // null: not chosen yet, the server's timezone applies
+    timezone: null,
     date_format: "MM/DD/YYYY", 
     time_format: "12h", 
   });
@@ -692,17 +699,19 @@ export default function Settings() {
                     <div>
                       <Label htmlFor="timezone">Timezone</Label>
                       <Select
-                        value={preferences.timezone}
+                        value={preferences.timezone ?? undefined}
                         onValueChange={(val) => handlePreferenceChange('timezone', val)}
                       >
                         <SelectTrigger>
-                          <SelectValue />
+                          <SelectValue placeholder="Server default (UTC)" />
                         </SelectTrigger>
                         <SelectContent>
                           <SelectItem value="UTC-5">EST (UTC-5)</SelectItem>
                           <SelectItem value="UTC-6">CST (UTC-6)</SelectItem>
                           <SelectItem value="UTC-7">MST (UTC-7)</SelectItem>
                           <SelectItem value="UTC-8">PST (UTC-8)</SelectItem>
+                          <SelectItem value="UTC">UTC</SelectItem>
+                          <SelectItem value="UTC+5:30">IST (UTC+5:30)</SelectItem>
                         </SelectContent>
                       </Select>
                     </div>